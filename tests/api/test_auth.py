@@ -1,8 +1,10 @@
 import allure
+import pytest
 import pytest_check as check
 import logging
 from tests.models.response_models import LoginResponse
 from tests.utils.decorators import allure_test_details
+from tests.constants.endpoints import LOGIN_ENDPOINT
 from tests.constants.log_messages import LogMessages
 
 LOGGER = logging.getLogger(__name__)
@@ -23,6 +25,7 @@ class TestAuthentication:
         """,
         severity=allure.severity_level.CRITICAL,
     )
+    @pytest.mark.sla(endpoint=f"POST {LOGIN_ENDPOINT}")
     def test_registered_user_can_login(self, new_registered_user):
         LOGGER.info("Запуск теста: test_registered_user_can_login")
         with allure.step("Получение данных нового зарегистрированного пользователя (через фикстуру)"):
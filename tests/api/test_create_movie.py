@@ -22,11 +22,11 @@ class TestCreateMovie:
         1. Отправка POST-запроса на создание фильма с корректными данными.
         2. Проверка, что API возвращает статус 201 и данные созданного фильма.
         3. Сравнение данных в ответе с отправленными данными.
-        4. Очистка: удаление созданного фильма после теста.
+        4. Очистка: регистрация созданного фильма на отложенное удаление.
         """,
         severity=allure.severity_level.CRITICAL,
     )
-    def test_create_movie_success(self, admin_api_manager, movie_payload):
+    def test_create_movie_success(self, admin_api_manager, movie_payload, cleanup_registry):
         LOGGER.info("Запуск теста: test_create_movie_success")
         movie_id = None
         try:
@@ -54,10 +54,8 @@ class TestCreateMovie:
 
         finally:
             if movie_id:
-                with allure.step("Очистка: удаление созданного фильма"):
-                    LOGGER.info(f"Очистка: попытка удалить фильм с ID {movie_id}")
-                    admin_api_manager.movies_api.delete_movie(movie_id, expected_status=200)
-                    LOGGER.info(f"Очистка: фильм с ID {movie_id} успешно удален")
+                with allure.step("Очистка: регистрация созданного фильма на удаление"):
+                    cleanup_registry.register(movie_id)
 
     @allure_test_details(
         story="Попытка создания фильма неавторизованным пользователем",
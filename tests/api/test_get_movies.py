@@ -2,9 +2,11 @@ import pytest
 import allure
 import pytest_check as check
 import logging
-from tests.models.movie_models import Movie
+from tests.models.movie_models import Location, Movie
 from tests.models.response_models import ErrorResponse, MoviesList
 from tests.utils.decorators import allure_test_details
+from tests.utils.movie_seeder import SeedDistribution
+from tests.constants.endpoints import MOVIES_ENDPOINT
 from tests.constants.log_messages import LogMessages
 
 LOGGER = logging.getLogger(__name__)
@@ -19,6 +21,7 @@ class TestGetMovies:
         description="Проверка, что при запросе без параметров API возвращает первую страницу с 10 фильмами.",
         severity=allure.severity_level.NORMAL,
     )
+    @pytest.mark.sla(endpoint=f"GET {MOVIES_ENDPOINT}")
     def test_get_movies_default(self, api_manager):
         LOGGER.info("Запуск теста: test_get_movies_default")
         with allure.step("Отправка GET-запроса без параметров"):
@@ -82,18 +85,14 @@ class TestGetMovies:
         description="Этот тест проверяет, что фильтр по `locations` работает корректно.",
         severity=allure.severity_level.NORMAL,
     )
-    def test_get_movies_location_filter(self, admin_api_manager, movie_payload):
+    def test_get_movies_location_filter(self, admin_api_manager, movie_seeder):
         LOGGER.info("Запуск теста: test_get_movies_location_filter")
-        movie_id = None
+        seeded = None
         try:
-            with allure.step("Подготовка: создание фильма с локацией 'MSK'"):
-                movie_payload.location = "MSK"
-                created_movie_response = admin_api_manager.movies_api.create_movie(movie_payload)
-                is_movie = isinstance(created_movie_response, Movie)
-                check.is_true(is_movie, f"Ожидался объект Movie, но получен {type(created_movie_response)}")
-                if not is_movie:
-                    pytest.fail("Не удалось создать фильм для теста.")
-                movie_id = created_movie_response.id
+            with allure.step("Подготовка: наполнение каталога опубликованными фильмами с локацией 'MSK'"):
+                seeded = movie_seeder.seed(3, SeedDistribution(locations={Location.MSK: 1.0}, published_ratio=1.0))
+                if not len(seeded):
+                    pytest.fail("Не удалось создать фильмы для теста.")
 
             params = {"locations": ["MSK"]}
             with allure.step(f"Отправка GET-запроса с фильтром по локации: {params}"):
@@ -107,9 +106,9 @@ class TestGetMovies:
                     for movie in response.movies:
                         check.equal(movie.location.value, "MSK")
         finally:
-            if movie_id:
-                with allure.step(f"Очистка: удаление тестового фильма с ID {movie_id}"):
-                    admin_api_manager.movies_api.delete_movie(movie_id)
+            if seeded is not None:
+                with allure.step(f"Очистка: удаление {len(seeded)} тестовых фильмов"):
+                    seeded.teardown()
 
     @allure_test_details(
         story="Фильтрация",
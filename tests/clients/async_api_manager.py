@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Iterable
+from tests.clients.async_auth_api import AsyncAuthAPI
+from tests.clients.async_movies_api import AsyncMoviesAPI
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL
+from tests.request.async_custom_requester import gather_bounded
+
+class AsyncApiManager:
+    # Запросы выполняются в пуле из max_concurrency потоков, поэтому это же число - верхняя граница
+    # для gather: больший limit только выстроит корутины в очередь к executor.
+
+    default_max_concurrency = 10
+
+    def __init__(self, session, base_url: str = BASE_URL, base_auth_url: str = BASE_AUTH_URL,
+                 max_concurrency: int = default_max_concurrency, allure_reporting: bool = True):
+        self.session = session
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-api")
+        self.auth_api = AsyncAuthAPI(session, base_url=base_auth_url, executor=self.executor)
+        self.movies_api = AsyncMoviesAPI(session, base_url=base_url, executor=self.executor)
+
+        self.movies_api.auth_handler = self.auth_api
+        self.auth_api.allure_reporting = allure_reporting
+        self.movies_api.allure_reporting = allure_reporting
+
+    def concurrency(self, limit: int | None = None) -> int:
+        return min(limit or self.max_concurrency, self.max_concurrency)
+
+    async def gather(self, awaitables: Iterable[Awaitable], limit: int | None = None,
+                     return_exceptions: bool = False) -> list[Any]:
+        return await gather_bounded(awaitables, self.concurrency(limit), return_exceptions=return_exceptions)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncApiManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
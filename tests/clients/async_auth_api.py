@@ -0,0 +1,74 @@
+import logging
+import requests
+from concurrent.futures import Executor
+from tests.constants.endpoints import (LOGIN_ENDPOINT, ADMIN_EMAIL, ADMIN_PASSWORD,
+                                     REGISTER_ENDPOINT, LOGOUT_ENDPOINT, REFRESH_ENDPOINT)
+from tests.constants.log_messages import LogMessages
+from tests.request.async_custom_requester import AsyncCustomRequester
+from tests.clients.auth_api import LoginApiResponse
+from tests.models.response_models import LoginResponse, ErrorResponse
+from tests.models.user_models import User
+from tests.utils.log_pipeline import LazyMessage
+
+class AsyncAuthAPI(AsyncCustomRequester):
+
+    def __init__(self, session: requests.Session, base_url: str, executor: Executor | None = None) -> None:
+        super().__init__(session, base_url=base_url, executor=executor)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def login(self, email: str | None = ADMIN_EMAIL, password: str | None = ADMIN_PASSWORD,
+                    expected_status: int = 200, latency_budget_ms: float | None = None) -> LoginApiResponse:
+        if not email or not password:
+            raise ValueError("ADMIN_EMAIL и ADMIN_PASSWORD должны быть указаны в .env file")
+
+        self.logger.info(LazyMessage(LogMessages.Auth.ATTEMPT_LOGIN, email))
+        payload = {"email": email, "password": password}
+        response = await self.post(LOGIN_ENDPOINT, data=payload, expected_status=expected_status,
+                                   latency_budget_ms=latency_budget_ms)
+        if response.ok:
+            login_response = response.model(LoginResponse)
+            self.session.headers["Authorization"] = f"Bearer {login_response.access_token}"
+            self.logger.info(LazyMessage(LogMessages.Auth.LOGIN_SUCCESS, email))
+            return login_response
+
+        error_response = response.model(ErrorResponse)
+        self.logger.error("Ошибка логина для %s: %s (status: %s)",
+                          email, error_response.message, error_response.statusCode)
+        return error_response
+
+    async def register(self, user_data: dict, expected_status: int = 201,
+                       latency_budget_ms: float | None = None) -> User | ErrorResponse:
+        email = user_data.get('email', 'N/A')
+        self.logger.info("Попытка регистрации пользователя %s", email)
+        response = await self.post(REGISTER_ENDPOINT, json=user_data, expected_status=expected_status,
+                                   latency_budget_ms=latency_budget_ms)
+        if response.ok:
+            user = response.model(User)
+            self.logger.info("Пользователь %s успешно зарегистрирован.", user.email)
+            return user
+
+        error_response = response.model(ErrorResponse)
+        self.logger.error("Ошибка регистрации для %s: %s (status: %s)",
+                          email, error_response.message, error_response.statusCode)
+        return error_response
+
+    async def logout(self, expected_status: int = 200, latency_budget_ms: float | None = None) -> dict | ErrorResponse:
+        self.logger.info("Попытка выхода из системы (logout)")
+        response = await self.post(LOGOUT_ENDPOINT, expected_status=expected_status,
+                                   latency_budget_ms=latency_budget_ms)
+        if response.ok:
+            self.logger.info("Выход из системы выполнен успешно")
+            return response.json()
+        self.logger.error("Ошибка выхода из системы: status %s", response.status_code)
+        return response.model(ErrorResponse)
+
+    async def refresh_token(self, expected_status: int = 200,
+                            latency_budget_ms: float | None = None) -> dict | ErrorResponse:
+        self.logger.info("Попытка обновления токенов")
+        response = await self.post(REFRESH_ENDPOINT, expected_status=expected_status,
+                                   latency_budget_ms=latency_budget_ms)
+        if response.ok:
+            self.logger.info("Токены успешно обновлены")
+            return response.json()
+        self.logger.error("Ошибка обновления токенов: status %s", response.status_code)
+        return response.model(ErrorResponse)
@@ -0,0 +1,112 @@
+import requests
+import logging
+from concurrent.futures import Executor
+from typing import Optional, Union
+from tests.constants.endpoints import MOVIES_ENDPOINT, CREATE_MOVIE_ENDPOINT, MOVIE_BY_ID_ENDPOINT
+from tests.constants.log_messages import LogMessages
+from tests.request.async_custom_requester import AsyncCustomRequester
+from tests.request.response_cache import MOVIES_CACHE
+from tests.clients.async_auth_api import AsyncAuthAPI
+from tests.clients.movies_api import MOVIES_LIST_TAG, MovieResponse, movie_tag
+from tests.models.movie_models import Movie, MovieWithReviews
+from tests.models.response_models import MoviesList, ErrorResponse, DeletedObject
+from tests.models.request_models import MovieCreate
+from tests.utils.log_pipeline import LazyMessage
+
+class AsyncMoviesAPI(AsyncCustomRequester):
+    def __init__(self, session: requests.Session, base_url: str, executor: Executor | None = None):
+        super().__init__(session, base_url, executor=executor)
+        self.auth_handler: Optional[AsyncAuthAPI] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def create_movie(self, movie_data: Union[MovieCreate, dict], *, expected_status: int = 201,
+                           latency_budget_ms: float | None = None) -> MovieResponse:
+        log_name = movie_data.name if isinstance(movie_data, MovieCreate) else "from dict"
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_CREATE, log_name))
+
+        if isinstance(movie_data, MovieCreate):
+            data = movie_data.model_dump(by_alias=True)
+        else:
+            data = movie_data
+
+        response = await self.post(CREATE_MOVIE_ENDPOINT, json=data, expected_status=expected_status,
+                                   latency_budget_ms=latency_budget_ms)
+        # Сам клиент не кэширует, но его записи должны сбрасывать кэш синхронного MoviesAPI
+        MOVIES_CACHE.invalidate(MOVIES_LIST_TAG)
+        if response.ok:
+            movie = response.model(Movie)
+            self.logger.info(LazyMessage(LogMessages.Movies.CREATE_SUCCESS, movie.name, movie.id))
+            return movie
+
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка создания фильма '%s': %s (status: %s)", log_name, error.message, error.statusCode)
+        return error
+
+    async def get_movie_by_id(self, movie_id: int | str, expected_status: int = 200,
+                              latency_budget_ms: float | None = None) -> MovieWithReviews | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_GET_BY_ID, movie_id))
+        response = await self.get(MOVIE_BY_ID_ENDPOINT, path_params={"movie_id": movie_id},
+                                  expected_status=expected_status, latency_budget_ms=latency_budget_ms)
+        if response.ok:
+            movie = response.model(MovieWithReviews)
+            self.logger.info(LazyMessage(LogMessages.Movies.GET_BY_ID_SUCCESS, movie.name, movie_id))
+            return movie
+
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка получения фильма по ID %s: %s (status: %s)",
+                          movie_id, error.message, error.statusCode)
+        return error
+
+    async def delete_movie(self, movie_id: int | str, expected_status: int = 200,
+                           latency_budget_ms: float | None = None) -> DeletedObject | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_DELETE, movie_id))
+        response = await self.delete(MOVIE_BY_ID_ENDPOINT, path_params={"movie_id": movie_id},
+                                     expected_status=expected_status, latency_budget_ms=latency_budget_ms)
+        MOVIES_CACHE.invalidate(movie_tag(movie_id), MOVIES_LIST_TAG)
+        if response.ok:
+            deleted_object = response.model(DeletedObject)
+            self.logger.info(LazyMessage(LogMessages.Movies.DELETE_SUCCESS, movie_id, movie_id))
+            return deleted_object
+
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка удаления фильма %s: %s (status: %s)", movie_id, error.message, error.statusCode)
+        return error
+
+    async def get_movies(self, params: dict | None = None, *, expected_status: int = 200,
+                         latency_budget_ms: float | None = None) -> MoviesList | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_GET_LIST, params or "default"))
+        response = await self.get(MOVIES_ENDPOINT, params=params, expected_status=expected_status,
+                                  latency_budget_ms=latency_budget_ms)
+        if response.ok:
+            movies_list = response.model(MoviesList)
+            self.logger.info("Успешно получено %s фильмов. Всего найдено: %s",
+                             len(movies_list.movies), movies_list.count)
+            return movies_list
+
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка получения списка фильмов: %s (status: %s)", error.message, error.statusCode)
+        return error
+
+    async def get_movies_with_invalid_params(self, params: dict, expected_status: int = 400,
+                                             latency_budget_ms: float | None = None) -> ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_GET_LIST_INVALID, params))
+        response = await self.get(MOVIES_ENDPOINT, params=params, expected_status=expected_status,
+                                  latency_budget_ms=latency_budget_ms)
+        error = response.model(ErrorResponse)
+        self.logger.warning("Ожидаемая ошибка при получении фильмов: %s (status: %s)", error.message, error.statusCode)
+        return error
+
+    async def edit_movie(self, movie_id: int | str, payload: dict, expected_status: int = 200,
+                         latency_budget_ms: float | None = None) -> Movie | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_EDIT, movie_id))
+        response = await self.patch(MOVIE_BY_ID_ENDPOINT, path_params={"movie_id": movie_id}, json=payload,
+                                    expected_status=expected_status, latency_budget_ms=latency_budget_ms)
+        MOVIES_CACHE.invalidate(movie_tag(movie_id), MOVIES_LIST_TAG)
+        if response.ok:
+            movie = response.model(Movie)
+            self.logger.info(LazyMessage(LogMessages.Movies.EDIT_SUCCESS, movie.name, movie.id))
+            return movie
+
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка редактирования фильма %s: %s (status: %s)", movie_id, error.message, error.statusCode)
+        return error
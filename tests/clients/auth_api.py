@@ -7,6 +7,7 @@ from tests.constants.log_messages import LogMessages
 from tests.request.custom_requester import CustomRequester
 from tests.models.response_models import LoginResponse, ErrorResponse
 from tests.models.user_models import User
+from tests.utils.log_pipeline import LazyMessage
 
 LoginApiResponse: TypeAlias = Union[LoginResponse, ErrorResponse]
 RegisterApiResponse: TypeAlias = Union[User, ErrorResponse]
@@ -18,50 +19,55 @@ class AuthAPI(CustomRequester):
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def login(self, email: str | None = ADMIN_EMAIL, password: str | None = ADMIN_PASSWORD,
-              expected_status: int = 200) -> LoginApiResponse:
+              expected_status: int = 200, latency_budget_ms: float | None = None) -> LoginApiResponse:
         if not email or not password:
             raise ValueError("ADMIN_EMAIL и ADMIN_PASSWORD должны быть указаны в .env file")
 
-        self.logger.info(LogMessages.Auth.ATTEMPT_LOGIN.format(email))
+        self.logger.info(LazyMessage(LogMessages.Auth.ATTEMPT_LOGIN, email))
         payload = {"email": email, "password": password}
-        response = self.post(LOGIN_ENDPOINT, data=payload, expected_status=expected_status)
+        response = self.post(LOGIN_ENDPOINT, data=payload, expected_status=expected_status,
+                             latency_budget_ms=latency_budget_ms)
         if response.ok:
-            login_response = LoginResponse.model_validate(response.json())
+            login_response = response.model(LoginResponse)
             self.session.headers["Authorization"] = f"Bearer {login_response.access_token}"
-            self.logger.info(LogMessages.Auth.LOGIN_SUCCESS.format(email))
+            self.logger.info(LazyMessage(LogMessages.Auth.LOGIN_SUCCESS, email))
             return login_response
 
-        error_response = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка логина для {email}: {error_response.message} (status: {error_response.statusCode})")
+        error_response = response.model(ErrorResponse)
+        self.logger.error("Ошибка логина для %s: %s (status: %s)",
+                          email, error_response.message, error_response.statusCode)
         return error_response
 
-    def register(self, user_data: dict, expected_status: int = 201) -> User | ErrorResponse:
+    def register(self, user_data: dict, expected_status: int = 201,
+                 latency_budget_ms: float | None = None) -> User | ErrorResponse:
         email = user_data.get('email', 'N/A')
-        self.logger.info(f"Попытка регистрации пользователя {email}")
-        response = self.post(REGISTER_ENDPOINT, json=user_data, expected_status=expected_status)
+        self.logger.info("Попытка регистрации пользователя %s", email)
+        response = self.post(REGISTER_ENDPOINT, json=user_data, expected_status=expected_status,
+                             latency_budget_ms=latency_budget_ms)
         if response.ok:
-            user = User.model_validate(response.json())
-            self.logger.info(f"Пользователь {user.email} успешно зарегистрирован.")
+            user = response.model(User)
+            self.logger.info("Пользователь %s успешно зарегистрирован.", user.email)
             return user
 
-        error_response = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка регистрации для {email}: {error_response.message} (status: {error_response.statusCode})")
+        error_response = response.model(ErrorResponse)
+        self.logger.error("Ошибка регистрации для %s: %s (status: %s)",
+                          email, error_response.message, error_response.statusCode)
         return error_response
 
-    def logout(self, expected_status: int = 200) -> dict | ErrorResponse:
+    def logout(self, expected_status: int = 200, latency_budget_ms: float | None = None) -> dict | ErrorResponse:
         self.logger.info("Попытка выхода из системы (logout)")
-        response = self.post(LOGOUT_ENDPOINT, expected_status=expected_status)
+        response = self.post(LOGOUT_ENDPOINT, expected_status=expected_status, latency_budget_ms=latency_budget_ms)
         if response.ok:
             self.logger.info("Выход из системы выполнен успешно")
             return response.json()
-        self.logger.error(f"Ошибка выхода из системы: status {response.status_code}")
-        return ErrorResponse.model_validate(response.json())
+        self.logger.error("Ошибка выхода из системы: status %s", response.status_code)
+        return response.model(ErrorResponse)
 
-    def refresh_token(self, expected_status: int = 200) -> dict | ErrorResponse:
+    def refresh_token(self, expected_status: int = 200, latency_budget_ms: float | None = None) -> dict | ErrorResponse:
         self.logger.info("Попытка обновления токенов")
-        response = self.post(REFRESH_ENDPOINT, expected_status=expected_status)
+        response = self.post(REFRESH_ENDPOINT, expected_status=expected_status, latency_budget_ms=latency_budget_ms)
         if response.ok:
             self.logger.info("Токены успешно обновлены")
             return response.json()
-        self.logger.error(f"Ошибка обновления токенов: status {response.status_code}")
-        return ErrorResponse.model_validate(response.json())
\ No newline at end of file
+        self.logger.error("Ошибка обновления токенов: status %s", response.status_code)
+        return response.model(ErrorResponse)
\ No newline at end of file
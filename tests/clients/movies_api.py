@@ -1,95 +1,244 @@
 import requests
 import logging
-from typing import Optional, Union, TypeAlias
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Hashable, Iterator, Optional, Union, TypeAlias
+from pydantic import BaseModel
 from tests.constants.endpoints import MOVIES_ENDPOINT, CREATE_MOVIE_ENDPOINT, MOVIE_BY_ID_ENDPOINT
 from tests.constants.log_messages import LogMessages
 from tests.request.custom_requester import CustomRequester
+from tests.request.response_cache import MOVIES_CACHE
 from tests.clients.auth_api import AuthAPI
+from tests.models.catalog_models import MoviesCatalog
 from tests.models.movie_models import Movie, MovieWithReviews
 from tests.models.response_models import MoviesList, ErrorResponse, DeletedObject
 from tests.models.request_models import MovieCreate
+from tests.utils.log_pipeline import LazyMessage
 
 MovieResponse: TypeAlias = Union[Movie, ErrorResponse]
 DeletedMovieResponse: TypeAlias = Union[DeletedObject, ErrorResponse]
 MovieWithReviewsResponse: TypeAlias = Union[MovieWithReviews, ErrorResponse]
 MoviesListResponse: TypeAlias = Union[MoviesList, ErrorResponse]
 
+# Теги записей кэша GET: список сбрасывается любой записью, фильм - только своей
+MOVIES_LIST_TAG = "movies:list"
+
+def movie_tag(movie_id: int | str) -> str:
+    return f"movie:{movie_id}"
+
 class MoviesAPI(CustomRequester):
     def __init__(self, session: requests.Session, base_url: str):
         super().__init__(session, base_url)
         self.auth_handler: Optional[AuthAPI] = None
+        # False - get_movies/get_movie_by_id этого клиента всегда ходят в сеть
+        self.use_cache = True
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def create_movie(self, movie_data: Union[MovieCreate, dict], *, expected_status: int = 201) -> MovieResponse:
+    def create_movie(self, movie_data: Union[MovieCreate, dict], *, expected_status: int = 201,
+                     latency_budget_ms: float | None = None) -> MovieResponse:
         log_name = movie_data.name if isinstance(movie_data, MovieCreate) else "from dict"
-        self.logger.info(LogMessages.Movies.ATTEMPT_CREATE.format(log_name))
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_CREATE, log_name))
         
         if isinstance(movie_data, MovieCreate):
             data = movie_data.model_dump(by_alias=True)
         else:
             data = movie_data
 
-        response = self.post(CREATE_MOVIE_ENDPOINT, json=data, expected_status=expected_status)
+        response = self.post(CREATE_MOVIE_ENDPOINT, json=data, expected_status=expected_status,
+                             latency_budget_ms=latency_budget_ms)
+        MOVIES_CACHE.invalidate(MOVIES_LIST_TAG)
         if response.ok:
-            movie = Movie.model_validate(response.json())
-            self.logger.info(LogMessages.Movies.CREATE_SUCCESS.format(movie.name, movie.id))
+            movie = response.model(Movie)
+            self.logger.info(LazyMessage(LogMessages.Movies.CREATE_SUCCESS, movie.name, movie.id))
             return movie
 
-        error = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка создания фильма '{log_name}': {error.message} (status: {error.statusCode})")
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка создания фильма '%s': %s (status: %s)", log_name, error.message, error.statusCode)
         return error
 
-    def get_movie_by_id(self, movie_id: int | str, expected_status: int = 200) -> MovieWithReviews | ErrorResponse:
-        self.logger.info(LogMessages.Movies.ATTEMPT_GET_BY_ID.format(movie_id))
-        response = self.get(MOVIE_BY_ID_ENDPOINT.format(movie_id=movie_id), expected_status=expected_status)
+    def get_movie_by_id(self, movie_id: int | str, expected_status: int = 200,
+                        latency_budget_ms: float | None = None,
+                        use_cache: bool | None = None) -> MovieWithReviews | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_GET_BY_ID, movie_id))
+        fetch = lambda: self._fetch_movie_by_id(movie_id, expected_status, latency_budget_ms)
+        if not self._use_cache(expected_status, latency_budget_ms, use_cache):
+            return fetch()
+        return self._cached(MOVIE_BY_ID_ENDPOINT, {"movie_id": movie_id}, (movie_tag(movie_id),), fetch)
+
+    def _fetch_movie_by_id(self, movie_id: int | str, expected_status: int,
+                           latency_budget_ms: float | None) -> MovieWithReviews | ErrorResponse:
+        response = self.get(MOVIE_BY_ID_ENDPOINT, path_params={"movie_id": movie_id}, expected_status=expected_status,
+                            latency_budget_ms=latency_budget_ms)
         if response.ok:
-            movie = MovieWithReviews.model_validate(response.json())
-            self.logger.info(LogMessages.Movies.GET_BY_ID_SUCCESS.format(movie.name, movie_id))
+            movie = response.model(MovieWithReviews)
+            self.logger.info(LazyMessage(LogMessages.Movies.GET_BY_ID_SUCCESS, movie.name, movie_id))
             return movie
 
-        error = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка получения фильма по ID {movie_id}: {error.message} (status: {error.statusCode})")
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка получения фильма по ID %s: %s (status: %s)",
+                          movie_id, error.message, error.statusCode)
         return error
 
-    def delete_movie(self, movie_id: int | str, expected_status: int = 200) -> DeletedObject | ErrorResponse:
-        self.logger.info(LogMessages.Movies.ATTEMPT_DELETE.format(movie_id))
-        response = self.delete(MOVIE_BY_ID_ENDPOINT.format(movie_id=movie_id), expected_status=expected_status)
+    def delete_movie(self, movie_id: int | str, expected_status: int = 200,
+                     latency_budget_ms: float | None = None) -> DeletedObject | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_DELETE, movie_id))
+        response = self.delete(MOVIE_BY_ID_ENDPOINT, path_params={"movie_id": movie_id},
+                               expected_status=expected_status, latency_budget_ms=latency_budget_ms)
+        MOVIES_CACHE.invalidate(movie_tag(movie_id), MOVIES_LIST_TAG)
         if response.ok:
-            deleted_object = DeletedObject.model_validate(response.json())
-            self.logger.info(LogMessages.Movies.DELETE_SUCCESS.format(movie_id, movie_id))
+            deleted_object = response.model(DeletedObject)
+            self.logger.info(LazyMessage(LogMessages.Movies.DELETE_SUCCESS, movie_id, movie_id))
             return deleted_object
 
-        error = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка удаления фильма {movie_id}: {error.message} (status: {error.statusCode})")
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка удаления фильма %s: %s (status: %s)", movie_id, error.message, error.statusCode)
         return error
 
-    def get_movies(self, params: dict | None = None, *, expected_status: int = 200) -> MoviesList | ErrorResponse:
-        self.logger.info(LogMessages.Movies.ATTEMPT_GET_LIST.format(params or "default"))
-        response = self.get(MOVIES_ENDPOINT, params=params, expected_status=expected_status)
+    def get_movies(self, params: dict | None = None, *, expected_status: int = 200,
+                   latency_budget_ms: float | None = None, use_cache: bool | None = None) -> MoviesList | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_GET_LIST, params or "default"))
+        fetch = lambda: self._fetch_movies(params, expected_status, latency_budget_ms)
+        if not self._use_cache(expected_status, latency_budget_ms, use_cache):
+            return fetch()
+        return self._cached(MOVIES_ENDPOINT, params, (MOVIES_LIST_TAG,), fetch)
+
+    def _fetch_movies(self, params: dict | None, expected_status: int,
+                      latency_budget_ms: float | None) -> MoviesList | ErrorResponse:
+        response = self.get(MOVIES_ENDPOINT, params=params, expected_status=expected_status,
+                            latency_budget_ms=latency_budget_ms)
         if response.ok:
-            movies_list = MoviesList.model_validate(response.json())
-            self.logger.info(f"Успешно получено {len(movies_list.movies)} фильмов. Всего найдено: {movies_list.count}")
+            movies_list = response.model(MoviesList)
+            self.logger.info("Успешно получено %s фильмов. Всего найдено: %s",
+                             len(movies_list.movies), movies_list.count)
             return movies_list
 
-        error = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка получения списка фильмов: {error.message} (status: {error.statusCode})")
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка получения списка фильмов: %s (status: %s)", error.message, error.statusCode)
         return error
 
-    def get_movies_with_invalid_params(self, params: dict, expected_status: int = 400) -> ErrorResponse:
-        self.logger.info(LogMessages.Movies.ATTEMPT_GET_LIST_INVALID.format(params))
-        response = self.get(MOVIES_ENDPOINT, params=params, expected_status=expected_status)
-        error = ErrorResponse.model_validate(response.json())
-        self.logger.warning(f"Ожидаемая ошибка при получении фильмов: {error.message} (status: {error.statusCode})")
+    def get_movies_with_invalid_params(self, params: dict, expected_status: int = 400,
+                                       latency_budget_ms: float | None = None) -> ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_GET_LIST_INVALID, params))
+        response = self.get(MOVIES_ENDPOINT, params=params, expected_status=expected_status,
+                            latency_budget_ms=latency_budget_ms)
+        error = response.model(ErrorResponse)
+        self.logger.warning("Ожидаемая ошибка при получении фильмов: %s (status: %s)", error.message, error.statusCode)
         return error
 
-    def edit_movie(self, movie_id: int | str, payload: dict, expected_status: int = 200) -> Movie | ErrorResponse:
-        self.logger.info(LogMessages.Movies.ATTEMPT_EDIT.format(movie_id))
-        response = self.patch(MOVIE_BY_ID_ENDPOINT.format(movie_id=movie_id), json=payload, expected_status=expected_status)
+    def edit_movie(self, movie_id: int | str, payload: dict, expected_status: int = 200,
+                   latency_budget_ms: float | None = None) -> Movie | ErrorResponse:
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_EDIT, movie_id))
+        response = self.patch(MOVIE_BY_ID_ENDPOINT, path_params={"movie_id": movie_id}, json=payload,
+                              expected_status=expected_status, latency_budget_ms=latency_budget_ms)
+        MOVIES_CACHE.invalidate(movie_tag(movie_id), MOVIES_LIST_TAG)
         if response.ok:
-            movie = Movie.model_validate(response.json())
-            self.logger.info(LogMessages.Movies.EDIT_SUCCESS.format(movie.name, movie.id))
+            movie = response.model(Movie)
+            self.logger.info(LazyMessage(LogMessages.Movies.EDIT_SUCCESS, movie.name, movie.id))
             return movie
 
-        error = ErrorResponse.model_validate(response.json())
-        self.logger.error(f"Ошибка редактирования фильма {movie_id}: {error.message} (status: {error.statusCode})")
-        return error
\ No newline at end of file
+        error = response.model(ErrorResponse)
+        self.logger.error("Ошибка редактирования фильма %s: %s (status: %s)", movie_id, error.message, error.statusCode)
+        return error
+
+    def _use_cache(self, expected_status: int, latency_budget_ms: float | None, use_cache: bool | None) -> bool:
+        # Проверки ошибок и замеры задержки всегда идут в сеть
+        enabled = self.use_cache if use_cache is None else use_cache
+        return enabled and expected_status == 200 and latency_budget_ms is None
+
+    def _cache_key(self, endpoint: str, params: dict | None) -> Hashable:
+        # Ответ зависит от прав, поэтому токен входит в ключ. Порядок параметров, None-значения
+        # и тип значений (1 и "1") ключ не меняют - в query string они все равно одинаковые
+        normalized = tuple(sorted(
+            (key, tuple(map(str, value)) if isinstance(value, (list, tuple)) else str(value))
+            for key, value in (params or {}).items() if value is not None
+        ))
+        return self.base_url, self.session.headers.get("Authorization"), endpoint, normalized
+
+    def _cached(self, endpoint: str, params: dict | None, tags: tuple[str, ...],
+                fetch: Callable[[], BaseModel]) -> BaseModel:
+        value, hit = MOVIES_CACHE.get_or_fetch(self._cache_key(endpoint, params), tags, fetch,
+                                               cacheable=lambda value: not isinstance(value, ErrorResponse))
+        if hit:
+            self.logger.info(LazyMessage(LogMessages.Movies.CACHE_HIT, endpoint, params or "default"))
+        return value
+
+    def iter_movies(self, filters: dict | None = None, page_size: int = 10, *,
+                    stop_when: Callable[[Movie], bool] | None = None) -> Iterator[Movie]:
+        # Пока потребитель обрабатывает страницу N, страница N+1 уже загружается в фоне.
+        # В памяти одновременно не больше двух страниц, каким бы большим ни был каталог.
+        params = {**(filters or {}), "pageSize": page_size}
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_ITER, params))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="movies-prefetch") as executor:
+            page = 1
+            pending = self._request_movies_page(executor, params, page)
+            while pending is not None:
+                movies_list = self._complete_movies_page(*pending)
+                page += 1
+                pending = self._request_movies_page(executor, params, page) if page <= movies_list.page_count else None
+                for movie in movies_list.movies:
+                    yield movie
+                    if stop_when is not None and stop_when(movie):
+                        self.logger.info(LazyMessage(LogMessages.Movies.ITER_STOPPED, movie.id))
+                        return
+
+    def _request_movies_page(self, executor: ThreadPoolExecutor, params: dict, page: int) -> tuple[dict, Future]:
+        # В фоновом потоке выполняется только сетевой вызов: allure и валидация остаются в потоке теста
+        page_params = {**params, "page": page}
+        url = f"{self.base_url}{MOVIES_ENDPOINT}"
+        return page_params, executor.submit(self._perform_request, "GET", url, {"params": page_params}, MOVIES_ENDPOINT)
+
+    def _complete_movies_page(self, page_params: dict, future: Future) -> MoviesList:
+        url = f"{self.base_url}{MOVIES_ENDPOINT}"
+        response = self._complete_request("GET", url, page_params, None, future.result(), expected_status=200)
+        return response.model(MoviesList)
+
+    def snapshot_movies(self, filters: dict | None = None, page_size: int = 20, *, max_workers: int = 8,
+                        max_drift_retries: int = 2) -> MoviesCatalog:
+        params = {**(filters or {}), "pageSize": page_size}
+        self.logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_SNAPSHOT, params))
+        first_page = self.get(MOVIES_ENDPOINT, params={**params, "page": 1}, expected_status=200).model(MoviesList)
+        pages = {1: first_page}
+        expected_count, page_count = first_page.count, first_page.page_count
+        to_fetch = list(range(2, page_count + 1))
+        pages_fetched = 1
+        drift_detected = False
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="movies-snapshot") as executor:
+            for attempt in range(max_drift_retries + 1):
+                fetched = self._fetch_movies_pages(executor, params, to_fetch)
+                pages.update(fetched)
+                pages_fetched += len(to_fetch)
+                if all(movies_list.count == expected_count for movies_list in pages.values()):
+                    break
+
+                # Каталог изменился во время обхода: эталоном становится самый свежий ответ,
+                # а страницы со старым count могли съехать и перезапрашиваются
+                drift_detected = True
+                latest = list(fetched.values())[-1] if fetched else first_page
+                expected_count, page_count = latest.count, latest.page_count
+                for page in [page for page in pages if page > page_count]:
+                    del pages[page]
+                to_fetch = sorted(
+                    {page for page, movies_list in pages.items() if movies_list.count != expected_count}
+                    | {page for page in range(1, page_count + 1) if page not in pages}
+                )
+                self.logger.warning(LazyMessage(LogMessages.Movies.SNAPSHOT_DRIFT, expected_count, to_fetch))
+                if attempt == max_drift_retries or not to_fetch:
+                    break
+
+        movies = {movie.id: movie for page in sorted(pages) for movie in pages[page].movies}
+        catalog = MoviesCatalog(movies=movies, expected_count=expected_count, pages_fetched=pages_fetched,
+                                drift_detected=drift_detected)
+        self.logger.info(LazyMessage(LogMessages.Movies.SNAPSHOT_SUCCESS, len(catalog), expected_count, pages_fetched))
+        return catalog
+
+    def _fetch_movies_pages(self, executor: ThreadPoolExecutor, params: dict, pages: list[int]) -> dict[int, MoviesList]:
+        # Страницы возвращаются в порядке получения ответов
+        futures = {}
+        for page in pages:
+            page_params, future = self._request_movies_page(executor, params, page)
+            futures[future] = page_params
+        fetched = {}
+        for future in as_completed(futures):
+            page_params = futures[future]
+            fetched[page_params["page"]] = self._complete_movies_page(page_params, future)
+        return fetched
@@ -0,0 +1,144 @@
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+import requests
+from tests.clients.api_manager import ApiManager
+from tests.clients.async_api_manager import AsyncApiManager
+from tests.clients.auth_api import AuthAPI
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL, ADMIN_EMAIL, ADMIN_PASSWORD
+from tests.constants.log_messages import LogMessages
+from tests.models.response_models import LoginResponse
+from tests.models.token_models import CachedToken, StoredCookie
+from tests.utils.file_lock import file_lock
+from tests.utils.log_pipeline import LazyMessage
+
+def jwt_expiry(token: str) -> float | None:
+    # Поле exp из payload JWT без проверки подписи; None, если строка - не JWT
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+class TokenCache:
+
+    refresh_margin_seconds = 60
+    default_ttl_seconds = 15 * 60
+
+    def __init__(self, storage_dir: Path, base_url: str = BASE_URL, base_auth_url: str = BASE_AUTH_URL,
+                 session_factory: Callable[[], requests.Session] = requests.Session,
+                 credentials: tuple[str | None, str | None] = (ADMIN_EMAIL, ADMIN_PASSWORD)):
+        self.storage_dir = Path(storage_dir)
+        self.base_url = base_url
+        self.base_auth_url = base_auth_url
+        self.session_factory = session_factory
+        self.credentials = credentials
+        self._tokens: dict[str, CachedToken] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def get_token(self, email: str | None = None, password: str | None = None) -> CachedToken:
+        email, password = self._credentials(email, password)
+        key = self._key(email)
+        token = self._tokens.get(key)
+        if token and not self._is_expiring(token):
+            return token
+
+        with self._lock, file_lock(self._path(key).with_suffix(".lock")):
+            # Другой воркер мог обновить токен, пока мы ждали блокировку
+            token = self._read(key)
+            if token is None or self._is_expiring(token):
+                token = self._renew(token, email, password)
+                self._write(key, token)
+            else:
+                self.logger.info(LazyMessage(LogMessages.Auth.TOKEN_FROM_CACHE, email))
+            self._tokens[key] = token
+        return token
+
+    def authorize(self, api_manager: ApiManager | AsyncApiManager, email: str | None = None,
+                  password: str | None = None) -> ApiManager | AsyncApiManager:
+        token = self.get_token(email, password)
+        api_manager.session.headers["Authorization"] = f"Bearer {token.access_token}"
+        return api_manager
+
+    def api_manager(self, session: requests.Session | None = None, email: str | None = None,
+                    password: str | None = None) -> ApiManager:
+        api_manager = ApiManager(session or self.session_factory(), base_url=self.base_url,
+                                 base_auth_url=self.base_auth_url)
+        return self.authorize(api_manager, email, password)
+
+    def invalidate(self, email: str | None = None) -> None:
+        key = self._key(email or self.credentials[0])
+        with self._lock, file_lock(self._path(key).with_suffix(".lock")):
+            self._tokens.pop(key, None)
+            self._path(key).unlink(missing_ok=True)
+
+    def _credentials(self, email: str | None, password: str | None) -> tuple[str | None, str | None]:
+        if email is None:
+            return self.credentials
+        return email, password
+
+    def _renew(self, token: CachedToken | None, email: str | None, password: str | None) -> CachedToken:
+        if token is not None and token.cookies:
+            refreshed = self._refresh(token)
+            if refreshed is not None:
+                return refreshed
+        return self._login(email, password)
+
+    def _login(self, email: str | None, password: str | None) -> CachedToken:
+        session = self.session_factory()
+        login_response = AuthAPI(session, base_url=self.base_auth_url).login(email, password)
+        if not isinstance(login_response, LoginResponse):
+            raise RuntimeError(f"Не удалось получить токен для {email}: {login_response.message}")
+        self.logger.info(LazyMessage(LogMessages.Auth.TOKEN_CACHED, email))
+        return self._build_token(login_response.access_token, session)
+
+    def _refresh(self, token: CachedToken) -> CachedToken | None:
+        session = self.session_factory()
+        for cookie in token.cookies:
+            session.cookies.set(cookie.name, cookie.value, domain=cookie.domain, path=cookie.path)
+        refresh_response = AuthAPI(session, base_url=self.base_auth_url).refresh_token(expected_status=None)
+        if not isinstance(refresh_response, dict) or "accessToken" not in refresh_response:
+            self.logger.warning(LogMessages.Auth.TOKEN_REFRESH_FAILED)
+            return None
+        self.logger.info(LogMessages.Auth.TOKEN_REFRESHED)
+        return self._build_token(refresh_response["accessToken"], session)
+
+    def _build_token(self, access_token: str, session: requests.Session) -> CachedToken:
+        cookies = [StoredCookie(name=cookie.name, value=cookie.value or "", domain=cookie.domain, path=cookie.path)
+                   for cookie in session.cookies]
+        return CachedToken(access_token=access_token, expires_at=self._token_expiry(access_token), cookies=cookies)
+
+    def _token_expiry(self, access_token: str) -> float:
+        expires_at = jwt_expiry(access_token)
+        return time.time() + self.default_ttl_seconds if expires_at is None else expires_at
+
+    def _is_expiring(self, token: CachedToken) -> bool:
+        return token.expires_in() <= self.refresh_margin_seconds
+
+    def _key(self, email: str | None) -> str:
+        return hashlib.sha256(f"{self.base_auth_url}|{email}".encode()).hexdigest()[:16]
+
+    def _path(self, key: str) -> Path:
+        return self.storage_dir / f"token_{key}.json"
+
+    def _read(self, key: str) -> CachedToken | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            return CachedToken.model_validate_json(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+    def _write(self, key: str, token: CachedToken) -> None:
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(token.model_dump_json(), encoding="utf-8")
+        tmp_path.replace(path)
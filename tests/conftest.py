@@ -1,54 +1,298 @@
 import pytest
-import requests
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import random
+from pathlib import Path
 from faker import Faker
+from playwright.sync_api import Browser, Page
 from clients.api_manager import ApiManager
-from tests.constants.endpoints import BASE_URL
+from tests.clients.async_api_manager import AsyncApiManager
+from tests.clients.token_cache import TokenCache
+from tests.request.attachments import ATTACHMENTS, AttachmentPolicy
+from tests.request.http_dump import HTTP_DUMP, DumpMode
+from tests.request.retry import RETRIES
+from tests.request.rate_limit import RATE_LIMITER
+from tests.request.response_cache import MOVIES_CACHE, ResponseCache
+from tests.request.cassette import CassetteAdapter, CassetteMode, CassetteStore, MatchPolicy
+from tests.request.transport import TransportFactory
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL
+from tests.fake_backend.adapter import FakeCinescopeAdapter
+from tests.fake_backend.backend import FakeCinescopeBackend
+from tests.fake_backend.server import FaultInjection, StandInServer
 from tests.constants.log_messages import LogMessages
 from utils.data_generator import MovieDataGenerator, UserDataGenerator
 from tests.models.request_models import UserCreate, MovieCreate
 from tests.models.user_models import User
 from tests.models.movie_models import Movie
+from tests.utils.cleanup_registry import CleanupRegistry
+from tests.utils.movie_seeder import MovieSeeder
+from tests.utils.fake_clock import FakeClock
+from tests.utils.latency import LATENCY
+from tests.utils.session_report import SESSION_REPORT
+from tests.utils.storage_state import StorageState, StorageStateCache
+from tests.models.routing_models import RoutingPolicy
+from tests.ui.routing import AssetCache, UiRouter
+from tests.ui.tracing import TraceRecorder, TraceStore
+from tests.ui.screenshots import SCREENSHOTS, ScreenshotFormat
+from tests.ui.pages.login_page import LoginPage
+from tests.ui.pages.main_page import MainPage
+from tests.utils.sla_policy import SLA, SlaMode
+from tests.constants.sla import SESSION_MIN_SAMPLES
+from tests.utils.log_pipeline import LOG_PIPELINE, LazyMessage, LogPipelineMode
+from tests.utils.xdist_env import shared_tmp_dir
 from typing import Generator
 import allure
 
 LOGGER = logging.getLogger(__name__)
 
+# Отчеты фаз теста (setup/call), чтобы фикстуры на teardown знали, упал ли тест
+PHASE_REPORTS = pytest.StashKey[dict]()
+
+def pytest_addoption(parser):
+    group = parser.getgroup("cinescope")
+    group.addoption("--pool-maxsize", action="store", type=int, default=TransportFactory.default_pool_maxsize,
+                    help="Размер пула keep-alive соединений на каждый хост")
+    group.addoption("--no-warmup", action="store_true", default=False,
+                    help="Не прогревать соединения с API, auth и UI хостами перед тестами")
+    group.addoption("--cleanup-mode", action="store", choices=("background", "session-end"), default="background",
+                    help="Когда удалять созданные тестами сущности: в фоне пачками или одним проходом в конце сессии")
+    group.addoption("--allure-attachments", action="store", default=AttachmentPolicy.ALWAYS.value,
+                    choices=[policy.value for policy in AttachmentPolicy],
+                    help="Когда прикладывать запросы и ответы к allure: всегда, только при падении, выборочно или никогда")
+    group.addoption("--allure-sample-rate", action="store", type=float, default=0.1,
+                    help="Доля тестов, для которых вложения пишутся в режиме sampled")
+    group.addoption("--allure-attachment-cap", action="store", type=int, default=None,
+                    help="Лимит размера вложений запросов/ответов на один тест, КБ")
+    group.addoption("--http-dump", action="store", choices=[mode.value for mode in DumpMode],
+                    default=DumpMode.ON_FAILURE.value,
+                    help="Когда писать в лог curl-репро запроса и ответ: всегда, только для неожиданного статуса или никогда")
+    group.addoption("--http-dump-max-body", action="store", type=int, default=8,
+                    help="Лимит тела запроса/ответа в дампе, КБ")
+    group.addoption("--http-dump-level", action="store", choices=("DEBUG", "INFO", "WARNING"), default="INFO",
+                    help="Уровень логирования дампа; если логгер его не пропускает, дамп не строится")
+    group.addoption("--retry-attempts", action="store", type=int, default=3,
+                    help="Сколько раз всего отправлять идемпотентный запрос при обрыве соединения или 502/503/504")
+    group.addoption("--retry-budget", action="store", type=int, default=30,
+                    help="Сколько повторов запросов допускается за прогон (общий для всех воркеров xdist)")
+    group.addoption("--rate-limit", action="store", choices=("on", "off"), default="on",
+                    help="Ограничивать темп запросов к API и auth общим для всех воркеров xdist лимитом (tests/constants/rate_limits.py)")
+    group.addoption("--movies-cache", action="store", choices=("on", "off"), default="off",
+                    help="Кэшировать успешные ответы get_movies/get_movie_by_id в пределах процесса со сбросом при записи")
+    group.addoption("--movies-cache-ttl", action="store", type=float, default=ResponseCache.default_ttl_s,
+                    help="Время жизни записи кэша фильмов, с")
+    group.addoption("--movies-cache-size", action="store", type=int, default=ResponseCache.default_max_entries,
+                    help="Сколько ответов хранит кэш фильмов, старые вытесняются (LRU)")
+    group.addoption("--fake-backend", action="store_true", default=False,
+                    help="Гонять API тесты против встроенного фейкового бэкенда вместо dev-стенда (UI тесты пропускаются)")
+    group.addoption("--latency-report", action="store", default=os.path.join("logs", "latency.json"),
+                    help="Куда записать JSON с перцентилями задержек по эндпоинтам")
+    group.addoption("--sla", action="store", choices=[mode.value for mode in SlaMode], default=SlaMode.WARN.value,
+                    help="Что делать при превышении бюджетов задержки: fail - ронять тест, warn - предупреждать, off - не проверять")
+    group.addoption("--cassette", action="store", default=None,
+                    help="Каталог кассеты для записи или воспроизведения HTTP обменов с API и auth")
+    group.addoption("--cassette-mode", action="store", choices=[mode.value for mode in CassetteMode],
+                    default=CassetteMode.REPLAY.value,
+                    help="record - писать обмены в кассету, replay - отвечать из кассеты без сети")
+    group.addoption("--cassette-strict", action="store_true", default=False,
+                    help="При воспроизведении требовать совпадения тела запроса без изменчивых полей, а не только его формы")
+    group.addoption("--stand-in-movies", action="store", type=int, default=StandInServer.default_movies,
+                    help="Размер каталога фильмов в локальном стенде stand_in_server")
+    group.addoption("--stand-in-workers", action="store", type=int, default=None,
+                    help="Число процессов локального стенда (по умолчанию - по числу CPU)")
+    group.addoption("--stand-in-latency-ms", action="store", type=float, default=0,
+                    help="Задержка ответов локального стенда, мс")
+    group.addoption("--stand-in-jitter-ms", action="store", type=float, default=0,
+                    help="Случайная добавка к задержке локального стенда, мс")
+    group.addoption("--stand-in-error-rate", action="store", type=float, default=0,
+                    help="Доля ответов локального стенда, подменяемых на 503")
+    group.addoption("--ui-routing", action="store", choices=("on", "off"), default="on",
+                    help="Блокировать в UI тестах картинки, шрифты и сторонние скрипты и раздавать статику из кэша")
+    group.addoption("--ui-asset-cache", action="store", default=None,
+                    help="Каталог кэша статики фронтенда (по умолчанию - в кэше pytest)")
+    group.addoption("--ui-trace", action="store", choices=("retain-on-failure", "off"), default="retain-on-failure",
+                    help="Писать трейс Playwright для каждого UI теста и сохранять его только при падении")
+    group.addoption("--ui-trace-dir", action="store", default=os.path.join("logs", "traces"),
+                    help="Куда сохранять трейсы упавших UI тестов")
+    group.addoption("--ui-trace-max-mb", action="store", type=float, default=TraceStore.default_max_trace_mb,
+                    help="Трейс больше этого размера, МБ, не сохраняется")
+    group.addoption("--ui-trace-keep", action="store", type=int, default=TraceStore.default_keep,
+                    help="Сколько последних трейсов хранить в каталоге")
+    group.addoption("--failure-screenshot-format", action="store", choices=[fmt.value for fmt in ScreenshotFormat],
+                    default=ScreenshotFormat.JPEG.value,
+                    help="Формат скриншота упавшего UI теста (webp требует Pillow)")
+    group.addoption("--failure-screenshot-quality", action="store", type=int, default=80,
+                    help="Качество JPEG/WebP скриншота упавшего UI теста, 0-100")
+    group.addoption("--log-pipeline", action="store", choices=[mode.value for mode in LogPipelineMode],
+                    default=LogPipelineMode.QUEUE.value,
+                    help="queue - логи пишет фоновый поток, sync - запись в файл прямо в потоке теста")
+
+def pytest_configure(config):
+    cap_kb = config.getoption("--allure-attachment-cap")
+    ATTACHMENTS.configure(
+        policy=AttachmentPolicy(config.getoption("--allure-attachments")),
+        sample_rate=config.getoption("--allure-sample-rate"),
+        max_bytes_per_test=cap_kb * 1024 if cap_kb is not None else None,
+    )
+    SLA.configure(SlaMode(config.getoption("--sla")))
+    MOVIES_CACHE.configure(config.getoption("--movies-cache") == "on", ttl_s=config.getoption("--movies-cache-ttl"),
+                           max_entries=config.getoption("--movies-cache-size"))
+    HTTP_DUMP.configure(DumpMode(config.getoption("--http-dump")),
+                        max_body_bytes=config.getoption("--http-dump-max-body") * 1024,
+                        level=logging.getLevelName(config.getoption("--http-dump-level")))
+    # Весь экран или только viewport - общей опцией pytest-playwright
+    SCREENSHOTS.configure(ScreenshotFormat(config.getoption("--failure-screenshot-format")),
+                          quality=config.getoption("--failure-screenshot-quality"),
+                          full_page=config.getoption("--full-page-screenshot"),
+                          attach_to_allure=bool(config.getoption("allure_report_dir", None)))
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--fake-backend"):
+        return
+    skip_ui = pytest.mark.skip(reason="UI тесты требуют настоящего стенда и не запускаются с --fake-backend")
+    for item in items:
+        if item.get_closest_marker("ui"):
+            item.add_marker(skip_ui)
+
 def pytest_sessionstart(session):
     logs_dir = "logs"
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
 
-    log_file = os.path.join(logs_dir, "tests.log")
     screenshots_dir = os.path.join(logs_dir, "screenshots")
     if not os.path.exists(screenshots_dir):
         os.makedirs(screenshots_dir)
 
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
+    LOG_PIPELINE.start(Path(logs_dir), LogPipelineMode(session.config.getoption("--log-pipeline")))
+    LOGGER.info(LogMessages.General.SESSION_START)
 
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+@pytest.fixture(scope="session")
+def faker_instance() -> Faker:
+    return Faker("ru_RU")
 
-    file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
 
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
+@pytest.fixture
+def report_section(request) -> Generator[str, None, None]:
+    # Раздел сводки для юнит тестов кэша, повторов и ограничителя: их счетчики не попадают в сводку прогона
+    section = f"unit {request.node.nodeid}"
+    yield section
+    SESSION_REPORT.discard(section)
 
-    root_logger.addHandler(file_handler)
+@pytest.fixture(scope="session")
+def fake_backend(request) -> FakeCinescopeBackend | None:
+    if not request.config.getoption("--fake-backend"):
+        return None
+    return FakeCinescopeBackend()
 
-    LOGGER.info(LogMessages.General.SESSION_START)
+@pytest.fixture(scope="session")
+def stand_in_server(request) -> Generator[StandInServer, None, None]:
+    # К этому моменту в процессе pytest уже работают фоновые потоки (писатель логов, очистка, executor'ы),
+    # поэтому стенд запускает процессы через forkserver, а не fork, и каждый строит каталог сам из seed.
+    # Для каталога на миллион фильмов это несколько секунд на старте сессии.
+    config = request.config
+    faults = FaultInjection(latency_ms=config.getoption("--stand-in-latency-ms"),
+                            jitter_ms=config.getoption("--stand-in-jitter-ms"),
+                            error_rate=config.getoption("--stand-in-error-rate"))
+    with StandInServer(movies=config.getoption("--stand-in-movies"), workers=config.getoption("--stand-in-workers"),
+                       faults=faults) as server:
+        LOGGER.info("Локальный стенд запущен на %s", server.url)
+        yield server
 
 @pytest.fixture(scope="session")
-def faker_instance() -> Faker:
-    return Faker("ru_RU")
+def cassette_store(request) -> Generator[CassetteStore | None, None, None]:
+    path = request.config.getoption("--cassette")
+    if path is None:
+        yield None
+        return
+    store = CassetteStore(path, MatchPolicy(fallback_to_shape=not request.config.getoption("--cassette-strict")))
+    if request.config.getoption("--cassette-mode") == CassetteMode.REPLAY:
+        store.load()
+        LOGGER.info("Кассета %s загружена: %s обменов", path, len(store))
+    yield store
+    store.close()
+
+@pytest.fixture(autouse=True)
+def cassette_seed(request, cassette_store: CassetteStore | None) -> None:
+    # Тестовые данные случайные, поэтому при записи запоминаем seed теста, а при воспроизведении
+    # повторяем его - иначе тело запроса и проверки ответа не совпадут с записанными
+    if cassette_store is None:
+        return
+    test_id = request.node.nodeid
+    if request.config.getoption("--cassette-mode") == CassetteMode.RECORD:
+        seed = random.SystemRandom().getrandbits(32)
+        cassette_store.record_seed(test_id, seed)
+    else:
+        seed = cassette_store.seed_for(test_id)
+    if seed is not None:
+        random.seed(seed)
+        Faker.seed(seed)
+
+@pytest.fixture(scope="session")
+def rate_limiter(request, tmp_path_factory: pytest.TempPathFactory, fake_backend: FakeCinescopeBackend | None,
+                 cassette_store: CassetteStore | None) -> Generator[None, None, None]:
+    # Фейковый бэкенд и воспроизведение кассеты в сеть не ходят - ограничивать нечего
+    replaying = cassette_store is not None and request.config.getoption("--cassette-mode") == CassetteMode.REPLAY
+    enabled = request.config.getoption("--rate-limit") == "on" and fake_backend is None and not replaying
+    RATE_LIMITER.configure(enabled, shared_tmp_dir(tmp_path_factory) / "rate_limit")
+    yield
+    RATE_LIMITER.configure(False)
+
+@pytest.fixture(scope="session")
+def retry_budget(request, tmp_path_factory: pytest.TempPathFactory) -> None:
+    # Счетчик бюджета в общем каталоге, чтобы -n 8 не давал восьмикратный бюджет
+    RETRIES.configure(max_attempts=request.config.getoption("--retry-attempts"),
+                      budget=request.config.getoption("--retry-budget"),
+                      storage_dir=shared_tmp_dir(tmp_path_factory) / "retries")
+
+@pytest.fixture(scope="session")
+def transport_factory(request, fake_backend: FakeCinescopeBackend | None, cassette_store: CassetteStore | None,
+                      rate_limiter: None, retry_budget: None) -> Generator[TransportFactory, None, None]:
+    factory = TransportFactory(pool_maxsize=request.config.getoption("--pool-maxsize"))
+    if fake_backend is not None:
+        factory.mount(BASE_URL, FakeCinescopeAdapter(fake_backend, "api"))
+        factory.mount(BASE_AUTH_URL, FakeCinescopeAdapter(fake_backend, "auth"))
+    if cassette_store is not None:
+        mode = CassetteMode(request.config.getoption("--cassette-mode"))
+        for base_url in (BASE_URL, BASE_AUTH_URL):
+            factory.mount(base_url, CassetteAdapter(cassette_store, mode, inner=factory.adapter_for(base_url)))
+    replaying = cassette_store is not None and request.config.getoption("--cassette-mode") == CassetteMode.REPLAY
+    if fake_backend is None and not replaying and not request.config.getoption("--no-warmup"):
+        factory.warm_up()
+    yield factory
+    SESSION_REPORT.add("transport", factory.stats())
+    factory.close()
+
+@pytest.fixture(autouse=True)
+def movies_cache_bypass(request) -> Generator[None, None, None]:
+    # Маркер действует на кэш процесса, а не на один клиент: так его учитывают и MoviesAPI, созданные
+    # в других фикстурах или TokenCache. Проверке SLA нужны настоящие запросы, а не ответы из кэша
+    MOVIES_CACHE.bypass = bool(request.node.get_closest_marker("fresh_data") or request.node.get_closest_marker("sla"))
+    yield
+    MOVIES_CACHE.bypass = False
+
+@pytest.fixture(scope="function")
+def api_manager(transport_factory: TransportFactory) -> ApiManager:
+    return ApiManager(transport_factory.new_session(), base_url=BASE_URL)
 
 @pytest.fixture(scope="function")
-def api_manager() -> ApiManager:
-    return ApiManager(requests.Session(), base_url=BASE_URL)
+def async_api_manager(transport_factory: TransportFactory) -> Generator[AsyncApiManager, None, None]:
+    async_api_manager = transport_factory.async_api_manager()
+    yield async_api_manager
+    async_api_manager.close()
+
+@pytest.fixture(scope="function")
+def admin_async_api_manager(async_api_manager: AsyncApiManager, token_cache: TokenCache) -> AsyncApiManager:
+    return token_cache.authorize(async_api_manager)
+
+@pytest.fixture(scope="session")
+def movie_seeder(transport_factory: TransportFactory, token_cache: TokenCache) -> Generator[MovieSeeder, None, None]:
+    seeder = MovieSeeder(transport_factory.async_api_manager(), token_cache=token_cache)
+    yield seeder
+    seeder.teardown()
+    seeder.api_manager.close()
 
 @pytest.fixture()
 def user_credentials(faker_instance) -> tuple[UserCreate, str]:
@@ -62,13 +306,36 @@ def movie_payload() -> MovieCreate:
 def user_credentials_ui(faker_instance) -> tuple[UserCreate, str]:
     return UserDataGenerator.generate_user_payload()
 
+@pytest.fixture(scope="session")
+def token_cache(tmp_path_factory: pytest.TempPathFactory, transport_factory: TransportFactory,
+                fake_backend: FakeCinescopeBackend | None, cassette_store: CassetteStore | None) -> TokenCache:
+    token_cache = TokenCache(shared_tmp_dir(tmp_path_factory) / "tokens", base_url=BASE_URL,
+                             session_factory=transport_factory.new_session)
+    if fake_backend is not None:
+        # У каждого воркера свой фейковый бэкенд, поэтому токены нельзя делить между процессами
+        token_cache.storage_dir = tmp_path_factory.getbasetemp() / "tokens"
+        token_cache.credentials = fake_backend.admin_credentials
+    elif cassette_store is not None and None in token_cache.credentials:
+        token_cache.credentials = cassette_store.replay_credentials
+    return token_cache
+
 @pytest.fixture(scope="function")
-def admin_api_manager(api_manager: ApiManager) -> ApiManager:
-    api_manager.auth_api.login()
-    return api_manager
+def admin_api_manager(api_manager: ApiManager, token_cache: TokenCache) -> ApiManager:
+    return token_cache.authorize(api_manager)
+
+@pytest.fixture(scope="session")
+def cleanup_registry(request, transport_factory: TransportFactory,
+                     token_cache: TokenCache) -> Generator[CleanupRegistry, None, None]:
+    async_api_manager = transport_factory.async_api_manager(allure_reporting=False)
+    registry = CleanupRegistry(async_api_manager, token_cache=token_cache,
+                               background=request.config.getoption("--cleanup-mode") == "background")
+    yield registry
+    registry.close()
+    SESSION_REPORT.add("cleanup", registry.stats())
+    async_api_manager.close()
 
 @pytest.fixture
-def created_movie(admin_api_manager, movie_payload: MovieCreate):
+def created_movie(request, admin_api_manager, movie_payload: MovieCreate, cleanup_registry: CleanupRegistry):
     LOGGER.info("Фикстура 'created_movie': создаем фильм.")
     movie_id = None
     try:
@@ -78,31 +345,55 @@ def created_movie(admin_api_manager, movie_payload: MovieCreate):
         )
         assert isinstance(created_movie_model, Movie), "Фикстура 'created_movie' ожидала успешного создания фильма"
         movie_id = created_movie_model.id
-        LOGGER.info(f"Фильм с ID {movie_id} успешно создан фикстурой.")
+        LOGGER.info("Фильм с ID %s успешно создан фикстурой.", movie_id)
 
         yield created_movie_model
 
     finally:
-        if movie_id:
-            LOGGER.info(f"Фикстура 'created_movie': удаляем фильм с ID {movie_id}.")
+        if movie_id and not request.node.get_closest_marker("sync_cleanup"):
+            cleanup_registry.register(movie_id)
+        elif movie_id:
+            LOGGER.info("Фикстура 'created_movie': удаляем фильм с ID %s.", movie_id)
             try:
                 admin_api_manager.movies_api.delete_movie(movie_id, expected_status=200)
-                LOGGER.info(f"Фильм с ID {movie_id} успешно удален фикстурой.")
+                LOGGER.info("Фильм с ID %s успешно удален фикстурой.", movie_id)
             except AssertionError:
-                LOGGER.warning(f"Не удалось удалить фильм с ID {movie_id} в teardown фикстуры. Возможно, он уже был удален в тесте.")
+                LOGGER.warning("Не удалось удалить фильм с ID %s в teardown фикстуры. Возможно, он уже был удален в тесте.", movie_id)
+
+def pytest_runtest_setup(item):
+    ATTACHMENTS.start_test()
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    # Маркер sla проверяет p95 запросов, сделанных в теле теста; запросы фикстур не учитываются
+    marker = item.get_closest_marker("sla")
+    if marker is None or SLA.mode == SlaMode.OFF:
+        return (yield)
+    tracker = LATENCY.track()
+    try:
+        result = yield
+    finally:
+        LATENCY.untrack(tracker)
+    SLA.report(SLA.p95_violations(tracker, **marker.kwargs))
+    return result
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
+    item.stash.setdefault(PHASE_REPORTS, {})[report.when] = report
+
+    if report.failed:
+        ATTACHMENTS.flush()
+    elif report.when == "teardown":
+        ATTACHMENTS.discard()
 
     if report.when == "call" and report.failed:
-        if "page" in item.funcargs:
-            page = item.funcargs["page"]
-            screenshots_dir = os.path.join("logs", "screenshots")
-            screenshot_path = os.path.join(screenshots_dir, f"{item.name}_failure.png")
-            page.screenshot(path=screenshot_path)
-            allure.attach.file(screenshot_path, name="screenshot", attachment_type=allure.attachment_type.PNG)
+        page = item.funcargs.get("page") or item.funcargs.get("authenticated_page")
+        if page is not None:
+            SCREENSHOTS.capture(page, f"{item.name}_failure")
+    elif report.when == "teardown":
+        SCREENSHOTS.attach_pending()
 
 @pytest.fixture
 def registered_user_by_api_ui(api_manager: ApiManager, user_credentials_ui: tuple[UserCreate, str]) -> UserCreate:
@@ -112,11 +403,109 @@ def registered_user_by_api_ui(api_manager: ApiManager, user_credentials_ui: tupl
     api_manager.auth_api.register(user_data=register_data, expected_status=201)
     return user_payload
 
+@pytest.fixture(scope="session")
+def ui_user(transport_factory: TransportFactory) -> UserCreate:
+    # Один пользователь на воркер для UI тестов, которым нужен только факт авторизации
+    user_payload, password_repeat = UserDataGenerator.generate_user_payload()
+    register_data = user_payload.model_dump(by_alias=True)
+    register_data["passwordRepeat"] = password_repeat
+    transport_factory.api_manager().auth_api.register(user_data=register_data, expected_status=201)
+    return user_payload
+
+@pytest.fixture(scope="session")
+def storage_state_cache(tmp_path_factory: pytest.TempPathFactory, transport_factory: TransportFactory,
+                        browser: Browser, browser_context_args: dict, routing_policy: RoutingPolicy,
+                        ui_asset_cache: AssetCache) -> StorageStateCache:
+    router = UiRouter(routing_policy, ui_asset_cache)
+
+    def is_authenticated(state: StorageState) -> bool:
+        context = router.install(browser.new_context(**browser_context_args, storage_state=state))
+        try:
+            main_page = MainPage(context.new_page())
+            main_page.open()
+            return main_page.is_user_logged_in()
+        finally:
+            context.close()
+
+    def login_in_browser(user: UserCreate) -> StorageState:
+        context = router.install(browser.new_context(**browser_context_args))
+        try:
+            login_page = LoginPage(context.new_page())
+            login_page.open()
+            login_page.login(user, user.password)
+            login_page.check_user_is_logged_in()
+            return context.storage_state()
+        finally:
+            context.close()
+
+    # basetemp у каждого воркера xdist свой, поэтому и состояние браузера хранится отдельно
+    return StorageStateCache(tmp_path_factory.getbasetemp() / "storage_state", base_auth_url=BASE_AUTH_URL,
+                             session_factory=transport_factory.new_session, verify=is_authenticated,
+                             browser_login=login_in_browser)
+
+@pytest.fixture(scope="session")
+def routing_policy(request) -> RoutingPolicy:
+    return RoutingPolicy(enabled=request.config.getoption("--ui-routing") == "on")
+
+@pytest.fixture(scope="session")
+def ui_asset_cache(request, tmp_path_factory: pytest.TempPathFactory) -> AssetCache:
+    # Кэш pytest переживает сессию, поэтому статика качается один раз, а не на каждый прогон
+    cache_dir = request.config.getoption("--ui-asset-cache")
+    if cache_dir is None:
+        cache_provider = getattr(request.config, "cache", None)
+        cache_dir = cache_provider.mkdir("ui_assets") if cache_provider is not None \
+            else shared_tmp_dir(tmp_path_factory) / "ui_assets"
+    return AssetCache(Path(cache_dir))
+
+@pytest.fixture(scope="session")
+def trace_store(request) -> TraceStore | None:
+    # Встроенный --tracing pytest-playwright сам запускает трейс на контексте, второй запуск упадет
+    if request.config.getoption("--ui-trace") == "off" or request.config.getoption("--tracing") != "off":
+        return None
+    store = TraceStore(Path(request.config.getoption("--ui-trace-dir")),
+                       max_trace_mb=request.config.getoption("--ui-trace-max-mb"),
+                       keep=request.config.getoption("--ui-trace-keep"))
+    store.prune()
+    return store
+
+@pytest.fixture
+def new_context(request, new_context, routing_policy: RoutingPolicy, ui_asset_cache: AssetCache,
+                trace_store: TraceStore | None):
+    # Оборачивает фикстуру pytest-playwright: политика маршрутизации ставится на каждый контекст теста,
+    # а маркер routing переопределяет ее для тестов, которым нужны настоящие ассеты
+    marker = request.node.get_closest_marker("routing")
+    router = UiRouter(routing_policy.override(**marker.kwargs) if marker else routing_policy, ui_asset_cache)
+    tracer = TraceRecorder(trace_store, request.node.nodeid) if trace_store is not None else None
+
+    def _new_context(**kwargs):
+        context = router.install(new_context(**kwargs))
+        return tracer.start(context) if tracer is not None else context
+
+    yield _new_context
+    if tracer is not None:
+        # Упавшая попытка flaky теста при перезапуске тоже сюда попадает и сохраняет свой трейс
+        failed = any(report.failed for report in request.node.stash.get(PHASE_REPORTS, {}).values())
+        for trace_path in tracer.stop(failed):
+            allure.attach.file(str(trace_path), name="Playwright trace", extension="zip")
+    stats = router.stats.as_dict()
+    if stats["requests"]:
+        LOGGER.info(LazyMessage(LogMessages.Ui.ROUTING_SUMMARY, request.node.nodeid, stats["requests"],
+                                stats["requests_saved"], stats["bytes_saved"]))
+        allure.attach(json.dumps(stats, indent=4), name="Маршрутизация запросов UI",
+                      attachment_type=allure.attachment_type.JSON)
+        SESSION_REPORT.add("ui_routing", stats)
+
+@pytest.fixture
+def authenticated_page(new_context, storage_state_cache: StorageStateCache, ui_user: UserCreate) -> Page:
+    context = new_context(storage_state=storage_state_cache.path_for(ui_user))
+    return context.new_page()
+
 @pytest.fixture
-def new_registered_user(user_credentials: tuple[UserCreate, str]) -> Generator[tuple[ApiManager, UserCreate], None, None]:
+def new_registered_user(user_credentials: tuple[UserCreate, str],
+                        transport_factory: TransportFactory) -> Generator[tuple[ApiManager, UserCreate], None, None]:
     LOGGER.info("Фикстура 'new_registered_user': регистрируем нового пользователя.")
     user_payload, password_repeat = user_credentials
-    session = requests.Session()
+    session = transport_factory.new_session()
     api_manager = ApiManager(session, base_url=BASE_URL)
 
     try:
@@ -124,14 +513,115 @@ def new_registered_user(user_credentials: tuple[UserCreate, str]) -> Generator[t
         register_data["passwordRepeat"] = password_repeat
         registration_response = api_manager.auth_api.register(user_data=register_data, expected_status=201)
         assert isinstance(registration_response, User), "Фикстура 'new_registered_user' ожидала успешной регистрации"
-        LOGGER.info(f"Пользователь с email {user_payload.email} успешно зарегистрирован фикстурой.")
+        LOGGER.info("Пользователь с email %s успешно зарегистрирован фикстурой.", user_payload.email)
 
     except ValueError as e:
-        LOGGER.error(f"Регистрация пользователя {user_payload.email} провалилась: {e}")
+        LOGGER.error("Регистрация пользователя %s провалилась: %s", user_payload.email, e)
         pytest.fail(f"Регистрация прервана с непредвиденной ошибкой: {e}")
 
     if "Authorization" in api_manager.session.headers:
         del api_manager.session.headers["Authorization"]
 
     yield api_manager, user_payload
-    LOGGER.info(f"Фикстура 'new_registered_user' для пользователя {user_payload.email} завершила свою работу.")
+    LOGGER.info("Фикстура 'new_registered_user' для пользователя %s завершила свою работу.", user_payload.email)
+
+def pytest_sessionfinish(session, exitstatus):
+    SCREENSHOTS.wait()
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput[SESSION_REPORT.WORKER_OUTPUT_KEY] = SESSION_REPORT.dumps()
+        workeroutput[LATENCY.WORKER_OUTPUT_KEY] = LATENCY.dumps()
+    elif LATENCY:
+        # Контроллер xdist к этому моменту уже сложил гистограммы всех воркеров
+        report = json.dumps(LATENCY.summary(), indent=4, ensure_ascii=False)
+        report_path = Path(session.config.getoption("--latency-report"))
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(report, encoding="utf-8")
+        allure.global_attach(report, name="Задержки по эндпоинтам", attachment_type=allure.attachment_type.JSON)
+        allure.global_attach("\n".join(LATENCY.render_table()), name="Задержки по эндпоинтам (таблица)",
+                             attachment_type=allure.attachment_type.TEXT)
+        violations = SLA.p95_violations(LATENCY, min_samples=SESSION_MIN_SAMPLES) if SLA.mode != SlaMode.OFF else []
+        if violations:
+            SESSION_REPORT.add("sla", {"violations": violations})
+            if SLA.mode == SlaMode.FAIL and session.exitstatus == pytest.ExitCode.OK:
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    LOG_PIPELINE.stop()
+    if workeroutput is None:
+        # Воркеры xdist остановили свои писатели до того, как контроллер получил их workeroutput
+        LOG_PIPELINE.merge_workers(Path("logs"))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    workeroutput = getattr(node, "workeroutput", {})
+    if workeroutput.get(SESSION_REPORT.WORKER_OUTPUT_KEY):
+        SESSION_REPORT.loads(workeroutput[SESSION_REPORT.WORKER_OUTPUT_KEY])
+    if workeroutput.get(LATENCY.WORKER_OUTPUT_KEY):
+        LATENCY.loads(workeroutput[LATENCY.WORKER_OUTPUT_KEY])
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    cleanup_stats = SESSION_REPORT.get("cleanup")
+    if cleanup_stats:
+        terminalreporter.section("Cleanup")
+        terminalreporter.write_line(f"Удалено сущностей: {cleanup_stats.get('deleted', 0)}")
+        if cleanup_stats.get("failed"):
+            terminalreporter.write_line(f"Не удалось удалить фильмы: {cleanup_stats['failed']}", red=True)
+    # С --fake-backend и при воспроизведении кассеты все адаптеры подменены и запросов по хостам нет
+    transport_stats = {host: stats for host, stats in SESSION_REPORT.get("transport").items() if stats.get("requests")}
+    if transport_stats:
+        terminalreporter.section("HTTP transport")
+        for host, stats in transport_stats.items():
+            terminalreporter.write_line(
+                f"{host}: запросов {stats['requests']}, новых соединений {stats['opened']}, "
+                f"переиспользовано {stats['reused']}"
+            )
+    if LATENCY:
+        terminalreporter.section("Latency, мс")
+        for line in LATENCY.render_table():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Подробный отчет: {config.getoption('--latency-report')}")
+    retry_stats = SESSION_REPORT.get("retries")
+    if retry_stats.get("requests") or retry_stats.get("budget_exhausted"):
+        terminalreporter.section("Retries")
+        terminalreporter.write_line(
+            f"Повторено запросов: {retry_stats.get('requests', 0)}, повторов: {retry_stats.get('retries', 0)}, "
+            f"успешно после повтора: {retry_stats.get('recovered', 0)}"
+        )
+        for endpoint, retries in sorted(retry_stats.get("by_endpoint", {}).items()):
+            terminalreporter.write_line(f"{endpoint}: {retries}")
+        if retry_stats.get("budget_exhausted"):
+            terminalreporter.write_line("Бюджет повторов исчерпан", yellow=True)
+    cache_stats = SESSION_REPORT.get("movies_cache")
+    if cache_stats.get("hits") or cache_stats.get("misses"):
+        terminalreporter.section("Movies cache")
+        lookups = cache_stats.get("hits", 0) + cache_stats.get("misses", 0)
+        terminalreporter.write_line(
+            f"Попаданий: {cache_stats.get('hits', 0)} из {lookups} ({cache_stats.get('hits', 0) / lookups:.0%}), "
+            f"сброшено записью: {cache_stats.get('invalidated', 0)}, истекло: {cache_stats.get('expired', 0)}, "
+            f"вытеснено: {cache_stats.get('evicted', 0)}"
+        )
+    rate_limit_stats = SESSION_REPORT.get("rate_limit")
+    if rate_limit_stats.get("waited_requests") or rate_limit_stats.get("throttled"):
+        terminalreporter.section("Rate limit")
+        terminalreporter.write_line(
+            f"Запросов через ограничитель: {rate_limit_stats.get('requests', 0)}, "
+            f"ждали очереди: {rate_limit_stats.get('waited_requests', 0)}, "
+            f"суммарное ожидание: {rate_limit_stats.get('waited_s', 0):.1f} с, "
+            f"ответов 429: {rate_limit_stats.get('throttled', 0)}"
+        )
+        for bucket, stats in sorted(rate_limit_stats.get("by_bucket", {}).items()):
+            terminalreporter.write_line(f"{bucket}: запросов {stats['requests']}, ожидание {stats['waited_s']:.1f} с")
+    routing_stats = SESSION_REPORT.get("ui_routing")
+    if routing_stats:
+        terminalreporter.section("UI routing")
+        terminalreporter.write_line(
+            f"Запросов браузера: {routing_stats['requests']}, обслужено без сети: {routing_stats['requests_saved']} "
+            f"(заблокировано {routing_stats['blocked']}, заглушек {routing_stats['stubbed']}, "
+            f"из кэша {routing_stats['cache_hits']}), сэкономлено {routing_stats['bytes_saved'] / 1024:.0f} КБ"
+        )
+        if routing_stats["unknown_size"]:
+            terminalreporter.write_line(f"Ресурсов с еще неизвестным размером: {routing_stats['unknown_size']}")
+    sla_violations = SESSION_REPORT.get("sla").get("violations")
+    if sla_violations:
+        terminalreporter.section("SLA")
+        for violation in sla_violations:
+            terminalreporter.write_line(violation, red=SLA.mode == SlaMode.FAIL, yellow=SLA.mode == SlaMode.WARN)
@@ -6,6 +6,12 @@ class LogMessages:
     class Auth:
         ATTEMPT_LOGIN = "Попытка логина для пользователя {}"
         LOGIN_SUCCESS = "Пользователь {} успешно вошел в систему."
+        TOKEN_FROM_CACHE = "Токен пользователя {} взят из кэша."
+        TOKEN_CACHED = "Токен пользователя {} получен и сохранен в кэш."
+        TOKEN_REFRESHED = "Токен обновлен через refresh-tokens."
+        TOKEN_REFRESH_FAILED = "Не удалось обновить токен через refresh-tokens, выполняем повторный логин."
+        STORAGE_STATE_SAVED = "Состояние браузера пользователя {} сохранено в {}"
+        STORAGE_STATE_REJECTED = "Фронтенд не принял cookies логина через API для {}, выполняем логин через UI."
 
     class Movies:
         ATTEMPT_CREATE = "Попытка создания фильма с названием '{}'"
@@ -16,5 +22,34 @@ class LogMessages:
         DELETE_SUCCESS = "Фильм '{}' (ID: {}) успешно удален."
         ATTEMPT_GET_LIST = "Попытка получения списка фильмов с параметрами: {}"
         ATTEMPT_GET_LIST_INVALID = "Попытка получения списка фильмов с невалидными параметрами: {}"
+        ATTEMPT_ITER = "Обход каталога фильмов с параметрами: {}"
+        ITER_STOPPED = "Обход каталога остановлен по условию на фильме ID {}"
+        ATTEMPT_SNAPSHOT = "Снимок каталога фильмов с параметрами: {}"
+        SNAPSHOT_DRIFT = "Каталог изменился во время снимка (count={}), перезапрашиваем страницы {}"
+        SNAPSHOT_SUCCESS = "Снимок каталога: {} уникальных фильмов из {} ожидаемых, запрошено страниц: {}"
         ATTEMPT_EDIT = "Попытка редактирования фильма с ID {}"
-        EDIT_SUCCESS = "Фильм '{}' (ID: {}) успешно отредактирован."
\ No newline at end of file
+        EDIT_SUCCESS = "Фильм '{}' (ID: {}) успешно отредактирован."
+        SEED_SUCCESS = "Создано {} фильмов для наполнения каталога"
+        SEED_FAILED = "Не удалось создать {} из {} фильмов при наполнении каталога"
+        SEED_DELETE_FAILED = "Не удалось удалить {} фильмов: {}"
+        CACHE_HIT = "Ответ на запрос {} с параметрами {} взят из кэша"
+
+    class Ui:
+        ROUTING_SUMMARY = "{}: запросов браузера {}, обслужено без сети {}, сэкономлено байт {}"
+        TRACE_SAVED = "Трейс Playwright теста {} сохранен в {} ({:.1f} МБ)"
+        TRACE_TOO_LARGE = "Трейс Playwright теста {} занимает {:.1f} МБ при лимите {} МБ и не сохранен"
+        WEBP_UNAVAILABLE = "Для скриншотов в WebP нужен Pillow, скриншоты будут сохраняться в JPEG"
+        SCREENSHOT_FAILED = "Не удалось записать скриншот {}: {}"
+
+    class Retry:
+        RETRYING = "[retry] {} {}: попытка {} не удалась ({}), повтор через {:.0f} мс"
+        ATTEMPT_FAILED = "Попытка {}: {}, пауза {:.0f} мс"
+        BUDGET_EXHAUSTED = "Бюджет повторов запросов ({}) исчерпан, дальше запросы не повторяются"
+
+    class RateLimit:
+        THROTTLED = "[rate-limit] {} {}: стенд ответил 429, запросы к нему приостановлены на {:.1f} с"
+
+    class Sla:
+        REQUEST_OVER_BUDGET = "{} {}: запрос занял {:.1f} мс при бюджете {} мс"
+        P95_OVER_BUDGET = "{}: p95 {:.1f} мс при бюджете {} мс (запросов: {})"
+        NO_REQUESTS = "{}: за тест не было запросов к эндпоинту"
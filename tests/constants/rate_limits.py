@@ -0,0 +1,13 @@
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL, LOGIN_ENDPOINT, REGISTER_ENDPOINT
+
+# Клиентские лимиты запросов к dev-стенду: (запросов в секунду, размер пачки). Общие для всех воркеров xdist
+# и держатся чуть ниже серверных, чтобы не ловить 429. Ключ эндпоинта - "METHOD /шаблон" как в отчете задержек.
+HOST_LIMITS = {
+    BASE_URL: (20, 20),
+    BASE_AUTH_URL: (10, 10),
+}
+
+ENDPOINT_LIMITS = {
+    f"POST {LOGIN_ENDPOINT}": (5, 5),
+    f"POST {REGISTER_ENDPOINT}": (5, 5),
+}
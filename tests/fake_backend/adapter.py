@@ -0,0 +1,28 @@
+from urllib.parse import urlsplit, parse_qs
+import requests
+from requests.adapters import BaseAdapter
+from tests.fake_backend.backend import FakeCinescopeBackend
+from tests.request.transport import build_response
+
+class FakeCinescopeAdapter(BaseAdapter):
+    # Транспортный адаптер requests: запрос не уходит в сеть, а обрабатывается FakeCinescopeBackend
+    # в том же процессе. Монтируется на BASE_URL/BASE_AUTH_URL, поэтому клиенты, сессии, cookies
+    # и вложения allure работают так же, как с настоящим стендом.
+
+    content_headers = {"Content-Type": "application/json; charset=utf-8"}
+
+    def __init__(self, backend: FakeCinescopeBackend, service: str):
+        super().__init__()
+        self.backend = backend
+        self.service = service
+
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        url = urlsplit(request.url)
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        result = self.backend.handle(self.service, request.method, url.path,
+                                     parse_qs(url.query, keep_blank_values=True), request.headers, body)
+        return build_response(request, result.status, result.body, self.content_headers, result.set_cookies)
+
+    def close(self) -> None:
+        pass
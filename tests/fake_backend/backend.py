@@ -0,0 +1,428 @@
+import base64
+import contextlib
+import hashlib
+import hmac
+import json
+import random
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, ContextManager, Mapping, NamedTuple, Protocol
+from urllib.parse import unquote
+from tests.constants.endpoints import (ADMIN_EMAIL, ADMIN_PASSWORD, MOVIES_ENDPOINT, LOGIN_ENDPOINT,
+                                       REGISTER_ENDPOINT, LOGOUT_ENDPOINT, REFRESH_ENDPOINT)
+from tests.fake_backend.store import GENRE_NAMES, LOCATIONS, MemoryMovieStore, MovieFilter, iso_timestamp
+from tests.models.movie_models import GenreId
+
+AUTH_ENDPOINTS = (LOGIN_ENDPOINT, REGISTER_ENDPOINT, LOGOUT_ENDPOINT, REFRESH_ENDPOINT)
+
+Event = list
+
+class Journal(Protocol):
+    # Общий журнал изменений для нескольких процессов с одним и тем же бэкендом
+
+    def catch_up(self, apply: Callable[[Event], None]) -> None: ...
+
+    def exclusive(self, apply: Callable[[Event], None]) -> ContextManager[None]: ...
+
+    def append(self, event: Event) -> None: ...
+
+class FakeResponse(NamedTuple):
+    status: int
+    body: Any
+    set_cookies: tuple[str, ...] = ()
+
+def error(status: int, message: str | list[str], error_name: str | None = None) -> FakeResponse:
+    body = {"message": message, "statusCode": status}
+    if error_name:
+        body["error"] = error_name
+    return FakeResponse(status, body)
+
+def encode_body(body: Any) -> bytes:
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+NOT_FOUND_MOVIE = "Фильм не найден"
+
+class FakeCinescopeBackend:
+    # In-memory реализация контракта Cinescope, который ожидают MoviesAPI и AuthAPI:
+    # коды ответов и тела ErrorResponse повторяют поведение dev-стенда, включая его особенности
+    # (например, 500 на нечисловой ID в GET /movies/{id}).
+    # Токены подписываются HMAC и не хранятся, а все изменения проходят через события _commit,
+    # поэтому один бэкенд можно разделить между процессами через journal.
+
+    default_admin_email = "admin@fake.cinescope.local"
+    default_admin_password = "FakeAdminPassword1"
+    access_token_ttl = 15 * 60
+    refresh_token_ttl = 7 * 24 * 3600
+    admin_roles = {"ADMIN", "SUPER_ADMIN"}
+    max_page_size = 20
+    editable_fields = ("name", "description", "price", "location", "published", "genreId", "imageUrl")
+
+    def __init__(self, admin_email: str | None = ADMIN_EMAIL, admin_password: str | None = ADMIN_PASSWORD,
+                 seed_movies: int = 30, rng_seed: int = 42, store: MemoryMovieStore | None = None,
+                 token_secret: bytes | None = None):
+        self.admin_email = admin_email or self.default_admin_email
+        self.admin_password = admin_password or self.default_admin_password
+        self.store = store if store is not None else MemoryMovieStore()
+        self.users: dict[str, dict] = {}
+        self.journal: Journal | None = None
+        self._passwords: dict[str, str] = {}
+        self._token_secret = token_secret or secrets.token_bytes(32)
+        self._lock = threading.RLock()
+        self._rng = random.Random(rng_seed)
+        self._commit(["user_added", self._new_user(self.admin_email, "Fake Admin", ["SUPER_ADMIN"]),
+                      self.admin_password])
+        if store is None:
+            self._seed_movies(seed_movies)
+
+    @property
+    def admin_credentials(self) -> tuple[str, str]:
+        return self.admin_email, self.admin_password
+
+    def handle(self, service: str, method: str, path: str, query: Mapping[str, list[str]],
+               headers: Mapping[str, str], body: bytes | None) -> FakeResponse:
+        path = path.rstrip("/") or "/"
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            response = error(400, "Unexpected token in JSON", "Bad Request")
+            return response._replace(body=encode_body(response.body))
+        with self._lock, self._journal_scope(service, method, path):
+            if service == "api":
+                response = self._handle_api(method, path, query, headers, payload)
+            else:
+                response = self._handle_auth(method, path, headers, payload)
+            # Сериализуем под блокировкой: словари фильмов общие со store и могут меняться другими потоками
+            return response._replace(body=encode_body(response.body))
+
+    @staticmethod
+    def service_for(path: str) -> str:
+        return "auth" if path.rstrip("/") in AUTH_ENDPOINTS else "api"
+
+    def _journal_scope(self, service: str, method: str, path: str) -> ContextManager[None]:
+        if self.journal is None:
+            return contextlib.nullcontext()
+        if (service == "api" and method != "GET") or path == REGISTER_ENDPOINT:
+            return self.journal.exclusive(self._apply)
+        self.journal.catch_up(self._apply)
+        return contextlib.nullcontext()
+
+    def _commit(self, event: Event) -> None:
+        self._apply(event)
+        if self.journal is not None:
+            self.journal.append(event)
+
+    def _apply(self, event: Event) -> None:
+        kind, *args = event
+        if kind == "movie_put":
+            self.store.put(args[0])
+        elif kind == "movie_deleted":
+            self.store.delete(args[0])
+        elif kind == "user_added":
+            user, password = args
+            self.users[user["email"]] = user
+            self._passwords[user["email"]] = password
+
+    # ---- movies ----
+
+    def _handle_api(self, method, path, query, headers, payload) -> FakeResponse:
+        if path == MOVIES_ENDPOINT:
+            if method == "GET":
+                return self._list_movies(query)
+            if method == "POST":
+                return self._with_admin(headers, lambda: self._create_movie(payload))
+        elif path.startswith(MOVIES_ENDPOINT + "/") and path.count("/") == 2:
+            raw_id = unquote(path.rsplit("/", 1)[1])
+            if method == "GET":
+                return self._get_movie(raw_id)
+            if method == "PATCH":
+                return self._with_admin(headers, lambda: self._edit_movie(raw_id, payload))
+            if method == "DELETE":
+                return self._with_admin(headers, lambda: self._delete_movie(raw_id))
+        return error(404, f"Cannot {method} {path}", "Not Found")
+
+    def _list_movies(self, query) -> FakeResponse:
+        errors = []
+        page = self._int_query(query, "page", 1, 1, None, errors)
+        page_size = self._int_query(query, "pageSize", 10, 1, self.max_page_size, errors)
+        min_price = self._int_query(query, "minPrice", None, 0, None, errors)
+        max_price = self._int_query(query, "maxPrice", None, 0, None, errors)
+        genre_id = self._int_query(query, "genreId", None, 1, None, errors)
+        locations = query.get("locations")
+        if locations and any(location not in LOCATIONS for location in locations):
+            errors.append(f"each value in locations must be one of the following values: {', '.join(LOCATIONS)}")
+        published = self._first(query, "published")
+        if published is not None and published.lower() not in ("true", "false"):
+            errors.append("published must be a boolean value")
+        if errors:
+            return error(400, errors, "Bad Request")
+        order = self._first(query, "createdAt") or "asc"
+        if order not in ("asc", "desc"):
+            return error(400, "Некорректные данные", "Bad Request")
+
+        movie_filter = MovieFilter(
+            published=True if published is None else published.lower() == "true",
+            locations=tuple(locations) if locations else None,
+            genre_id=genre_id,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        movies, count = self.store.query(movie_filter, descending=order == "desc",
+                                         offset=(page - 1) * page_size, limit=page_size)
+        return FakeResponse(200, {
+            "movies": movies,
+            "count": count,
+            "page": page,
+            "pageSize": page_size,
+            "pageCount": -(-count // page_size),
+        })
+
+    def _get_movie(self, raw_id: str) -> FakeResponse:
+        if not raw_id.strip():
+            return error(404, f"Cannot GET {MOVIES_ENDPOINT}/{raw_id}", "Not Found")
+        movie_id = self._parse_id(raw_id)
+        if movie_id is None:
+            return error(500, "Internal server error")
+        movie = self.store.get(movie_id)
+        if movie is None:
+            return error(404, NOT_FOUND_MOVIE, "Not Found")
+        return FakeResponse(200, {**movie, "reviews": []})
+
+    def _create_movie(self, payload: dict) -> FakeResponse:
+        errors = self._validate_movie(payload, partial=False)
+        if errors:
+            return error(400, errors, "Bad Request")
+        if self.store.has_name(payload["name"]):
+            return error(409, "Фильм с таким названием уже существует", "Conflict")
+        movie = self.store.build(payload, datetime.now(timezone.utc))
+        self._commit(["movie_put", movie])
+        return FakeResponse(201, movie)
+
+    def _edit_movie(self, raw_id: str, payload: dict) -> FakeResponse:
+        movie_id = self._parse_id(raw_id)
+        if movie_id is None:
+            return error(500, "Internal server error")
+        movie = self.store.get(movie_id)
+        if movie is None:
+            return error(404, NOT_FOUND_MOVIE, "Not Found")
+        errors = self._validate_movie(payload, partial=True)
+        if errors:
+            return error(400, errors, "Bad Request")
+        if "name" in payload and payload["name"] != movie["name"] and self.store.has_name(payload["name"]):
+            return error(409, "Фильм с таким названием уже существует", "Conflict")
+        movie = {**movie, **{field: payload[field] for field in self.editable_fields if field in payload}}
+        movie["genre"] = {"name": GENRE_NAMES[GenreId(movie["genreId"])]}
+        self._commit(["movie_put", movie])
+        return FakeResponse(200, movie)
+
+    def _delete_movie(self, raw_id: str) -> FakeResponse:
+        movie_id = self._parse_id(raw_id)
+        if movie_id is None or self.store.get(movie_id) is None:
+            return error(404, NOT_FOUND_MOVIE, "Not Found")
+        self._commit(["movie_deleted", movie_id])
+        return FakeResponse(200, {"id": movie_id})
+
+    def _seed_movies(self, count: int) -> None:
+        started_at = datetime.now(timezone.utc) - timedelta(days=count)
+        for index in range(count):
+            self._commit(["movie_put", self.store.build({
+                "name": f"Фильм для тестов №{index + 1}",
+                "description": "Фильм, созданный фейковым бэкендом",
+                "price": self._rng.randint(100, 1000),
+                "location": self._rng.choice(LOCATIONS),
+                "published": self._rng.random() < 0.7,
+                "genreId": self._rng.choice(list(GenreId)).value,
+            }, started_at + timedelta(days=index))])
+
+    def _validate_movie(self, payload: dict, partial: bool) -> list[str]:
+        errors = []
+
+        def check(field: str, valid: bool, *messages: str) -> None:
+            if field not in payload:
+                if not partial:
+                    errors.extend(messages)
+            elif not valid:
+                errors.extend(messages)
+
+        name = payload.get("name")
+        description = payload.get("description")
+        price = payload.get("price")
+        genre_id = payload.get("genreId")
+        check("name", isinstance(name, str) and bool(name), "name should not be empty", "name must be a string")
+        check("description", isinstance(description, str), "description must be a string")
+        check("price", self._is_int(price) and price > 0, "price must be a positive number",
+              "price must be an integer number")
+        check("location", payload.get("location") in LOCATIONS,
+              f"location must be one of the following values: {', '.join(LOCATIONS)}")
+        check("published", isinstance(payload.get("published"), bool), "published must be a boolean value")
+        check("genreId", self._is_int(genre_id) and genre_id in set(GenreId), "genreId must be a positive number",
+              "genreId must be an integer number")
+        if payload.get("imageUrl") is not None and not isinstance(payload.get("imageUrl"), str):
+            errors.append("imageUrl must be a string")
+        return errors
+
+    # ---- auth ----
+
+    def _handle_auth(self, method, path, headers, payload) -> FakeResponse:
+        if method != "POST":
+            return error(404, f"Cannot {method} {path}", "Not Found")
+        if path == LOGIN_ENDPOINT:
+            return self._login(payload)
+        if path == REGISTER_ENDPOINT:
+            return self._register(payload)
+        if path == LOGOUT_ENDPOINT:
+            return self._logout(headers)
+        if path == REFRESH_ENDPOINT:
+            return self._refresh(headers)
+        return error(404, f"Cannot {method} {path}", "Not Found")
+
+    def _register(self, payload: dict) -> FakeResponse:
+        errors = []
+        email, full_name, password = payload.get("email"), payload.get("fullName"), payload.get("password")
+        if not isinstance(email, str) or "@" not in email:
+            errors.append("email must be an email")
+        if not isinstance(full_name, str) or not full_name:
+            errors.append("fullName should not be empty")
+        if not isinstance(password, str) or len(password) < 8:
+            errors.append("password must be longer than or equal to 8 characters")
+        if errors:
+            return error(400, errors, "Bad Request")
+        if password != payload.get("passwordRepeat"):
+            return error(400, "Пароли не совпадают", "Bad Request")
+        if email in self.users:
+            return error(409, "Пользователь с таким email уже зарегистрирован", "Conflict")
+        user = self._new_user(email, full_name, ["USER"])
+        self._commit(["user_added", user, password])
+        return FakeResponse(201, user)
+
+    def _login(self, payload: dict) -> FakeResponse:
+        email = payload.get("email")
+        user = self.users.get(email)
+        if user is None or self._passwords.get(email) != payload.get("password"):
+            return error(401, "Неверный логин или пароль", "Unauthorized")
+        access_token, refresh_token = self._issue_tokens(user)
+        return FakeResponse(200, {
+            "accessToken": access_token,
+            "refreshToken": refresh_token,
+            "expiresIn": int(time.time()) + self.access_token_ttl,
+            "user": {key: user[key] for key in ("id", "email", "fullName", "roles", "verified", "banned", "createdAt")},
+        }, (self._refresh_cookie(refresh_token),))
+
+    def _refresh(self, headers) -> FakeResponse:
+        claims = self._verify_token(self._cookie(headers, "refreshToken"), "refresh")
+        email = claims["email"] if claims else None
+        if email is None or email not in self.users:
+            return error(401, "Unauthorized")
+        access_token, new_refresh_token = self._issue_tokens(self.users[email])
+        return FakeResponse(200, {
+            "accessToken": access_token,
+            "refreshToken": new_refresh_token,
+            "expiresIn": int(time.time()) + self.access_token_ttl,
+        }, (self._refresh_cookie(new_refresh_token),))
+
+    def _logout(self, headers) -> FakeResponse:
+        return FakeResponse(200, {"message": "Вы вышли из системы"}, (self._refresh_cookie("", max_age=0),))
+
+    @staticmethod
+    def _new_user(email: str, full_name: str, roles: list[str]) -> dict:
+        return {
+            "id": str(uuid.uuid4()),
+            "email": email,
+            "fullName": full_name,
+            "roles": roles,
+            "verified": True,
+            "banned": False,
+            "createdAt": iso_timestamp(datetime.now(timezone.utc)),
+        }
+
+    def _issue_tokens(self, user: dict) -> tuple[str, str]:
+        now = int(time.time())
+        access_token = self._sign({"id": user["id"], "email": user["email"], "roles": user["roles"],
+                                   "typ": "access", "exp": now + self.access_token_ttl})
+        refresh_token = self._sign({"email": user["email"], "typ": "refresh", "jti": secrets.token_hex(8),
+                                    "exp": now + self.refresh_token_ttl})
+        return access_token, refresh_token
+
+    def _sign(self, claims: dict) -> str:
+        encode = lambda data: base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+        signing_input = f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}"
+        signature = hmac.new(self._token_secret, signing_input.encode(), hashlib.sha256).digest()
+        return f"{signing_input}.{base64.urlsafe_b64encode(signature).decode().rstrip('=')}"
+
+    def _verify_token(self, token: str | None, token_type: str) -> dict | None:
+        if not token or token.count(".") != 2:
+            return None
+        signing_input, _, signature = token.rpartition(".")
+        expected = hmac.new(self._token_secret, signing_input.encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(base64.urlsafe_b64encode(expected).decode().rstrip("="), signature):
+            return None
+        payload = signing_input.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        if claims.get("typ") != token_type or claims.get("exp", 0) <= time.time():
+            return None
+        return claims
+
+    def _with_admin(self, headers, action) -> FakeResponse:
+        authorization = self._header(headers, "Authorization") or ""
+        claims = self._verify_token(authorization.removeprefix("Bearer "), "access")
+        if claims is None:
+            return error(401, "Unauthorized")
+        if not self.admin_roles.intersection(claims["roles"]):
+            return error(403, "Forbidden resource", "Forbidden")
+        return action()
+
+    @staticmethod
+    def _refresh_cookie(value: str, max_age: int = 7 * 24 * 3600) -> str:
+        return f"refreshToken={value}; Path=/; Max-Age={max_age}; HttpOnly"
+
+    # ---- helpers ----
+
+    @staticmethod
+    def _header(headers: Mapping[str, str], name: str) -> str | None:
+        for key, value in headers.items():
+            if key.lower() == name.lower():
+                return value
+        return None
+
+    @classmethod
+    def _cookie(cls, headers: Mapping[str, str], name: str) -> str | None:
+        for part in (cls._header(headers, "Cookie") or "").split(";"):
+            key, _, value = part.strip().partition("=")
+            if key == name:
+                return value
+        return None
+
+    @staticmethod
+    def _first(query: Mapping[str, list[str]], name: str) -> str | None:
+        values = query.get(name)
+        return values[0] if values else None
+
+    @classmethod
+    def _int_query(cls, query, name: str, default: int | None, minimum: int | None, maximum: int | None,
+                   errors: list[str]) -> int | None:
+        raw = cls._first(query, name)
+        if raw is None:
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            errors.append(f"{name} must be an integer number")
+            return default
+        if minimum is not None and value < minimum:
+            errors.append(f"{name} must not be less than {minimum}")
+        if maximum is not None and value > maximum:
+            errors.append(f"{name} must not be greater than {maximum}")
+        return value
+
+    @staticmethod
+    def _parse_id(raw_id: str) -> int | None:
+        try:
+            return int(raw_id)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _is_int(value: Any) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool)
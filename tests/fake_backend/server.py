@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import contextlib
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import re
+import secrets
+import socket
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+from urllib.parse import urlsplit, parse_qs
+from pydantic import BaseModel
+from tests.fake_backend.backend import Event, FakeCinescopeBackend, FakeResponse, encode_body, error
+from tests.fake_backend.store import IndexedMovieStore, MemoryMovieStore
+
+MOVIE_ROUTE = re.compile(r"^/movies/[^/]+$")
+
+class FaultInjection(BaseModel):
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    error_rate: float = 0
+    error_status: int = 503
+
+class SharedJournal:
+    # Журнал изменений в файле, общий для процессов стенда. Запись идет под межпроцессной
+    # блокировкой, а длина журнала лежит в общей памяти: чтение проверяет одно число и дочитывает
+    # только новые события, так что созданный в одном воркере фильм сразу виден в остальных.
+
+    def __init__(self, path: Path, context: multiprocessing.context.BaseContext):
+        self.path = path
+        self.path.touch()
+        self._lock = context.Lock()
+        self._size = context.Value("q", 0, lock=False)
+        self._offset = 0
+
+    def __getstate__(self) -> dict:
+        # Новый процесс строит бэкенд с нуля, поэтому читает журнал с начала
+        return {**self.__dict__, "_offset": 0}
+
+    def catch_up(self, apply: Callable[[Event], None]) -> None:
+        size = self._size.value
+        if size == self._offset:
+            return
+        with self.path.open("rb") as journal:
+            journal.seek(self._offset)
+            for line in journal.read(size - self._offset).splitlines():
+                apply(json.loads(line))
+        self._offset = size
+
+    @contextlib.contextmanager
+    def exclusive(self, apply: Callable[[Event], None]) -> Iterator[None]:
+        with self._lock:
+            self.catch_up(apply)
+            yield
+
+    def append(self, event: Event) -> None:
+        line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self.path.open("ab") as journal:
+            journal.write(line)
+        self._offset += len(line)
+        self._size.value = self._offset
+
+class StandInSpec(BaseModel):
+    # Все, из чего процесс стенда детерминированно собирает тот же бэкенд, что и у соседей
+    movies: int
+    seed: int = 42
+    created_from: datetime
+    admin_email: str
+    admin_password: str
+    token_secret: bytes
+
+    def build(self, journal: SharedJournal) -> FakeCinescopeBackend:
+        backend = FakeCinescopeBackend(admin_email=self.admin_email, admin_password=self.admin_password,
+                                       token_secret=self.token_secret,
+                                       store=IndexedMovieStore(self.movies, self.seed, self.created_from))
+        # Первым событием журнала идет администратор родителя: с ним ID пользователя в токенах
+        # совпадает во всех процессах
+        backend.journal = journal
+        return backend
+
+class StandInWorker:
+
+    def __init__(self, spec: StandInSpec, journal: SharedJournal, faults: FaultInjection,
+                 routes: dict[str, FaultInjection]):
+        self.spec = spec
+        self.journal = journal
+        self.faults = faults
+        self.routes = routes
+        self.backend: FakeCinescopeBackend | None = None
+        self._rng = random.Random()
+
+    def run(self, listen_socket: socket.socket, ready) -> None:
+        self.backend = self.spec.build(self.journal)
+        ready.release()
+        asyncio.run(self._serve(listen_socket))
+
+    async def _serve(self, listen_socket: socket.socket) -> None:
+        server = await asyncio.start_server(self._serve_connection, sock=listen_socket)
+        async with server:
+            await server.serve_forever()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip()] = value.strip()
+                lower_headers = {name.lower(): value for name, value in headers.items()}
+                length = int(lower_headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else None
+                writer.write(await self._respond(method, target, headers, body))
+                await writer.drain()
+                if lower_headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: dict[str, str], body: bytes | None) -> bytes:
+        url = urlsplit(target)
+        faults = self.routes.get(f"{method} {self._route(url.path)}", self.faults)
+        delay_ms = faults.latency_ms + self._rng.uniform(0, faults.jitter_ms)
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        if faults.error_rate and self._rng.random() < faults.error_rate:
+            response = error(faults.error_status, "Ошибка внедрена стендом")
+            response = response._replace(body=encode_body(response.body))
+        else:
+            response = self.backend.handle(self.backend.service_for(url.path), method, url.path,
+                                           parse_qs(url.query, keep_blank_values=True), headers, body)
+        return self._encode(response)
+
+    @staticmethod
+    def _route(path: str) -> str:
+        return "/movies/{id}" if MOVIE_ROUTE.match(path) else path.rstrip("/") or "/"
+
+    @staticmethod
+    def _encode(response: FakeResponse) -> bytes:
+        lines = [
+            f"HTTP/1.1 {response.status} {http.client.responses.get(response.status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(response.body)}",
+            "Connection: keep-alive",
+            *(f"Set-Cookie: {cookie}" for cookie in response.set_cookies),
+        ]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + response.body
+
+class StandInServer:
+    # Локальная замена стенда Cinescope для нагрузочных прогонов: несколько процессов с asyncio
+    # принимают соединения с одного сокета. Процессы запускаются через forkserver, а не fork: стенд
+    # поднимается из pytest, где уже работают потоки логов, очистки и executor'ов, и fork в момент,
+    # когда один из них держит лок, подвешивает дочерний процесс. Поэтому каталог не наследуется,
+    # а каждый процесс строит его сам из seed (StandInSpec), пока родитель ждет готовности.
+
+    default_movies = 1_000_000
+    backlog = 1024
+    start_timeout_s = 120
+
+    def __init__(self, movies: int | None = None, workers: int | None = None, host: str = "127.0.0.1",
+                 port: int = 0, faults: FaultInjection | None = None,
+                 routes: dict[str, FaultInjection] | None = None):
+        self.movies = self.default_movies if movies is None else movies
+        self.workers = workers or os.cpu_count() or 1
+        self.host = host
+        self.port = port
+        self.faults = faults or FaultInjection()
+        self.routes = routes or {}
+        self.backend: FakeCinescopeBackend | None = None
+        self._socket: socket.socket | None = None
+        self._processes: list[multiprocessing.Process] = []
+        self._journal_dir: tempfile.TemporaryDirectory | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def admin_credentials(self) -> tuple[str, str]:
+        return self.backend.admin_credentials
+
+    def start(self) -> "StandInServer":
+        context = multiprocessing.get_context("forkserver")
+        self._journal_dir = tempfile.TemporaryDirectory(prefix="cinescope-stand-in-")
+        journal = SharedJournal(Path(self._journal_dir.name) / "journal.log", context)
+        # Родителю каталог не нужен: он только выдает учетные данные администратора
+        token_secret = secrets.token_bytes(32)
+        self.backend = FakeCinescopeBackend(store=MemoryMovieStore(), token_secret=token_secret)
+        self.backend.journal = journal
+        admin = self.backend.users[self.backend.admin_email]
+        journal.append(["user_added", admin, self.backend.admin_password])
+        spec = StandInSpec(movies=self.movies, created_from=datetime.now(timezone.utc)
+                           - IndexedMovieStore.created_step * (self.movies + 1),
+                           admin_email=self.backend.admin_email, admin_password=self.backend.admin_password,
+                           token_secret=token_secret)
+        self._socket = socket.create_server((self.host, self.port), backlog=self.backlog)
+        self.port = self._socket.getsockname()[1]
+        worker = StandInWorker(spec, journal, self.faults, self.routes)
+        ready = context.Semaphore(0)
+        for _ in range(self.workers):
+            process = context.Process(target=worker.run, args=(self._socket, ready), daemon=True)
+            process.start()
+            self._processes.append(process)
+        for _ in self._processes:
+            if not ready.acquire(timeout=self.start_timeout_s):
+                self.stop()
+                raise RuntimeError(f"Процессы стенда не поднялись за {self.start_timeout_s} с")
+        return self
+
+    def wait(self) -> None:
+        for process in self._processes:
+            process.join()
+
+    def stop(self) -> None:
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._processes.clear()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._journal_dir is not None:
+            self._journal_dir.cleanup()
+            self._journal_dir = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальная замена стенда Cinescope")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--movies", type=int, default=StandInServer.default_movies)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+    faults = FaultInjection(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                            error_status=args.error_status)
+    with StandInServer(args.movies, args.workers, args.host, args.port, faults) as server:
+        email, password = server.admin_credentials
+        print(f"Стенд запущен на {server.url}: {server.movies} фильмов, воркеров {server.workers}")
+        print(f"Администратор: {email} / {password}")
+        with contextlib.suppress(KeyboardInterrupt):
+            server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import bisect
+import heapq
+import random
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, NamedTuple
+from tests.models.movie_models import Location, GenreId
+
+GENRE_NAMES = {
+    GenreId.ACTION: "Боевик",
+    GenreId.COMEDY: "Комедия",
+    GenreId.DRAMA: "Драма",
+    GenreId.FANTASY: "Фантастика",
+    GenreId.THRILLER: "Триллер",
+}
+LOCATIONS = [location.value for location in Location]
+
+def iso_timestamp(moment: datetime) -> str:
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+class MovieFilter(NamedTuple):
+    published: bool = True
+    locations: tuple[str, ...] | None = None
+    genre_id: int | None = None
+    min_price: int | None = None
+    max_price: int | None = None
+
+    def matches(self, movie: dict) -> bool:
+        return (movie["published"] == self.published
+                and (self.min_price is None or movie["price"] >= self.min_price)
+                and (self.max_price is None or movie["price"] <= self.max_price)
+                and (self.genre_id is None or movie["genreId"] == self.genre_id)
+                and (not self.locations or movie["location"] in self.locations))
+
+class MemoryMovieStore:
+    # Фильмы в словаре по ID. ID выдаются по возрастанию вместе с createdAt,
+    # поэтому порядок по ID совпадает с сортировкой по дате создания.
+
+    def __init__(self):
+        self.movies: dict[int, dict] = {}
+        self._names: set[str] = set()
+        self.next_id = 1
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def query(self, movie_filter: MovieFilter, descending: bool, offset: int, limit: int) -> tuple[list[dict], int]:
+        ids = sorted(movie_id for movie_id, movie in self.movies.items() if movie_filter.matches(movie))
+        if descending:
+            ids.reverse()
+        return [self.movies[movie_id] for movie_id in ids[offset:offset + limit]], len(ids)
+
+    def get(self, movie_id: int) -> dict | None:
+        return self.movies.get(movie_id)
+
+    def has_name(self, name: str) -> bool:
+        return name in self._names
+
+    def build(self, payload: dict, created_at: datetime) -> dict:
+        return {
+            "id": self.next_id,
+            "name": payload["name"],
+            "description": payload["description"],
+            "price": payload["price"],
+            "imageUrl": payload.get("imageUrl"),
+            "location": payload["location"],
+            "published": payload["published"],
+            "genreId": payload["genreId"],
+            "genre": {"name": GENRE_NAMES[GenreId(payload["genreId"])]},
+            "createdAt": iso_timestamp(created_at),
+            "rating": 0,
+        }
+
+    def put(self, movie: dict) -> None:
+        previous = self.movies.get(movie["id"])
+        if previous is not None:
+            self._names.discard(previous["name"])
+        self.movies[movie["id"]] = movie
+        self._names.add(movie["name"])
+        self.next_id = max(self.next_id, movie["id"] + 1)
+
+    def delete(self, movie_id: int) -> dict | None:
+        movie = self.movies.pop(movie_id, None)
+        if movie is not None:
+            self._names.discard(movie["name"])
+        return movie
+
+class IndexedMovieStore(MemoryMovieStore):
+    # Базовый каталог на миллионы фильмов хранится колонками (array), а не словарями: фильм
+    # собирается из колонок только при выдаче. Индексы - отсортированные массивы ID по ключам
+    # (published), (published, location, genreId) и (published, location, genreId, price): count
+    # и позиция страницы считаются бинарным поиском по самым крупным подходящим корзинам
+    # без просмотра всего каталога.
+    # Созданные и измененные фильмы живут в словаре родителя поверх базы, удаленные и измененные
+    # базовые ID помечаются в tombstones.
+
+    prices = tuple(range(100, 1001, 50))
+    published_ratio = 0.7
+    name_prefix = "Фильм каталога №"
+    created_step = timedelta(seconds=1)
+
+    def __init__(self, size: int, seed: int = 42, created_from: datetime | None = None):
+        super().__init__()
+        self.size = size
+        # Процессы стенда строят каталог сами, поэтому точку отсчета дат им передают явно
+        self.created_from = created_from or datetime.now(timezone.utc) - self.created_step * (size + 1)
+        self.tombstones: set[int] = set()
+        self._overlay_ids: list[int] = []
+        self._prices = array("H")
+        self._attributes = array("B")
+        self._indexes: list[dict[tuple, array]] = [{}, {}, {}]
+        self._build(size, random.Random(seed))
+        self.next_id = size + 1
+
+    def _build(self, size: int, rng: random.Random) -> None:
+        genres = [genre.value for genre in GenreId]
+        for movie_id in range(1, size + 1):
+            published = rng.random() < self.published_ratio
+            location = rng.randrange(len(LOCATIONS))
+            genre_id = rng.choice(genres)
+            price = rng.choice(self.prices)
+            self._prices.append(price)
+            self._attributes.append(published | location << 1 | genre_id << 2)
+            key = (published, LOCATIONS[location], genre_id, price)
+            for index, key_length in zip(self._indexes, (1, 3, 4)):
+                bucket = index.get(key[:key_length])
+                if bucket is None:
+                    bucket = index[key[:key_length]] = array("i")
+                bucket.append(movie_id)
+
+    def __len__(self) -> int:
+        return self.size - len(self.tombstones) + len(self.movies)
+
+    def _base_movie(self, movie_id: int) -> dict:
+        attributes = self._attributes[movie_id - 1]
+        genre_id = attributes >> 2
+        return {
+            "id": movie_id,
+            "name": f"{self.name_prefix}{movie_id}",
+            "description": "Фильм из сгенерированного каталога",
+            "price": self._prices[movie_id - 1],
+            "imageUrl": None,
+            "location": LOCATIONS[attributes >> 1 & 1],
+            "published": bool(attributes & 1),
+            "genreId": genre_id,
+            "genre": {"name": GENRE_NAMES[GenreId(genre_id)]},
+            "createdAt": iso_timestamp(self.created_from + self.created_step * movie_id),
+            "rating": 0,
+        }
+
+    def _is_base(self, movie_id: int) -> bool:
+        return 1 <= movie_id <= self.size
+
+    def get(self, movie_id: int) -> dict | None:
+        movie = self.movies.get(movie_id)
+        if movie is None and self._is_base(movie_id) and movie_id not in self.tombstones:
+            movie = self._base_movie(movie_id)
+        return movie
+
+    def has_name(self, name: str) -> bool:
+        if super().has_name(name):
+            return True
+        suffix = name[len(self.name_prefix):] if name.startswith(self.name_prefix) else ""
+        if not suffix.isdigit():
+            return False
+        movie_id = int(suffix)
+        return self._is_base(movie_id) and movie_id not in self.tombstones
+
+    def put(self, movie: dict) -> None:
+        if movie["id"] not in self.movies:
+            bisect.insort(self._overlay_ids, movie["id"])
+        if self._is_base(movie["id"]):
+            self.tombstones.add(movie["id"])
+        super().put(movie)
+
+    def delete(self, movie_id: int) -> dict | None:
+        movie = self.get(movie_id)
+        if movie is None:
+            return None
+        if super().delete(movie_id) is not None:
+            self._overlay_ids.remove(movie_id)
+        if self._is_base(movie_id):
+            self.tombstones.add(movie_id)
+        return movie
+
+    def query(self, movie_filter: MovieFilter, descending: bool, offset: int, limit: int) -> tuple[list[dict], int]:
+        buckets = self._matching_buckets(movie_filter)
+        overlay = [movie_id for movie_id in self._overlay_ids if movie_filter.matches(self.movies[movie_id])]
+        # Замененные и удаленные базовые фильмы еще лежат в корзинах - их вычитаем из ранга
+        hidden = sorted(movie_id for movie_id in self.tombstones
+                        if movie_filter.matches(self._base_movie(movie_id)))
+
+        def rank(movie_id: int) -> int:
+            return (sum(bisect.bisect_right(bucket, movie_id) for bucket in buckets)
+                    - bisect.bisect_right(hidden, movie_id) + bisect.bisect_right(overlay, movie_id))
+
+        last_id = self.next_id - 1
+        count = rank(last_id)
+        if descending:
+            first, last = max(count - offset - limit, 0) + 1, count - offset
+        else:
+            first, last = offset + 1, min(offset + limit, count)
+        if first > last:
+            return [], count
+
+        low, high = 1, last_id
+        while low < high:
+            middle = (low + high) // 2
+            if rank(middle) >= first:
+                high = middle
+            else:
+                low = middle + 1
+        movie_ids = self._iter_from(low, buckets, overlay)
+        page = [self.get(next(movie_ids)) for _ in range(last - first + 1)]
+        if descending:
+            page.reverse()
+        return page, count
+
+    def _matching_buckets(self, movie_filter: MovieFilter) -> list[array]:
+        by_published, by_group, by_price = self._indexes
+        price_filtered = movie_filter.min_price is not None or movie_filter.max_price is not None
+        if not (movie_filter.locations or movie_filter.genre_id is not None or price_filtered):
+            bucket = by_published.get((movie_filter.published,))
+            return [bucket] if bucket is not None else []
+        locations = movie_filter.locations or LOCATIONS
+        genres = [movie_filter.genre_id] if movie_filter.genre_id is not None else [genre.value for genre in GenreId]
+        keys = [(movie_filter.published, location, genre_id) for location in locations for genre_id in genres]
+        if not price_filtered:
+            return [by_group[key] for key in keys if key in by_group]
+        prices = [price for price in self.prices
+                  if (movie_filter.min_price is None or price >= movie_filter.min_price)
+                  and (movie_filter.max_price is None or price <= movie_filter.max_price)]
+        keys = [key + (price,) for key in keys for price in prices]
+        return [by_price[key] for key in keys if key in by_price]
+
+    def _iter_from(self, start_id: int, buckets: list[array], overlay: list[int]) -> Iterator[int]:
+        def from_bucket(bucket: array) -> Iterator[int]:
+            for index in range(bisect.bisect_left(bucket, start_id), len(bucket)):
+                if bucket[index] not in self.tombstones:
+                    yield bucket[index]
+
+        return heapq.merge(*(from_bucket(bucket) for bucket in buckets),
+                           overlay[bisect.bisect_left(overlay, start_id):])
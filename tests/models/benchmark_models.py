@@ -0,0 +1,47 @@
+import math
+import statistics
+from datetime import datetime
+from pydantic import BaseModel
+
+class BenchmarkResult(BaseModel):
+    name: str
+    warmup_rounds: int
+    samples_ms: list[float]
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    stdev_ms: float
+    p95_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, name: str, samples_ms: list[float], warmup_rounds: int) -> "BenchmarkResult":
+        ordered = sorted(samples_ms)
+        return cls(
+            name=name,
+            warmup_rounds=warmup_rounds,
+            samples_ms=[round(sample, 3) for sample in samples_ms],
+            min_ms=ordered[0],
+            median_ms=statistics.median(ordered),
+            mean_ms=statistics.fmean(ordered),
+            stdev_ms=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            p95_ms=ordered[max(math.ceil(len(ordered) * 0.95) - 1, 0)],
+            max_ms=ordered[-1],
+        )
+
+    @property
+    def rounds(self) -> int:
+        return len(self.samples_ms)
+
+class BenchmarkBaseline(BaseModel):
+    target: str
+    created_at: datetime
+    results: dict[str, BenchmarkResult]
+
+class BenchmarkComparison(BaseModel):
+    name: str
+    baseline_median_ms: float
+    current_median_ms: float
+    change: float
+    p_value: float
+    regression: bool
@@ -0,0 +1,42 @@
+from typing import Callable, Iterator, Optional
+from pydantic import BaseModel
+from tests.models.movie_models import Location, Movie
+
+class MoviesCatalog(BaseModel):
+    movies: dict[int, Movie]
+    expected_count: int
+    pages_fetched: int
+    drift_detected: bool = False
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def __iter__(self) -> Iterator[Movie]:
+        return iter(self.movies.values())
+
+    def __contains__(self, movie_id: int) -> bool:
+        return movie_id in self.movies
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.movies) == self.expected_count
+
+    def get(self, movie_id: int) -> Optional[Movie]:
+        return self.movies.get(movie_id)
+
+    def filter(self, predicate: Callable[[Movie], bool] | None = None, *,
+               locations: list[Location] | None = None, genre_id: int | None = None,
+               min_price: int | None = None, max_price: int | None = None,
+               published: bool | None = None) -> list[Movie]:
+        return [
+            movie for movie in self.movies.values()
+            if (locations is None or movie.location in locations)
+            and (genre_id is None or movie.genre_id == genre_id)
+            and (min_price is None or movie.price >= min_price)
+            and (max_price is None or movie.price <= max_price)
+            and (published is None or movie.published == published)
+            and (predicate is None or predicate(movie))
+        ]
+
+    def sorted_by_created_at(self, descending: bool = True) -> list[Movie]:
+        return sorted(self.movies.values(), key=lambda movie: movie.created_at, reverse=descending)
@@ -0,0 +1,37 @@
+import random
+from enum import Enum
+from pydantic import BaseModel, Field
+
+class ThinkTimeModel(str, Enum):
+    CONSTANT = "constant"
+    UNIFORM = "uniform"
+    EXPONENTIAL = "exponential"
+
+class LoadProfile(BaseModel):
+    base_url: str
+    auth_url: str
+    users: int = Field(10, ge=1)
+    processes: int = Field(1, ge=1)
+    duration_s: float = Field(60, gt=0)
+    ramp_up_s: float = Field(0, ge=0)
+    think_model: ThinkTimeModel = ThinkTimeModel.EXPONENTIAL
+    think_ms: float = Field(1000, ge=0)
+    mix: dict[str, float]
+    interval_s: float = Field(1.0, gt=0)
+    seed: int | None = None
+
+    def users_of(self, process_index: int) -> list[int]:
+        # Глобальные номера виртуальных пользователей процесса: пользователи раздаются по кругу,
+        # чтобы при линейном разгоне процессы нагружались равномерно
+        return list(range(process_index, self.users, self.processes))
+
+    def start_offset_s(self, user: int) -> float:
+        return self.ramp_up_s * user / self.users
+
+    def think_time_s(self, rng: random.Random) -> float:
+        mean_s = self.think_ms / 1000
+        if self.think_model == ThinkTimeModel.CONSTANT or not mean_s:
+            return mean_s
+        if self.think_model == ThinkTimeModel.UNIFORM:
+            return rng.uniform(0, 2 * mean_s)
+        return rng.expovariate(1 / mean_s)
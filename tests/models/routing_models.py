@@ -0,0 +1,39 @@
+from enum import Enum
+from fnmatch import fnmatch
+from typing import Any
+from urllib.parse import urlsplit
+from pydantic import BaseModel
+
+class RouteAction(str, Enum):
+    ALLOW = "allow"
+    BLOCK = "block"
+    STUB = "stub"
+    CACHE = "cache"
+
+class RoutingPolicy(BaseModel):
+    # Порядок правил: отключенная политика, хосты, типы ресурсов, кэшируемые пути, иначе запрос идет в сеть
+    enabled: bool = True
+    blocked_hosts: list[str] = ["*google-analytics.com", "*googletagmanager.com", "mc.yandex.ru",
+                                "*doubleclick.net", "*facebook.net"]
+    resource_types: dict[str, RouteAction] = {"image": RouteAction.STUB, "media": RouteAction.BLOCK,
+                                              "font": RouteAction.BLOCK}
+    # Пути неизменяемых ассетов фронтенда (имена с хэшем), которые можно раздавать из локального кэша
+    cached_paths: list[str] = ["/_next/static/*"]
+
+    def action_for(self, resource_type: str, url: str) -> RouteAction:
+        if not self.enabled:
+            return RouteAction.ALLOW
+        parts = urlsplit(url)
+        if any(fnmatch(parts.hostname or "", pattern) for pattern in self.blocked_hosts):
+            return RouteAction.BLOCK
+        action = self.resource_types.get(resource_type)
+        if action is not None:
+            return action
+        if any(fnmatch(parts.path, pattern) for pattern in self.cached_paths):
+            return RouteAction.CACHE
+        return RouteAction.ALLOW
+
+    def override(self, **overrides: Any) -> "RoutingPolicy":
+        # Словарь типов ресурсов дополняется, остальные поля заменяются целиком
+        resource_types = {**self.resource_types, **overrides.pop("resource_types", {})}
+        return self.model_validate({**self.model_dump(), **overrides, "resource_types": resource_types})
@@ -0,0 +1,16 @@
+import time
+from pydantic import BaseModel
+
+class StoredCookie(BaseModel):
+    name: str
+    value: str
+    domain: str = ""
+    path: str = "/"
+
+class CachedToken(BaseModel):
+    access_token: str
+    expires_at: float
+    cookies: list[StoredCookie] = []
+
+    def expires_in(self) -> float:
+        return self.expires_at - time.time()
@@ -0,0 +1,265 @@
+import argparse
+import contextlib
+import math
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+from tests.clients.api_manager import ApiManager
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL, ADMIN_EMAIL, ADMIN_PASSWORD
+from tests.fake_backend.server import StandInServer
+from tests.models.benchmark_models import BenchmarkBaseline, BenchmarkComparison, BenchmarkResult
+from tests.models.movie_models import Movie
+from tests.models.response_models import LoginResponse, MoviesList
+from tests.request.attachments import ATTACHMENTS, AttachmentPolicy
+from tests.request.transport import TransportFactory
+from tests.utils.data_generator import MovieDataGenerator
+
+# Бенчмарки эндпоинтов через те же клиенты, что и в API тестах:
+#   python -m tests.perf.bench_endpoints --stand-in --save
+#   python -m tests.perf.bench_endpoints --stand-in --compare
+#   python -m tests.perf.bench_endpoints --base-url https://api... --auth-url https://auth... --compare
+
+# Те же комбинации фильтров, что в tests/api/test_get_movies.py
+MOVIES_FILTERS = {
+    "default": None,
+    "pagination": {"page": 2, "pageSize": 5},
+    "price": {"minPrice": 100, "maxPrice": 300},
+    "location": {"locations": ["MSK"]},
+    "genre": {"genreId": 1},
+    "sort_created_at": {"createdAt": "desc"},
+    "unpublished": {"published": False},
+}
+
+BenchmarkCase = Callable[["Stopwatch"], None]
+
+class Stopwatch:
+    # Один раунд кейса может замерять несколько операций (цикл создание/редактирование/удаление)
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        yield
+        self.samples.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+class EndpointBenchmarks:
+
+    warmup_rounds = 5
+    rounds = 30
+
+    def __init__(self, admin: ApiManager, anonymous: ApiManager, credentials: tuple[str, str]):
+        self.admin = admin
+        self.anonymous = anonymous
+        self.credentials = credentials
+        self._movie_id: int | None = None
+
+    def cases(self) -> dict[str, BenchmarkCase]:
+        cases: dict[str, BenchmarkCase] = {
+            f"get_movies[{name}]": self._get_movies_case(name, params) for name, params in MOVIES_FILTERS.items()
+        }
+        cases["get_movie_by_id"] = self._get_movie_by_id
+        cases["movie_lifecycle"] = self._movie_lifecycle
+        cases["login"] = self._login
+        return cases
+
+    def run(self, only: list[str] | None = None,
+            progress: Callable[[BenchmarkResult], None] | None = None) -> dict[str, BenchmarkResult]:
+        results = {}
+        for case_name, case in self.cases().items():
+            if only and not any(pattern in case_name for pattern in only):
+                continue
+            for _ in range(self.warmup_rounds):
+                case(Stopwatch())
+            stopwatch = Stopwatch()
+            for _ in range(self.rounds):
+                case(stopwatch)
+            for name, samples in stopwatch.samples.items():
+                results[name] = BenchmarkResult.from_samples(name, samples, self.warmup_rounds)
+                if progress is not None:
+                    progress(results[name])
+        return results
+
+    def _get_movies_case(self, name: str, params: dict | None) -> BenchmarkCase:
+        # Неопубликованные фильмы видит только администратор
+        api_manager = self.admin if params and params.get("published") is False else self.anonymous
+
+        def case(stopwatch: Stopwatch) -> None:
+            with stopwatch.measure(f"get_movies[{name}]"):
+                movies = api_manager.movies_api.get_movies(params=params, expected_status=200)
+            assert isinstance(movies, MoviesList)
+
+        return case
+
+    def _get_movie_by_id(self, stopwatch: Stopwatch) -> None:
+        if self._movie_id is None:
+            self._movie_id = self.anonymous.movies_api.get_movies(expected_status=200).movies[0].id
+        with stopwatch.measure("get_movie_by_id"):
+            self.anonymous.movies_api.get_movie_by_id(self._movie_id, expected_status=200)
+
+    def _movie_lifecycle(self, stopwatch: Stopwatch) -> None:
+        movies_api = self.admin.movies_api
+        payload = MovieDataGenerator.generate_valid_movie_payload()
+        with stopwatch.measure("create_movie"):
+            movie = movies_api.create_movie(payload, expected_status=201)
+        assert isinstance(movie, Movie)
+        try:
+            with stopwatch.measure("edit_movie"):
+                movies_api.edit_movie(movie.id, {"name": MovieDataGenerator.generate_random_title()},
+                                      expected_status=200)
+        finally:
+            with stopwatch.measure("delete_movie"):
+                movies_api.delete_movie(movie.id, expected_status=200)
+
+    def _login(self, stopwatch: Stopwatch) -> None:
+        email, password = self.credentials
+        with stopwatch.measure("login"):
+            response = self.anonymous.auth_api.login(email, password, expected_status=200)
+        assert isinstance(response, LoginResponse)
+        # login сохраняет токен в сессии, а остальные кейсы этого клиента должны оставаться анонимными
+        self.anonymous.session.headers.pop("Authorization", None)
+
+class BaselineComparator:
+    # Замедление засчитывается, только если оно статистически значимо (односторонний тест Манна-Уитни:
+    # выборки задержек далеки от нормальных) и заметно на практике по медиане: на локальном стенде
+    # ответы занимают единицы миллисекунд, и доли миллисекунды между прогонами - шум машины, а не регрессия
+
+    alpha = 0.01
+    min_slowdown = 0.10
+    min_delta_ms = 1.0
+
+    def compare(self, baseline: BenchmarkBaseline, results: dict[str, BenchmarkResult]) -> list[BenchmarkComparison]:
+        comparisons = []
+        for name, current in results.items():
+            previous = baseline.results.get(name)
+            if previous is None:
+                continue
+            change = current.median_ms / previous.median_ms - 1 if previous.median_ms else 0.0
+            p_value = self.mann_whitney_p_value(previous.samples_ms, current.samples_ms)
+            noticeable = change >= self.min_slowdown and current.median_ms - previous.median_ms >= self.min_delta_ms
+            comparisons.append(BenchmarkComparison(
+                name=name, baseline_median_ms=previous.median_ms, current_median_ms=current.median_ms,
+                change=change, p_value=p_value, regression=p_value < self.alpha and noticeable,
+            ))
+        return comparisons
+
+    @staticmethod
+    def mann_whitney_p_value(baseline: list[float], current: list[float]) -> float:
+        # H1: текущие задержки стохастически больше базовых. Нормальное приближение
+        # с поправкой на связи и на непрерывность, достаточно точное уже от ~10 раундов
+        n1, n2 = len(baseline), len(current)
+        if not n1 or not n2:
+            return 1.0
+        combined = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+        ranks = [0.0] * len(combined)
+        ties_correction = 0
+        start = 0
+        while start < len(combined):
+            end = start
+            while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+                end += 1
+            for index in range(start, end + 1):
+                ranks[index] = (start + end) / 2 + 1
+            tied = end - start + 1
+            ties_correction += tied ** 3 - tied
+            start = end + 1
+        n = n1 + n2
+        u_current = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 1) - n2 * (n2 + 1) / 2
+        variance = n1 * n2 / 12 * ((n + 1) - ties_correction / (n * (n - 1)))
+        if variance <= 0:
+            return 1.0
+        z = (u_current - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+        return 1 - statistics.NormalDist().cdf(z)
+
+class BaselineStore:
+    # Каждый сохраненный прогон - отдельный файл, сравнение идет с последним для той же цели
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def save(self, baseline: BenchmarkBaseline) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self._slug(baseline.target)}-{baseline.created_at:%Y%m%d-%H%M%S}.json"
+        path.write_text(baseline.model_dump_json(indent=2), encoding="utf-8")
+        return path
+
+    def latest(self, target: str) -> BenchmarkBaseline | None:
+        paths = sorted(self.directory.glob(f"{self._slug(target)}-*.json"))
+        if not paths:
+            return None
+        return BenchmarkBaseline.model_validate_json(paths[-1].read_bytes())
+
+    @staticmethod
+    def _slug(target: str) -> str:
+        return "".join(char if char.isalnum() else "_" for char in target)
+
+def format_result(result: BenchmarkResult) -> str:
+    return (f"{result.name:<30} раундов {result.rounds:>4}  min {result.min_ms:8.1f}  median {result.median_ms:8.1f}  "
+            f"mean {result.mean_ms:8.1f} ± {result.stdev_ms:6.1f}  p95 {result.p95_ms:8.1f}  max {result.max_ms:8.1f} мс")
+
+def format_comparison(comparison: BenchmarkComparison) -> str:
+    verdict = "ЗАМЕДЛЕНИЕ" if comparison.regression else "ok"
+    return (f"{comparison.name:<30} {comparison.baseline_median_ms:8.1f} -> {comparison.current_median_ms:8.1f} мс  "
+            f"{comparison.change:+7.1%}  p={comparison.p_value:.4f}  {verdict}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки эндпоинтов Cinescope с базовыми замерами")
+    parser.add_argument("--stand-in", action="store_true", help="Поднять локальный стенд и мерить его")
+    parser.add_argument("--stand-in-movies", type=int, default=StandInServer.default_movies)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--auth-url", default=BASE_AUTH_URL)
+    parser.add_argument("--rounds", type=int, default=EndpointBenchmarks.rounds)
+    parser.add_argument("--warmup", type=int, default=EndpointBenchmarks.warmup_rounds)
+    parser.add_argument("--only", nargs="*", help="Запустить только кейсы, в имени которых есть подстрока")
+    parser.add_argument("--baseline-dir", type=Path, default=Path(__file__).parent / "baselines")
+    parser.add_argument("--save", action="store_true", help="Сохранить результаты как новый базовый замер")
+    parser.add_argument("--compare", action="store_true",
+                        help="Сравнить с последним базовым замером; код возврата 1 при значимом замедлении")
+    args = parser.parse_args()
+
+    # Вложения allure вне pytest никуда не пишутся, а их рендер исказил бы замеры
+    ATTACHMENTS.configure(AttachmentPolicy.OFF, sample_rate=0, max_bytes_per_test=None)
+    with contextlib.ExitStack() as stack:
+        if args.stand_in:
+            server = stack.enter_context(StandInServer(movies=args.stand_in_movies))
+            base_url = auth_url = server.url
+            credentials, target = server.admin_credentials, "stand-in"
+        else:
+            base_url, auth_url = args.base_url, args.auth_url
+            credentials, target = (ADMIN_EMAIL, ADMIN_PASSWORD), urlsplit(base_url).netloc
+        if None in credentials:
+            parser.error("ADMIN_EMAIL и ADMIN_PASSWORD должны быть указаны в .env file")
+
+        factory = TransportFactory(base_urls=(base_url, auth_url))
+        stack.callback(factory.close)
+        admin = factory.api_manager(base_url, auth_url)
+        admin.auth_api.login(*credentials, expected_status=200)
+        benchmarks = EndpointBenchmarks(admin, factory.api_manager(base_url, auth_url), credentials)
+        benchmarks.rounds, benchmarks.warmup_rounds = args.rounds, args.warmup
+        print(f"Цель: {target}, раундов {args.rounds}, прогрев {args.warmup}")
+        results = benchmarks.run(args.only, progress=lambda result: print(format_result(result)))
+
+    store = BaselineStore(args.baseline_dir)
+    exit_code = 0
+    if args.compare:
+        baseline = store.latest(target)
+        if baseline is None:
+            print(f"Базовый замер для {target} не найден в {args.baseline_dir}")
+        else:
+            print(f"\nСравнение с базовым замером от {baseline.created_at:%Y-%m-%d %H:%M:%S}")
+            comparisons = BaselineComparator().compare(baseline, results)
+            for comparison in comparisons:
+                print(format_comparison(comparison))
+            exit_code = 1 if any(comparison.regression for comparison in comparisons) else 0
+    if args.save:
+        path = store.save(BenchmarkBaseline(target=target, created_at=datetime.now(), results=results))
+        print(f"\nБазовый замер сохранен: {path}")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import argparse
+import logging
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from tests.constants.log_messages import LogMessages
+from tests.utils.data_generator import MovieDataGenerator
+from tests.utils.log_pipeline import DeferredQueueHandler, LazyJson, LazyMessage, LogPipelineMode
+
+# Накладные расходы логирования в потоке теста: синхронный RotatingFileHandler с f-строками
+# против очереди с ленивыми сообщениями, плюс прогон API сьюта на фейковом бэкенде в обоих режимах:
+#   python -m tests.perf.bench_logging --rounds 5
+
+NUMBER = 2000
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+def eager_calls(logger: logging.Logger, payload) -> None:
+    # Так клиенты логировали раньше: строка собирается до проверки уровня
+    logger.debug(f"Сгенерированы данные для создания фильма: {payload.model_dump_json(indent=2)}")
+    logger.info(LogMessages.Movies.ATTEMPT_CREATE.format(payload.name))
+    logger.info(LogMessages.Movies.CREATE_SUCCESS.format(payload.name, 42))
+    logger.info(f"Успешно получено {20} фильмов. Всего найдено: {1000}")
+
+def lazy_calls(logger: logging.Logger, payload) -> None:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Сгенерированы данные для создания фильма: %s", LazyJson(payload.model_copy()))
+    logger.info(LazyMessage(LogMessages.Movies.ATTEMPT_CREATE, payload.name))
+    logger.info(LazyMessage(LogMessages.Movies.CREATE_SUCCESS, payload.name, 42))
+    logger.info("Успешно получено %s фильмов. Всего найдено: %s", 20, 1000)
+
+def build_logger(name: str, log_path: Path, level: int,
+                 use_queue: bool) -> tuple[logging.Logger, QueueListener | None]:
+    file_handler = RotatingFileHandler(log_path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    listener = None
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        logger.addHandler(DeferredQueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
+    return logger, listener
+
+def run_micro() -> dict[str, float]:
+    payload = MovieDataGenerator.generate_valid_movie_payload()
+    cases = {
+        "sync, f-строки, DEBUG": (eager_calls, logging.DEBUG, False),
+        "queue, ленивые, DEBUG": (lazy_calls, logging.DEBUG, True),
+        "sync, f-строки, INFO": (eager_calls, logging.INFO, False),
+        "queue, ленивые, INFO": (lazy_calls, logging.INFO, True),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for index, (name, (calls, level, use_queue)) in enumerate(cases.items()):
+            logger, listener = build_logger(f"bench_logging_{index}", Path(tmp_dir) / f"{index}.log", level, use_queue)
+            best = min(timeit.repeat(lambda: calls(logger, payload), number=NUMBER, repeat=5))
+            results[name] = best / NUMBER * 1_000_000
+            if listener is not None:
+                listener.stop()
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+                handler.close()
+    return results
+
+def run_suite(mode: LogPipelineMode, rounds: int) -> list[float]:
+    command = [sys.executable, "-m", "pytest", "tests/api", "--fake-backend", "-q", "-p", "no:cacheprovider",
+               "--log-pipeline", mode.value, "--allure-attachments", "off"]
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        subprocess.run(command, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сравнение накладных расходов синхронного и очередного логирования")
+    parser.add_argument("--rounds", type=int, default=5, help="Прогонов API сьюта на каждый режим")
+    parser.add_argument("--no-suite", action="store_true", help="Только микро-бенчмарк, без прогонов сьюта")
+    args = parser.parse_args()
+
+    print("Стоимость 4 вызовов логгера (как в create_movie) в потоке теста:")
+    for name, microseconds in run_micro().items():
+        print(f"  {name:<28} {microseconds:8.1f} мкс")
+    if args.no_suite:
+        return
+    print(f"API сьют на фейковом бэкенде, {args.rounds} прогонов (медиана / минимум):")
+    for mode in (LogPipelineMode.SYNC, LogPipelineMode.QUEUE):
+        timings = run_suite(mode, args.rounds)
+        print(f"  {mode.value:<6} {statistics.median(timings):6.2f} с / {min(timings):6.2f} с")
+
+if __name__ == "__main__":
+    main()
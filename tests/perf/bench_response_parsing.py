@@ -0,0 +1,74 @@
+import json
+import timeit
+import requests
+from tests.models.response_models import MoviesList
+from tests.request.api_response import ApiResponse
+
+# Микро-бенчмарк разбора страницы /movies из 20 фильмов:
+#   python -m tests.perf.bench_response_parsing
+
+PAGE_SIZE = 20
+NUMBER = 2000
+
+def build_page(page_size: int = PAGE_SIZE) -> bytes:
+    movies = [
+        {
+            "id": movie_id,
+            "name": f"Фильм {movie_id}",
+            "description": "Описание фильма " * 5,
+            "price": 100 + movie_id,
+            "imageUrl": f"https://image.example/{movie_id}.png",
+            "location": "MSK" if movie_id % 2 else "SPB",
+            "published": True,
+            "genreId": movie_id % 5 + 1,
+            "genre": {"name": "Драма"},
+            "createdAt": "2025-01-01T12:00:00.000Z",
+            "rating": 4.5,
+        }
+        for movie_id in range(1, page_size + 1)
+    ]
+    page = {"movies": movies, "page": 1, "pageSize": page_size, "count": 1000, "pageCount": 50}
+    return json.dumps(page, ensure_ascii=False).encode("utf-8")
+
+def build_response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+def legacy_with_attachment(content: bytes) -> MoviesList:
+    response = build_response(content)
+    json.dumps(response.json(), indent=4, ensure_ascii=False)
+    return MoviesList.model_validate(response.json())
+
+def legacy_without_attachment(content: bytes) -> MoviesList:
+    response = build_response(content)
+    return MoviesList.model_validate(response.json())
+
+def single_parse_with_attachment(content: bytes) -> MoviesList:
+    response = ApiResponse(build_response(content))
+    json.dumps(response.json(), indent=4, ensure_ascii=False)
+    return response.model(MoviesList)
+
+def single_parse_without_attachment(content: bytes) -> MoviesList:
+    return ApiResponse(build_response(content)).model(MoviesList)
+
+def run() -> dict[str, float]:
+    content = build_page()
+    cases = {
+        "legacy, с вложением ответа": legacy_with_attachment,
+        "single-parse, с вложением ответа": single_parse_with_attachment,
+        "legacy, без вложения": legacy_without_attachment,
+        "single-parse, без вложения (validate_json)": single_parse_without_attachment,
+    }
+    results = {}
+    for name, case in cases.items():
+        case(content)
+        best = min(timeit.repeat(lambda: case(content), number=NUMBER, repeat=5))
+        results[name] = best / NUMBER * 1_000_000
+    return results
+
+if __name__ == "__main__":
+    for name, microseconds in run().items():
+        print(f"{name:<45} {microseconds:8.1f} мкс/ответ")
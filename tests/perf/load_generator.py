@@ -0,0 +1,387 @@
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import queue
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+from faker import Faker
+from tests.clients.api_manager import ApiManager
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL, ADMIN_EMAIL, ADMIN_PASSWORD
+from tests.fake_backend.server import StandInServer
+from tests.models.load_models import LoadProfile, ThinkTimeModel
+from tests.models.movie_models import Movie
+from tests.request.transport import TransportFactory
+from tests.utils.data_generator import MovieDataGenerator
+from tests.utils.latency import LATENCY, LatencyHistogram, LatencyRecorder
+
+# Закрытая модель нагрузки поверх API клиентов: каждый виртуальный пользователь ждет ответ,
+# "думает" и только потом шлет следующий запрос.
+#   python -m tests.perf.load_generator --stand-in --users 50 --processes 4 --duration 60 --ramp-up 10
+#   python -m tests.perf.load_generator --diff logs/load-old.jsonl logs/load-new.jsonl
+
+DEFAULT_MIX = {"get_movies": 70, "get_movie_by_id": 20, "create_delete": 10}
+
+class ScenarioStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def record(self, scenario: str, ok: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(scenario, {"count": 0, "failures": 0})
+            counts["count"] += 1
+            counts["failures"] += not ok
+
+    def swap(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        return counts
+
+class VirtualUser:
+
+    def __init__(self, api_manager: ApiManager, admin: ApiManager, profile: LoadProfile, rng: random.Random,
+                 movie_ids: list[int], stats: ScenarioStats):
+        self.api_manager = api_manager
+        self.admin = admin
+        self.profile = profile
+        self.rng = rng
+        self.movie_ids = movie_ids
+        self.stats = stats
+        self.active = False
+        self.scenarios: dict[str, Callable[[], None]] = {
+            "get_movies": self.get_movies,
+            "get_movie_by_id": self.get_movie_by_id,
+            "create_delete": self.create_delete,
+        }
+
+    def run(self, started_at: float, user: int) -> None:
+        finish_at = started_at + self.profile.duration_s
+        self._sleep_until(started_at + self.profile.start_offset_s(user), finish_at)
+        names, weights = list(self.profile.mix), list(self.profile.mix.values())
+        self.active = True
+        try:
+            while time.time() < finish_at:
+                scenario = self.rng.choices(names, weights)[0]
+                try:
+                    self.scenarios[scenario]()
+                    self.stats.record(scenario, ok=True)
+                except Exception:
+                    # Ошибки нагрузку не останавливают: их доля - часть результата
+                    self.stats.record(scenario, ok=False)
+                self._sleep_until(time.time() + self.profile.think_time_s(self.rng), finish_at)
+        finally:
+            self.active = False
+
+    def get_movies(self) -> None:
+        movies_list = self.api_manager.movies_api.get_movies(
+            params=MovieDataGenerator.generate_random_movie_filters(), expected_status=200)
+        if movies_list.movies and len(self.movie_ids) < 1000:
+            self.movie_ids.append(self.rng.choice(movies_list.movies).id)
+
+    def get_movie_by_id(self) -> None:
+        if not self.movie_ids:
+            return self.get_movies()
+        self.api_manager.movies_api.get_movie_by_id(self.rng.choice(self.movie_ids), expected_status=200)
+
+    def create_delete(self) -> None:
+        movie = self.admin.movies_api.create_movie(MovieDataGenerator.generate_movie_payloads(1)[0],
+                                                   expected_status=201)
+        assert isinstance(movie, Movie)
+        self.admin.movies_api.delete_movie(movie.id, expected_status=200)
+
+    @staticmethod
+    def _sleep_until(moment: float, finish_at: float) -> None:
+        delay = min(moment, finish_at) - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+class LoadWorker:
+    # Процесс с частью виртуальных пользователей (по потоку на пользователя). Раз в интервал
+    # отправляет родителю гистограммы задержек по эндпоинтам и счетчики сценариев за этот интервал.
+
+    def __init__(self, profile: LoadProfile, credentials: tuple[str, str], index: int,
+                 events: multiprocessing.Queue, start: multiprocessing.Event, started_at: multiprocessing.Value):
+        self.profile = profile
+        self.credentials = credentials
+        self.index = index
+        self.events = events
+        self.start_event = start
+        self.started_at = started_at
+
+    def run(self) -> None:
+        seed = None if self.profile.seed is None else self.profile.seed + self.index
+        random.seed(seed)
+        Faker.seed(seed)
+        users = self.profile.users_of(self.index)
+        factory = TransportFactory(base_urls=(self.profile.base_url, self.profile.auth_url),
+                                   pool_maxsize=max(len(users), 1))
+        try:
+            admin = self._api_manager(factory)
+            admin.auth_api.login(*self.credentials, expected_status=200)
+            stats, movie_ids = ScenarioStats(), []
+            virtual_users = [
+                VirtualUser(self._api_manager(factory), admin, self.profile, random.Random(random.random()),
+                            movie_ids, stats)
+                for _ in users
+            ]
+            self.events.put(("ready", self.index, None))
+            self.start_event.wait()
+            self._drive(virtual_users, users, stats)
+        finally:
+            factory.close()
+            self.events.put(("done", self.index, None))
+
+    def _drive(self, virtual_users: list[VirtualUser], users: list[int], stats: ScenarioStats) -> None:
+        started_at = self.started_at.value
+        threads = [threading.Thread(target=virtual_user.run, args=(started_at, user), daemon=True)
+                   for virtual_user, user in zip(virtual_users, users)]
+        tracker = LATENCY.track()
+        for thread in threads:
+            thread.start()
+        intervals = math.ceil(self.profile.duration_s / self.profile.interval_s)
+        for interval in range(intervals):
+            time.sleep(max(started_at + min((interval + 1) * self.profile.interval_s, self.profile.duration_s)
+                           - time.time(), 0))
+            active = sum(virtual_user.active for virtual_user in virtual_users)
+            if interval == intervals - 1:
+                # Запросы, начатые до конца прогона, должны попасть в последний интервал
+                for thread in threads:
+                    thread.join()
+            finished, tracker = tracker, LATENCY.rotate(tracker)
+            self.events.put(("interval", self.index, {"interval": interval, "users": active,
+                                                      "latency": finished.dumps(), "scenarios": stats.swap()}))
+        LATENCY.untrack(tracker)
+
+    def _api_manager(self, factory: TransportFactory) -> ApiManager:
+        api_manager = factory.api_manager(self.profile.base_url, self.profile.auth_url)
+        # Шаги и вложения allure вне pytest не нужны, а их подготовка съедает CPU генератора
+        api_manager.movies_api.allure_reporting = False
+        api_manager.auth_api.allure_reporting = False
+        return api_manager
+
+def run_worker(profile: LoadProfile, credentials: tuple[str, str], index: int, events: multiprocessing.Queue,
+               start: multiprocessing.Event, started_at: multiprocessing.Value) -> None:
+    LoadWorker(profile, credentials, index, events, start, started_at).run()
+
+class LoadReport:
+    # Собирает интервалы всех процессов в одну временную серию: строка JSON на интервал,
+    # первая строка - профиль нагрузки, последняя - итог за весь прогон
+
+    percentiles = (50, 95, 99)
+
+    def __init__(self, profile: LoadProfile, path: Path, output: Callable[[str], None] = print):
+        self.profile = profile
+        self.path = path
+        self.output = output
+        self.totals = LatencyRecorder()
+        self.scenarios: dict[str, dict[str, int]] = {}
+        self._pending: dict[int, list[dict[str, Any]]] = {}
+        self._file = None
+
+    def __enter__(self) -> "LoadReport":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._write({"profile": self.profile.model_dump(mode="json")})
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for interval in sorted(self._pending):
+            self._emit(interval, self._pending.pop(interval))
+        self._write({"summary": self._summary(self.totals, self.profile.duration_s, self.scenarios)})
+        self._file.close()
+
+    def add(self, payload: dict[str, Any]) -> None:
+        interval = payload["interval"]
+        self._pending.setdefault(interval, []).append(payload)
+        if len(self._pending[interval]) == self.profile.processes:
+            self._emit(interval, self._pending.pop(interval))
+
+    def _emit(self, interval: int, payloads: list[dict[str, Any]]) -> None:
+        recorder, scenarios = LatencyRecorder(), {}
+        for payload in payloads:
+            recorder.loads(payload["latency"])
+            self.totals.loads(payload["latency"])
+            for name, counts in payload["scenarios"].items():
+                for target in (scenarios, self.scenarios):
+                    merged = target.setdefault(name, {"count": 0, "failures": 0})
+                    merged["count"] += counts["count"]
+                    merged["failures"] += counts["failures"]
+        elapsed_s = min((interval + 1) * self.profile.interval_s, self.profile.duration_s)
+        length_s = elapsed_s - interval * self.profile.interval_s
+        record = {"t": round(elapsed_s, 3), "users": sum(payload["users"] for payload in payloads),
+                  **self._summary(recorder, length_s, scenarios)}
+        self._write(record)
+        overall = record["overall"]
+        self.output(f"{record['t']:7.1f}s  пользователей {record['users']:4}  rps {overall['rps']:8.1f}  "
+                    f"ошибок {overall['error_rate']:6.1%}  "
+                    + "  ".join(f"p{percent} {overall.get(f'p{percent}') or 0:7.1f}" for percent in self.percentiles)
+                    + " мс")
+
+    def _summary(self, recorder: LatencyRecorder, length_s: float,
+                 scenarios: dict[str, dict[str, int]]) -> dict[str, Any]:
+        overall, requests, errors = LatencyHistogram(), 0, 0
+        for _, latency in recorder.items():
+            overall.merge(latency.histograms["total"])
+            requests += latency.count
+            errors += latency.errors
+        endpoints = recorder.summary()
+        for summary in endpoints.values():
+            summary["rps"] = self._rps(summary["count"], length_s)
+        return {
+            "overall": {"requests": requests, "rps": self._rps(requests, length_s),
+                        "error_rate": round(errors / requests, 4) if requests else 0.0,
+                        **{f"p{percent}": overall.percentile(percent) for percent in self.percentiles}},
+            "endpoints": endpoints,
+            "scenarios": dict(sorted(scenarios.items())),
+        }
+
+    @staticmethod
+    def _rps(requests: int, length_s: float) -> float:
+        return round(requests / length_s, 2) if length_s else 0.0
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n")
+        self._file.flush()
+
+class LoadGenerator:
+
+    startup_timeout_s = 60
+
+    def __init__(self, profile: LoadProfile, credentials: tuple[str, str]):
+        self.profile = profile
+        self.credentials = credentials
+
+    def run(self, report: LoadReport) -> None:
+        context = multiprocessing.get_context("spawn")
+        events, start, started_at = context.Queue(), context.Event(), context.Value("d", 0.0)
+        processes = [context.Process(target=run_worker, daemon=True,
+                                     args=(self.profile, self.credentials, index, events, start, started_at))
+                     for index in range(self.profile.processes)]
+        for process in processes:
+            process.start()
+        try:
+            # Отсчет начинается, когда все процессы поднялись и залогинились: иначе разгон поедет
+            ready = 0
+            while ready < len(processes):
+                kind, index, _ = events.get(timeout=self.startup_timeout_s)
+                if kind == "done":
+                    raise RuntimeError(f"Процесс нагрузки {index} завершился до старта")
+                ready += 1
+            started_at.value = time.time()
+            start.set()
+            done = 0
+            while done < len(processes):
+                try:
+                    kind, index, payload = events.get(timeout=self.profile.interval_s * 5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        break
+                    continue
+                if kind == "interval":
+                    report.add(payload)
+                elif kind == "done":
+                    done += 1
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+def diff_reports(old_path: Path, new_path: Path) -> list[str]:
+    old, new = (_read_summary(path) for path in (old_path, new_path))
+    lines = [f"{'':<34} {'rps':>17} {'ошибок':>15} {'p50':>17} {'p95':>17} {'p99':>17}"]
+    rows = [("Всего", old["overall"], new["overall"])]
+    for key in sorted(set(old["endpoints"]) | set(new["endpoints"])):
+        rows.append((key, _endpoint_row(old["endpoints"].get(key)), _endpoint_row(new["endpoints"].get(key))))
+    for name, before, after in rows:
+        cells = [f"{_fmt(before.get('rps')):>7} -> {_fmt(after.get('rps')):>7}",
+                 f"{_fmt_rate(before.get('error_rate'))} -> {_fmt_rate(after.get('error_rate'))}"]
+        cells += [f"{_fmt(before.get(metric)):>7} -> {_fmt(after.get(metric)):>7}" for metric in ("p50", "p95", "p99")]
+        lines.append(f"{name:<34} " + " ".join(cells))
+    return lines
+
+def _read_summary(path: Path) -> dict[str, Any]:
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if "summary" in record:
+                return record["summary"]
+    raise ValueError(f"В {path} нет итоговой строки summary - прогон не был завершен")
+
+def _endpoint_row(summary: dict[str, Any] | None) -> dict[str, Any]:
+    if summary is None:
+        return {}
+    return {"rps": summary.get("rps"), "error_rate": summary["error_rate"], **summary.get("total_ms", {})}
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+def _fmt_rate(value: float | None) -> str:
+    return "    -" if value is None else f"{value:5.1%}"
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Генератор нагрузки на Cinescope поверх API клиентов")
+    parser.add_argument("--stand-in", action="store_true", help="Поднять локальный стенд и нагружать его")
+    parser.add_argument("--stand-in-movies", type=int, default=StandInServer.default_movies)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--auth-url", default=BASE_AUTH_URL)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=60, help="Длительность прогона, с")
+    parser.add_argument("--ramp-up", type=float, default=0, help="За сколько секунд стартуют все пользователи")
+    parser.add_argument("--think-model", choices=[model.value for model in ThinkTimeModel],
+                        default=ThinkTimeModel.EXPONENTIAL.value)
+    parser.add_argument("--think-ms", type=float, default=1000, help="Среднее время \"раздумья\" между запросами")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Веса сценариев, например get_movies=70,get_movie_by_id=20,create_delete=10")
+    parser.add_argument("--interval", type=float, default=1.0, help="Шаг временной серии, с")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=Path("logs") / "load.jsonl")
+    parser.add_argument("--diff", nargs=2, type=Path, metavar=("OLD", "NEW"),
+                        help="Сравнить итоги двух прогонов вместо запуска нагрузки")
+    args = parser.parse_args()
+
+    if args.diff:
+        for line in diff_reports(*args.diff):
+            print(line)
+        return 0
+    unknown = set(args.mix) - set(DEFAULT_MIX)
+    if unknown:
+        parser.error(f"Неизвестные сценарии: {', '.join(sorted(unknown))}. Доступны: {', '.join(DEFAULT_MIX)}")
+
+    with contextlib.ExitStack() as stack:
+        if args.stand_in:
+            server = stack.enter_context(StandInServer(movies=args.stand_in_movies))
+            base_url = auth_url = server.url
+            credentials = server.admin_credentials
+        else:
+            base_url, auth_url = args.base_url, args.auth_url
+            credentials = (ADMIN_EMAIL, ADMIN_PASSWORD)
+        if None in credentials:
+            parser.error("ADMIN_EMAIL и ADMIN_PASSWORD должны быть указаны в .env file")
+        profile = LoadProfile(base_url=base_url, auth_url=auth_url, users=args.users, processes=args.processes,
+                              duration_s=args.duration, ramp_up_s=args.ramp_up, think_model=args.think_model,
+                              think_ms=args.think_ms, mix=args.mix, interval_s=args.interval, seed=args.seed)
+        print(f"Нагрузка на {base_url}: пользователей {profile.users}, процессов {profile.processes}, "
+              f"{profile.duration_s:.0f} с, разгон {profile.ramp_up_s:.0f} с")
+        with LoadReport(profile, args.output) as report:
+            LoadGenerator(profile, credentials).run(report)
+        print(f"Временная серия: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import functools
+import json
+from typing import Any, TypeVar
+import requests
+from pydantic import TypeAdapter
+from tests.request.timing import RequestTiming
+
+ModelT = TypeVar("ModelT")
+
+_UNSET = object()
+
+@functools.cache
+def type_adapter(model_type: type[ModelT]) -> TypeAdapter[ModelT]:
+    return TypeAdapter(model_type)
+
+class ApiResponse:
+    # Обертка над requests.Response, которая разбирает тело не больше одного раза.
+    # Если JSON уже понадобился (логирование, вложения allure), модель строится из готового объекта,
+    # иначе pydantic валидирует сырые байты напрямую, минуя json.loads.
+
+    def __init__(self, response: requests.Response, timing: RequestTiming | None = None):
+        self.raw = response
+        self.timing = timing
+        # Неудачные попытки перед этим ответом, если запрос повторялся
+        self.retries: list[str] = []
+        self._json: Any = _UNSET
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def __bool__(self) -> bool:
+        return self.raw.ok
+
+    def __repr__(self) -> str:
+        return f"<ApiResponse [{self.raw.status_code}]>"
+
+    def json(self) -> Any:
+        if self._json is _UNSET:
+            try:
+                self._json = json.loads(self.raw.content)
+            except json.JSONDecodeError as e:
+                raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+        return self._json
+
+    def model(self, model_type: type[ModelT]) -> ModelT:
+        adapter = type_adapter(model_type)
+        if self._json is not _UNSET:
+            return adapter.validate_python(self._json)
+        return adapter.validate_json(self.raw.content)
@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Iterable
+from tests.request.custom_requester import CustomRequester
+
+async def gather_bounded(awaitables: Iterable[Awaitable], limit: int, return_exceptions: bool = False) -> list[Any]:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(awaitable: Awaitable) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(_run(awaitable) for awaitable in awaitables), return_exceptions=return_exceptions)
+
+class AsyncCustomRequester(CustomRequester):
+    # Асинхронный только интерфейс: неблокирующего I/O нет, каждый запрос - блокирующий вызов requests
+    # в потоке executor поверх той же сессии (и ее общего пула соединений), так что адаптеры фейкового
+    # бэкенда, кассеты и ограничитель работают как в синхронных клиентах. Параллельность ограничена числом
+    # потоков executor (по умолчанию 10), поэтому его размер и лимит gather_bounded задаются одним
+    # значением - см. AsyncApiManager. Шаги и вложения allure пишутся уже в потоке event loop: жизненный цикл
+    # allure не потокобезопасен.
+
+    def __init__(self, session, base_url, executor: Executor | None = None):
+        super().__init__(session, base_url)
+        self.executor = executor
+
+    async def _send_request(self, method, endpoint, params=None, json_data=None, **kwargs):
+        url = self._build_url(endpoint, kwargs.pop('path_params', None))
+
+        expected_status = kwargs.pop('expected_status', None)
+        latency_budget_ms = kwargs.pop('latency_budget_ms', None)
+        request_kwargs = self._build_request_kwargs(params, json_data, kwargs)
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(self.executor, self._perform_request, method, url, request_kwargs,
+                                              endpoint)
+
+        return self._complete_request(method, url, params, json_data, response, expected_status, endpoint,
+                                      latency_budget_ms)
+
+    async def get(self, endpoint, params=None, **kwargs):
+        return await self._send_request("GET", endpoint, params=params, **kwargs)
+
+    async def post(self, endpoint, data=None, **kwargs):
+        return await self._send_request("POST", endpoint, json_data=data, **kwargs)
+
+    async def patch(self, endpoint, data=None, **kwargs):
+        return await self._send_request("PATCH", endpoint, json_data=data, **kwargs)
+
+    async def delete(self, endpoint, data=None, **kwargs):
+        return await self._send_request("DELETE", endpoint, json_data=data, **kwargs)
@@ -0,0 +1,69 @@
+import random
+from enum import Enum
+from typing import Callable
+import allure
+
+AttachmentRender = Callable[[], tuple[str, allure.attachment_type]]
+
+class AttachmentPolicy(str, Enum):
+    ALWAYS = "always"
+    ON_FAILURE = "on-failure"
+    SAMPLED = "sampled"
+    OFF = "off"
+
+class AttachmentRecorder:
+    # Вложения передаются как функции рендера: сериализация выполняется, только если вложение
+    # действительно попадет в отчет. В режиме on-failure (и для невыбранных тестов в sampled)
+    # обмены копятся в памяти и записываются в allure только при падении теста.
+
+    TRUNCATED_NOTE = "\n... [обрезано: превышен лимит вложений на тест]"
+
+    def __init__(self, policy: AttachmentPolicy = AttachmentPolicy.ALWAYS, sample_rate: float = 0.1,
+                 max_bytes_per_test: int | None = None):
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.max_bytes_per_test = max_bytes_per_test
+        self._buffer: list[tuple[str, AttachmentRender]] = []
+        self._attached_bytes = 0
+        self._sampled = False
+
+    def configure(self, policy: AttachmentPolicy, sample_rate: float, max_bytes_per_test: int | None) -> None:
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.max_bytes_per_test = max_bytes_per_test
+
+    def start_test(self) -> None:
+        self._buffer.clear()
+        self._attached_bytes = 0
+        self._sampled = self.policy == AttachmentPolicy.SAMPLED and random.random() < self.sample_rate
+
+    def attach(self, name: str, render: AttachmentRender) -> None:
+        if self.policy == AttachmentPolicy.OFF:
+            return
+        if self.policy == AttachmentPolicy.ALWAYS or self._sampled:
+            self._write(name, render)
+        else:
+            self._buffer.append((name, render))
+
+    def flush(self) -> None:
+        buffered, self._buffer = self._buffer, []
+        for name, render in buffered:
+            self._write(name, render)
+
+    def discard(self) -> None:
+        self._buffer.clear()
+
+    def _write(self, name: str, render: AttachmentRender) -> None:
+        body, attachment_type = render()
+        if self.max_bytes_per_test is not None:
+            budget = self.max_bytes_per_test - self._attached_bytes
+            if budget <= 0:
+                return
+            encoded = body.encode("utf-8")
+            if len(encoded) > budget:
+                body = encoded[:budget].decode("utf-8", errors="ignore") + self.TRUNCATED_NOTE
+                attachment_type = allure.attachment_type.TEXT
+            self._attached_bytes += min(len(encoded), budget)
+        allure.attach(body=body, name=name, attachment_type=attachment_type)
+
+ATTACHMENTS = AttachmentRecorder()
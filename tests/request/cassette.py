@@ -0,0 +1,241 @@
+import base64
+import hashlib
+import json
+import logging
+import mmap
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import BaseAdapter
+from tests.request.transport import build_response
+from tests.utils.file_lock import file_lock
+
+class CassetteMiss(requests.RequestException):
+    # Отдельный тип, а не ConnectionError: промах кассеты не лечится повтором запроса
+    pass
+
+class CassetteMode(str, Enum):
+    RECORD = "record"
+    REPLAY = "replay"
+
+class MatchPolicy:
+    # Как сопоставлять запрос воспроизведения с записанным. Сначала ищется запись с тем же телом
+    # без изменчивых полей (сгенерированные имена, email, даты), затем - если разрешено - запись
+    # с телом той же формы (те же поля тех же типов): тела со случайными ценами и жанрами иначе
+    # не совпадут, а невалидные тела не подменятся ответом на валидное.
+    # Токены от прогона к прогону разные, поэтому в ключ входит не токен, а кто вызывает:
+    # аноним или роли из payload JWT.
+
+    default_volatile_fields = frozenset({"name", "description", "email", "fullName", "password",
+                                         "passwordRepeat", "createdAt", "imageUrl"})
+
+    def __init__(self, volatile_fields: frozenset[str] | None = None, ignore_query: frozenset[str] = frozenset(),
+                 fallback_to_shape: bool = True):
+        self.volatile_fields = self.default_volatile_fields if volatile_fields is None else volatile_fields
+        self.ignore_query = ignore_query
+        self.fallback_to_shape = fallback_to_shape
+
+    def url_key(self, method: str, url: str, caller: str) -> str:
+        parts = urlsplit(url)
+        query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if name not in self.ignore_query)
+        return f"{caller} {method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+
+    def body_key(self, method: str, url: str, caller: str, body: Any, digest: str | None = None) -> str:
+        # Без изменчивых полей подходит хэш, посчитанный при записи
+        if digest is None or self.volatile_fields:
+            digest = body_hash(self._strip(body))
+        return f"{self.url_key(method, url, caller)}#{digest}"
+
+    def shape_key(self, method: str, url: str, caller: str, body: Any) -> str:
+        return f"{self.url_key(method, url, caller)}#{body_hash(self._shape(body))}"
+
+    @staticmethod
+    def caller(authorization: str | None) -> str:
+        if not authorization:
+            return "anonymous"
+        try:
+            payload = authorization.removeprefix("Bearer ").split(".")[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+            return ",".join(sorted(claims["roles"]))
+        except (IndexError, ValueError, KeyError, TypeError):
+            return "bearer"
+
+    def _shape(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self._shape(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._shape(item) for item in value]
+        return type(value).__name__
+
+    def _strip(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self._strip(item) for key, item in value.items() if key not in self.volatile_fields}
+        if isinstance(value, list):
+            return [self._strip(item) for item in value]
+        return value
+
+def parse_body(body: bytes | str | None) -> Any:
+    if not body:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode("latin-1")
+
+def body_hash(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+class CassetteStore:
+    # Кассета - каталог из двух файлов, которые только дописываются:
+    #   exchanges.dat - ответы подряд: строка JSON со статусом и заголовками, затем сырое тело;
+    #   index.jsonl   - по строке на обмен: метод, URL, нормализованный query, хэш и тело запроса,
+    #                   смещение и длина ответа в exchanges.dat;
+    #   seeds.jsonl   - seed генераторов тестовых данных для каждого теста, чтобы при воспроизведении
+    #                   тест отправил те же данные, что и при записи.
+    # При воспроизведении читается только индекс, а exchanges.dat отображается в память через mmap,
+    # так что тела ответов не загружаются, пока их не запросят.
+
+    # Логин и пароль - изменчивые поля, поэтому без .env воспроизведению подходят любые
+    replay_credentials = ("cassette@replay.local", "cassette-replay")
+
+    def __init__(self, path: Path, policy: MatchPolicy | None = None):
+        self.path = Path(path)
+        self.policy = policy or MatchPolicy()
+        self.data_path = self.path / "exchanges.dat"
+        self.index_path = self.path / "index.jsonl"
+        self.seeds_path = self.path / "seeds.jsonl"
+        self._lock = threading.Lock()
+        self._data: mmap.mmap | None = None
+        self._by_body: dict[str, list[tuple[int, int]]] = {}
+        self._by_shape: dict[str, list[tuple[int, int]]] = {}
+        self._cursors: dict[str, int] = {}
+        self._seeds: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_body.values())
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        parts = urlsplit(request.url)
+        request_body = parse_body(request.body)
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in ("set-cookie", "content-length", "content-encoding", "transfer-encoding")}
+        head = {"status": response.status_code, "reason": response.reason, "headers": headers,
+                "set_cookies": self._set_cookies(response)}
+        payload = json.dumps(head, ensure_ascii=False).encode("utf-8") + b"\n" + response.content
+        with file_lock(self.path / "cassette.lock"):
+            with self.data_path.open("ab") as data:
+                offset = data.tell()
+                data.write(payload)
+            entry = {
+                "caller": self.policy.caller(request.headers.get("Authorization")),
+                "method": request.method,
+                "url": f"{parts.scheme}://{parts.netloc}{parts.path}",
+                "query": sorted(parse_qsl(parts.query, keep_blank_values=True)),
+                "body_hash": body_hash(request_body),
+                "body": request_body,
+                "offset": offset,
+                "length": len(payload),
+            }
+            with self.index_path.open("a", encoding="utf-8") as index:
+                index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def load(self) -> "CassetteStore":
+        if not self.index_path.exists():
+            raise FileNotFoundError(f"Кассета {self.path} не найдена - сначала запишите ее с --cassette-mode record")
+        with self.data_path.open("rb") as data:
+            if data.seek(0, 2):
+                self._data = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.seeds_path.exists():
+            with self.seeds_path.open(encoding="utf-8") as seeds:
+                self._seeds = {test_id: seed for test_id, seed in map(json.loads, seeds)}
+        with self.index_path.open(encoding="utf-8") as index:
+            for line in index:
+                entry = json.loads(line)
+                url = f"{entry['url']}?{urlencode([tuple(pair) for pair in entry['query']])}"
+                location = (entry["offset"], entry["length"])
+                caller = entry["caller"]
+                shape_key = self.policy.shape_key(entry["method"], url, caller, entry["body"])
+                self._by_shape.setdefault(shape_key, []).append(location)
+                body_key = self.policy.body_key(entry["method"], url, caller, entry["body"], entry["body_hash"])
+                self._by_body.setdefault(body_key, []).append(location)
+        return self
+
+    def record_seed(self, test_id: str, seed: int) -> None:
+        with file_lock(self.path / "cassette.lock"):
+            with self.seeds_path.open("a", encoding="utf-8") as seeds:
+                seeds.write(json.dumps([test_id, seed], ensure_ascii=False) + "\n")
+
+    def seed_for(self, test_id: str) -> int | None:
+        return self._seeds.get(test_id)
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response | None:
+        caller = self.policy.caller(request.headers.get("Authorization"))
+        body = parse_body(request.body)
+        location = self._next(self.policy.body_key(request.method, request.url, caller, body), self._by_body)
+        if location is None and self.policy.fallback_to_shape:
+            location = self._next(self.policy.shape_key(request.method, request.url, caller, body), self._by_shape)
+        if location is None or self._data is None:
+            return None
+        offset, length = location
+        head, _, content = self._data[offset:offset + length].partition(b"\n")
+        head = json.loads(head)
+        return build_response(request, head["status"], content, head["headers"], head["set_cookies"],
+                              reason=head["reason"])
+
+    def close(self) -> None:
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def _next(self, key: str, entries: dict[str, list[tuple[int, int]]]) -> tuple[int, int] | None:
+        # Одинаковые запросы воспроизводятся в порядке записи, после последнего повторяется последний
+        locations = entries.get(key)
+        if not locations:
+            return None
+        with self._lock:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        return locations[min(cursor, len(locations) - 1)]
+
+    @staticmethod
+    def _set_cookies(response: requests.Response) -> list[str]:
+        original = getattr(response.raw, "_original_response", None)
+        if original is None:
+            return []
+        return original.msg.get_all("Set-Cookie") or []
+
+class CassetteAdapter(BaseAdapter):
+    # В режиме record запрос уходит через исходный адаптер хоста, а обмен дописывается в кассету,
+    # в режиме replay ответ берется из кассеты и сеть не используется вовсе.
+
+    def __init__(self, store: CassetteStore, mode: CassetteMode, inner: BaseAdapter | None = None):
+        super().__init__()
+        self.store = store
+        self.mode = mode
+        self.inner = inner
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        if self.mode == CassetteMode.RECORD:
+            response = self.inner.send(request, stream=False, timeout=timeout, verify=verify, cert=cert,
+                                       proxies=proxies)
+            self.store.record(request, response)
+            return response
+        response = self.store.replay(request)
+        if response is None:
+            self.logger.error("В кассете нет ответа на %s %s", request.method, request.url)
+            raise CassetteMiss(f"В кассете {self.store.path} нет ответа на {request.method} {request.url}",
+                               request=request)
+        return response
+
+    def close(self) -> None:
+        # Кассета общая на весь прогон, а сессии закрываются тестами - ее закрывает фикстура cassette_store
+        pass
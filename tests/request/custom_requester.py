@@ -1,8 +1,18 @@
 import logging
-import os
 import json
+import time
+from contextlib import nullcontext
+from urllib.parse import urlsplit
 import allure
 import requests
+from tests.request.api_response import ApiResponse
+from tests.request.attachments import ATTACHMENTS
+from tests.request.http_dump import HTTP_DUMP
+from tests.request.rate_limit import RATE_LIMITER
+from tests.request.retry import RETRIES
+from tests.request.timing import CONNECT_TIMER, RequestTiming
+from tests.utils.latency import LATENCY
+from tests.utils.sla_policy import SLA
 
 class CustomRequester:
 
@@ -16,28 +26,83 @@ class CustomRequester:
         self.base_url = base_url
         self.session.headers.update(self.base_headers)
         self.logger = logging.getLogger(__name__)
+        # Запросы из фоновых потоков не должны писать в allure: его жизненный цикл не потокобезопасен
+        self.allure_reporting = True
 
     def _send_request(self, method, endpoint, params=None, json_data=None, **kwargs):
-        url = f"{self.base_url}{endpoint}"
+        # endpoint - шаблон вида /movies/{movie_id}: подставляется path_params, а в метрики идет сам шаблон
+        url = self._build_url(endpoint, kwargs.pop('path_params', None))
 
         expected_status = kwargs.pop('expected_status', None)
+        latency_budget_ms = kwargs.pop('latency_budget_ms', None)
+        request_kwargs = self._build_request_kwargs(params, json_data, kwargs)
 
-        request_kwargs = kwargs
-        if params:
-            request_kwargs['params'] = params
-        if json_data:
-            request_kwargs['json'] = json_data
-
-        step_name = f"Выполнение {method.upper()} запроса на {url}"
-        with allure.step(step_name):
+        with self._allure_step(method, url):
             self._attach_request_details(method, url, params, json_data)
 
-            response = self.session.request(method, url, **request_kwargs)
+            response = self._perform_request(method, url, request_kwargs, endpoint)
             self._attach_response_details(response)
+            self._attach_retries(response)
+            self._dump_exchange(response, expected_status)
             self._validate_status_code(response, expected_status)
+            self._validate_latency(method, endpoint, response, latency_budget_ms)
 
             return response
 
+    def _complete_request(self, method, url, params, json_data, response, expected_status, endpoint=None,
+                          latency_budget_ms=None):
+        # Завершение запроса, выполненного вне текущего потока: шаг allure, вложения и проверка статуса
+        with self._allure_step(method, url):
+            self._attach_request_details(method, url, params, json_data)
+            self._attach_response_details(response)
+            self._attach_retries(response)
+            self._dump_exchange(response, expected_status)
+            self._validate_status_code(response, expected_status)
+            self._validate_latency(method, endpoint or urlsplit(url).path, response, latency_budget_ms)
+
+            return response
+
+    def _allure_step(self, method, url):
+        if not self.allure_reporting:
+            return nullcontext()
+        return allure.step(f"Выполнение {method.upper()} запроса на {url}")
+
+    def _build_url(self, endpoint, path_params=None):
+        return f"{self.base_url}{endpoint.format(**path_params) if path_params else endpoint}"
+
+    def _build_request_kwargs(self, params, json_data, kwargs):
+        request_kwargs = kwargs
+        if params:
+            request_kwargs['params'] = params
+        if json_data:
+            request_kwargs['json'] = json_data
+        return request_kwargs
+
+    def _perform_request(self, method, url, request_kwargs, endpoint=None):
+        endpoint = endpoint or urlsplit(url).path
+        response, retries = RETRIES.send(method, endpoint,
+                                         lambda: self._perform_attempt(method, url, request_kwargs, endpoint))
+        response.retries = retries
+        return response
+
+    def _perform_attempt(self, method, url, request_kwargs, endpoint):
+        # Ожидание очереди ограничителя не входит в задержку запроса
+        RATE_LIMITER.acquire(self.base_url, method, endpoint)
+        CONNECT_TIMER.reset()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **request_kwargs)
+        except requests.RequestException:
+            LATENCY.record(method, endpoint, RequestTiming((time.perf_counter() - started) * 1000,
+                                                          connect_ms=CONNECT_TIMER.take()), status=None)
+            raise
+        timing = RequestTiming(total_ms=(time.perf_counter() - started) * 1000,
+                               ttfb_ms=response.elapsed.total_seconds() * 1000, connect_ms=CONNECT_TIMER.take())
+        LATENCY.record(method, endpoint, timing, response.status_code)
+        if response.status_code == 429:
+            RATE_LIMITER.throttled(self.base_url, method, endpoint, response)
+        return ApiResponse(response, timing)
+
     def get(self, endpoint, params=None, **kwargs):
         return self._send_request("GET", endpoint, params=params, **kwargs)
 
@@ -53,91 +118,52 @@ class CustomRequester:
     def _update_session_headers(self, **kwargs):
         self.session.headers.update(kwargs)
 
+    def _dump_exchange(self, response, expected_status):
+        failed = response.status_code != expected_status if expected_status else not response.ok
+        self.log_request_and_response(response, failed)
+
     def _validate_status_code(self, response: requests.Response, expected_status: int):
         if expected_status:
             assert response.status_code == expected_status, \
                 f"Ожидался статус-код {expected_status}, но получен {response.status_code}. " \
                 f"Тело ответа: {response.text}"
 
+    def _validate_latency(self, method, endpoint, response, latency_budget_ms: float | None):
+        SLA.check_request(method, endpoint, getattr(response, "timing", None), latency_budget_ms)
+
     def _attach_request_details(self, method, url, params, json_data):
-        allure.attach(
-            body=f"{method.upper()} {url}",
-            name="Request Line",
-            attachment_type=allure.attachment_type.TEXT
-        )
+        if not self.allure_reporting:
+            return
+        ATTACHMENTS.attach("Request Line", lambda: (f"{method.upper()} {url}", allure.attachment_type.TEXT))
         if params:
-            allure.attach(
-                body=json.dumps(params, indent=4, ensure_ascii=False),
-                name="Query Parameters",
-                attachment_type=allure.attachment_type.JSON
-            )
+            ATTACHMENTS.attach("Query Parameters", lambda: (
+                json.dumps(params, indent=4, ensure_ascii=False), allure.attachment_type.JSON
+            ))
         if json_data:
-            allure.attach(
-                body=json.dumps(json_data, indent=4, ensure_ascii=False),
-                name="Request Body",
-                attachment_type=allure.attachment_type.JSON
-            )
+            ATTACHMENTS.attach("Request Body", lambda: (
+                json.dumps(json_data, indent=4, ensure_ascii=False), allure.attachment_type.JSON
+            ))
 
     def _attach_response_details(self, response):
-        status_code = response.status_code
-        allure.attach(
-            body=str(status_code),
-            name="Response Status Code",
-            attachment_type=allure.attachment_type.TEXT
-        )
+        if not self.allure_reporting:
+            return
+        ATTACHMENTS.attach("Response Status Code", lambda: (str(response.status_code), allure.attachment_type.TEXT))
+        ATTACHMENTS.attach("Response Body", lambda: self._render_response_body(response))
+
+    def _attach_retries(self, response):
+        retries = getattr(response, "retries", None)
+        if not retries or not self.allure_reporting:
+            return
+        allure.dynamic.tag("retried")
+        ATTACHMENTS.attach("Retries", lambda: ("\n".join(retries), allure.attachment_type.TEXT))
+
+    def _render_response_body(self, response):
         try:
-            response_body = json.dumps(response.json(), indent=4, ensure_ascii=False)
-            attachment_type = allure.attachment_type.JSON
+            return json.dumps(response.json(), indent=4, ensure_ascii=False), allure.attachment_type.JSON
         except (json.JSONDecodeError, AttributeError):
-            response_body = response.text
-            attachment_type = allure.attachment_type.TEXT
-
-        allure.attach(
-            body=response_body,
-            name="Response Body",
-            attachment_type=attachment_type
-        )
+            return response.text, allure.attachment_type.TEXT
 
-    def log_request_and_response(self, response):
-        try:
-            request = response.request
-            GREEN = '\033[32m'
-            RED = '\033[31m'
-            RESET = '\033[0m'
-            headers = " \\\n".join([f"-H '{header}: {value}'" for header, value in request.headers.items()])
-            full_test_name = f"pytest {os.environ.get('PYTEST_CURRENT_TEST', '').replace(' (call)', '')}"
-
-            body = ""
-            if hasattr(request, 'body') and request.body is not None:
-                if isinstance(request.body, bytes):
-                    body = request.body.decode('utf-8')
-                body = f"-d '{body}' \n" if body != '{}' else ''
-
-            self.logger.info(f"\n{'=' * 40} REQUEST {'=' * 40}")
-            self.logger.info(
-                f"{GREEN}{full_test_name}{RESET}\n"
-                f"curl -X {request.method} '{request.url}' \\\n"
-                f"{headers} \\\n"
-                f"{body}"
-            )
-
-            response_data = response.text
-            try:
-                response_data = json.dumps(json.loads(response.text), indent=4, ensure_ascii=False)
-            except json.JSONDecodeError:
-                pass
-
-            self.logger.info(f"\n{'=' * 40} RESPONSE {'=' * 40}")
-            if not response.ok:
-                self.logger.info(
-                    f"\tSTATUS_CODE: {RED}{response.status_code}{RESET}\n"
-                    f"\tDATA: {RED}{response_data}{RESET}"
-                )
-            else:
-                self.logger.info(
-                    f"\tSTATUS_CODE: {GREEN}{response.status_code}{RESET}\n"
-                    f"\tDATA:\n{response_data}"
-                )
-            self.logger.info(f"{'=' * 80}\n")
-        except Exception as e:
-            self.logger.error(f"\nLogging failed: {type(e)} - {e}")
+    def log_request_and_response(self, response, failed: bool | None = None):
+        # Сам дамп строится лениво и только в режимах, где он нужен (см. HTTP_DUMP)
+        HTTP_DUMP.dump(self.logger, response, not response.ok if failed is None else failed,
+                       attach=self.allure_reporting)
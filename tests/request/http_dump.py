@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+from enum import Enum
+from typing import Any
+import allure
+import requests
+from tests.request.attachments import ATTACHMENTS
+
+class DumpMode(str, Enum):
+    ALWAYS = "always"
+    ON_FAILURE = "on-failure"
+    OFF = "off"
+
+class HttpDump:
+    # curl-репро запроса и ответ для отладки. Собирается лениво: сообщение рендерится только если логгер
+    # пропускает уровень (и уже в потоке писателя логов), а вложение allure - только при записи вложений.
+    # Секреты (Authorization, cookies, пароли и токены в JSON) замазываются, тела обрезаются.
+
+    REDACTED = "***"
+    redacted_headers = ("authorization", "cookie", "set-cookie")
+    redacted_keys = ("password", "token")
+
+    def __init__(self, mode: DumpMode = DumpMode.ON_FAILURE, max_body_bytes: int = 8 * 1024,
+                 level: int = logging.INFO):
+        self.mode = mode
+        self.max_body_bytes = max_body_bytes
+        self.level = level
+
+    def configure(self, mode: DumpMode, max_body_bytes: int, level: int) -> None:
+        self.mode = mode
+        self.max_body_bytes = max_body_bytes
+        self.level = level
+
+    def dump(self, logger: logging.Logger, response: requests.Response, failed: bool, attach: bool = True) -> None:
+        if self.mode == DumpMode.OFF or (self.mode == DumpMode.ON_FAILURE and not failed):
+            return
+        test_name = os.environ.get("PYTEST_CURRENT_TEST", "").replace(" (call)", "")
+        if logger.isEnabledFor(self.level):
+            logger.log(self.level, "%s", _LazyDump(self, response, test_name))
+        if failed and attach:
+            ATTACHMENTS.attach("curl", lambda: (self.render(response, test_name), allure.attachment_type.TEXT))
+
+    def render(self, response: requests.Response, test_name: str = "") -> str:
+        request = response.request
+        curl = [f"curl -X {request.method} '{request.url}'"]
+        # Content-Length curl посчитает сам: после замазывания тело короче исходного
+        curl += [f"  -H '{header}: {self._header_value(header, value)}'" for header, value in request.headers.items()
+                 if header.lower() != "content-length"]
+        body = self._body(request.body)
+        if body:
+            curl.append(f"  -d '{self._quote(body)}'")
+        title = f"pytest {test_name}\n" if test_name else ""
+        return (f"{'=' * 40} REQUEST {'=' * 40}\n{title}" + " \\\n".join(curl) + "\n"
+                f"{'=' * 40} RESPONSE {'=' * 39}\n"
+                f"STATUS_CODE: {response.status_code}\n"
+                f"DATA:\n{self._body(response.content, pretty=True)}\n{'=' * 89}")
+
+    def _header_value(self, header: str, value: str) -> str:
+        return self.REDACTED if header.lower() in self.redacted_headers else value
+
+    def _body(self, body: bytes | str | None, pretty: bool = False) -> str:
+        if not body:
+            return ""
+        raw = body if isinstance(body, bytes) else body.encode("utf-8")
+        try:
+            data = self._redact(json.loads(raw))
+            text = json.dumps(data, indent=4 if pretty else None, ensure_ascii=False)
+        except ValueError:
+            text = raw.decode("utf-8", errors="replace")
+        encoded = text.encode("utf-8")
+        if len(encoded) <= self.max_body_bytes:
+            return text
+        cut = encoded[:self.max_body_bytes].decode("utf-8", errors="ignore")
+        return f"{cut}\n... [обрезано {len(encoded) - self.max_body_bytes} байт]"
+
+    def _redact(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {key: self.REDACTED if any(marker in key.lower() for marker in self.redacted_keys)
+                    else self._redact(value) for key, value in data.items()}
+        if isinstance(data, list):
+            return [self._redact(item) for item in data]
+        return data
+
+    @staticmethod
+    def _quote(body: str) -> str:
+        return body.replace("'", "'\\''")
+
+class _LazyDump:
+    __slots__ = ("http_dump", "response", "test_name")
+
+    def __init__(self, http_dump: HttpDump, response: requests.Response, test_name: str):
+        self.http_dump = http_dump
+        self.response = response
+        self.test_name = test_name
+
+    def __str__(self) -> str:
+        return self.http_dump.render(self.response, self.test_name)
+
+HTTP_DUMP = HttpDump()
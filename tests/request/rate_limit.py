@@ -0,0 +1,145 @@
+import email.utils
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+import requests
+from tests.constants.log_messages import LogMessages
+from tests.constants.rate_limits import ENDPOINT_LIMITS, HOST_LIMITS
+from tests.utils.file_lock import file_lock
+from tests.utils.log_pipeline import LazyMessage
+from tests.utils.session_report import SESSION_REPORT
+
+class TokenBucket:
+    # Состояние корзины лежит в файле и меняется под file_lock, поэтому темп общий для всех воркеров xdist.
+    # Токен резервируется сразу (счетчик может уйти в минус), а ждать своей очереди запрос будет уже без
+    # блокировки - так воркеры выстраиваются в равномерный поток вместо пачек.
+
+    def __init__(self, key: str, rate: float, burst: float, storage_dir: Path,
+                 clock: Callable[[], float] = time.time):
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        # Время стенное, а не monotonic: состояние корзины общее для процессов
+        self.clock = clock
+        self.path = Path(storage_dir) / f"bucket_{hashlib.sha256(key.encode()).hexdigest()[:16]}.json"
+
+    def reserve(self) -> float:
+        with file_lock(self.path.with_suffix(".lock")):
+            now = self.clock()
+            state = self._load(now)
+            # После 429 updated стоит в будущем: корзина начнет пополняться только с конца паузы
+            refill = max(now - state["updated"], 0) * self.rate
+            state["tokens"] = min(self.burst, state["tokens"] + refill) - 1
+            state["updated"] = max(state["updated"], now)
+            self._save(state)
+        wait = max(state["blocked_until"] - now, 0)
+        return wait + max(-state["tokens"], 0) / self.rate
+
+    def block(self, seconds: float) -> None:
+        # 429 с Retry-After: до этого момента корзина пуста для всех процессов
+        with file_lock(self.path.with_suffix(".lock")):
+            now = self.clock()
+            state = self._load(now)
+            state["blocked_until"] = max(state["blocked_until"], now + seconds)
+            state["tokens"] = min(state["tokens"], 0)
+            state["updated"] = max(state["updated"], now + seconds)
+            self._save(state)
+
+    def _load(self, now: float) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"tokens": self.burst, "updated": now, "blocked_until": 0}
+
+    def _save(self, state: dict) -> None:
+        self.path.write_text(json.dumps(state), encoding="utf-8")
+
+class RateLimiter:
+    # Лимиты по хосту и по эндпоинту из tests/constants/rate_limits.py; хосты без лимита (локальный стенд)
+    # не ограничиваются. По умолчанию выключен - включает conftest для прогонов против dev-стенда.
+
+    default_retry_after_s = 1.0
+    max_retry_after_s = 60.0
+
+    def __init__(self, host_limits: dict[str, tuple[float, float]] = HOST_LIMITS,
+                 endpoint_limits: dict[str, tuple[float, float]] = ENDPOINT_LIMITS,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.time,
+                 section: str = "rate_limit"):
+        self.host_limits = host_limits
+        self.endpoint_limits = endpoint_limits
+        self.sleep = sleep
+        self.clock = clock
+        self.section = section
+        self.enabled = False
+        self.storage_dir: Path | None = None
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def configure(self, enabled: bool, storage_dir: Path | None = None) -> None:
+        with self._lock:
+            self.enabled = enabled and storage_dir is not None
+            self.storage_dir = storage_dir
+            self._buckets.clear()
+        if storage_dir is not None:
+            Path(storage_dir).mkdir(parents=True, exist_ok=True)
+
+    def acquire(self, host: str, method: str, endpoint: str) -> float:
+        buckets = self._buckets_for(host, method, endpoint)
+        if not buckets:
+            return 0.0
+        # Токен берется во всех подходящих корзинах, а ждать приходится до самой поздней очереди
+        waits = {bucket.key: bucket.reserve() for bucket in buckets}
+        wait = max(waits.values())
+        if wait > 0:
+            self.sleep(wait)
+        SESSION_REPORT.add(self.section, {
+            "requests": 1, "waited_requests": int(wait > 0), "waited_s": wait,
+            "by_bucket": {key: {"requests": 1, "waited_s": bucket_wait} for key, bucket_wait in waits.items()},
+        })
+        return wait
+
+    def throttled(self, host: str, method: str, endpoint: str, response: requests.Response) -> None:
+        buckets = self._buckets_for(host, method, endpoint)
+        if not buckets:
+            return
+        retry_after = self.retry_after(response)
+        self.logger.warning(LazyMessage(LogMessages.RateLimit.THROTTLED, method, endpoint, retry_after))
+        for bucket in buckets:
+            bucket.block(retry_after)
+        SESSION_REPORT.add(self.section, {"throttled": 1})
+
+    def retry_after(self, response: requests.Response) -> float:
+        # Retry-After бывает числом секунд или HTTP-датой
+        value = response.headers.get("Retry-After")
+        if not value:
+            return self.default_retry_after_s
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = email.utils.parsedate_to_datetime(value).timestamp() - self.clock()
+            except (TypeError, ValueError):
+                return self.default_retry_after_s
+        return min(max(seconds, 0), self.max_retry_after_s)
+
+    def _buckets_for(self, host: str, method: str, endpoint: str) -> list[TokenBucket]:
+        if not self.enabled:
+            return []
+        keys = [(host, self.host_limits.get(host)), (f"{method} {endpoint}", self.endpoint_limits.get(f"{method} {endpoint}"))]
+        with self._lock:
+            buckets = []
+            for key, limit in keys:
+                if limit is None:
+                    continue
+                if key not in self._buckets:
+                    self._buckets[key] = TokenBucket(key, *limit, storage_dir=self.storage_dir,
+                                                     clock=self.clock)
+                buckets.append(self._buckets[key])
+            return buckets
+
+RATE_LIMITER = RateLimiter()
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+from pydantic import BaseModel
+from tests.utils.session_report import SESSION_REPORT
+
+class ResponseCache:
+    # Read-through кэш моделей успешных GET ответов с TTL и LRU. У записи есть теги (movie:<id>, movies:list),
+    # запись через API сбрасывает свои теги. Кэш живет в процессе: изменения, сделанные другими воркерами
+    # xdist, становятся видны по истечении TTL. По умолчанию выключен - включает conftest.
+
+    default_ttl_s = 30.0
+    default_max_entries = 256
+
+    def __init__(self, section: str, ttl_s: float = default_ttl_s, max_entries: int = default_max_entries,
+                 clock: Callable[[], float] = time.monotonic):
+        self.section = section
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.clock = clock
+        self.enabled = False
+        # Тест с маркером fresh_data или sla: все чтения идут в сеть, но запись по-прежнему сбрасывает кэш
+        self.bypass = False
+        self._entries: OrderedDict[Hashable, tuple[float, BaseModel, frozenset[str]]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, ttl_s: float | None = None, max_entries: int | None = None) -> None:
+        with self._lock:
+            self.enabled = enabled
+            self.ttl_s = self.ttl_s if ttl_s is None else ttl_s
+            self.max_entries = self.max_entries if max_entries is None else max_entries
+            self._entries.clear()
+            self._generation += 1
+
+    def get_or_fetch(self, key: Hashable, tags: tuple[str, ...], fetch: Callable[[], BaseModel],
+                     cacheable: Callable[[BaseModel], bool]) -> tuple[BaseModel, bool]:
+        # Возвращает модель и признак попадания в кэш. Отдается копия: тест может менять полученную модель
+        if not self.enabled or self.bypass:
+            return fetch(), False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+                SESSION_REPORT.add(self.section, {"expired": 1})
+            if entry is not None:
+                self._entries.move_to_end(key)
+            generation = self._generation
+        if entry is not None:
+            SESSION_REPORT.add(self.section, {"hits": 1})
+            return entry[1].model_copy(deep=True), True
+
+        SESSION_REPORT.add(self.section, {"misses": 1})
+        value = fetch()
+        if cacheable(value):
+            self._put(key, value, frozenset(tags), generation)
+        return value, False
+
+    def invalidate(self, *tags: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            # Запрос, начатый до инвалидации, мог прочитать старые данные - такой ответ в кэш уже не попадет
+            self._generation += 1
+            stale = [key for key, (_, _, entry_tags) in self._entries.items() if entry_tags & set(tags)]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            SESSION_REPORT.add(self.section, {"invalidated": len(stale)})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _put(self, key: Hashable, value: BaseModel, tags: frozenset[str], generation: int) -> None:
+        evicted = 0
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (self.clock() + self.ttl_s, value.model_copy(deep=True), tags)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            SESSION_REPORT.add(self.section, {"evicted": evicted})
+
+MOVIES_CACHE = ResponseCache("movies_cache")
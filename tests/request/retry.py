@@ -0,0 +1,138 @@
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+import requests
+from tests.constants.log_messages import LogMessages
+from tests.request.rate_limit import RATE_LIMITER
+from tests.utils.file_lock import file_lock
+from tests.utils.log_pipeline import LazyMessage
+from tests.utils.session_report import SESSION_REPORT
+
+class RetryPolicy:
+    # Повторы идемпотентных запросов при обрыве соединения и временных 5xx стенда (и любых - при 429):
+    # экспоненциальная пауза с полным джиттером и общий на прогон бюджет повторов, чтобы лежащий бэкенд
+    # не удваивал время прогона. Счетчик бюджета лежит в файле под file_lock, как корзины RateLimiter,
+    # и общий для всех воркеров xdist; без storage_dir он считается в процессе. По умолчанию повторов нет - их включает conftest; перф-инструменты меряют без них.
+
+    idempotent_methods = ("GET", "HEAD", "OPTIONS")
+    statuses = (502, 503, 504)
+    # DELETE повторяем, только если запрос точно не дошел до приложения: иначе повтор вернет 404
+    # на уже удаленный объект
+    delete_statuses = (503,)
+    # 429 стенд отдает до обработки запроса, поэтому повторяем любой метод - после паузы из Retry-After
+    throttled_statuses = (429,)
+    backoff_base_s = 0.2
+    backoff_max_s = 2.0
+
+    def __init__(self, max_attempts: int = 1, budget: int = 0, sleep: Callable[[float], None] = time.sleep,
+                 section: str = "retries"):
+        self.section = section
+        self.max_attempts = max_attempts
+        self.budget = budget
+        self.sleep = sleep
+        self.storage_dir: Path | None = None
+        self._spent = 0
+        self._budget_warned = False
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def configure(self, max_attempts: int, budget: int, storage_dir: Path | None = None) -> None:
+        with self._lock:
+            self.max_attempts = max_attempts
+            self.budget = budget
+            self.storage_dir = storage_dir
+            self._spent = 0
+            self._budget_warned = False
+        if storage_dir is not None:
+            Path(storage_dir).mkdir(parents=True, exist_ok=True)
+
+    def send(self, method: str, endpoint: str,
+             perform: Callable[[], requests.Response]) -> tuple[requests.Response, list[str]]:
+        # Возвращает последний ответ и историю неудачных попыток; исключение последней попытки пробрасывается
+        history = []
+        attempt = 1
+        while True:
+            response = None
+            try:
+                response = perform()
+                reason = f"HTTP {response.status_code}" if self._retryable_status(method, response) else None
+            except requests.ConnectionError as e:
+                if attempt >= self.max_attempts or not self._retryable_error(method, e) or not self._acquire():
+                    self._report(method, endpoint, history, recovered=False)
+                    raise
+                reason = type(e).__name__
+            else:
+                if reason is None or attempt >= self.max_attempts or not self._acquire():
+                    self._report(method, endpoint, history, recovered=reason is None)
+                    return response, history
+            delay = self._delay(attempt, response)
+            history.append(LogMessages.Retry.ATTEMPT_FAILED.format(attempt, reason, delay * 1000))
+            self.logger.warning(LazyMessage(LogMessages.Retry.RETRYING, method, endpoint, attempt, reason,
+                                            delay * 1000))
+            self.sleep(delay)
+            attempt += 1
+
+    def _delay(self, attempt: int, response: requests.Response | None) -> float:
+        if response is not None and response.status_code in self.throttled_statuses:
+            return RATE_LIMITER.retry_after(response)
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1)))
+
+    def _retryable_status(self, method: str, response: requests.Response) -> bool:
+        if response.status_code in self.throttled_statuses:
+            return True
+        if method == "DELETE":
+            return response.status_code in self.delete_statuses
+        return method in self.idempotent_methods and response.status_code in self.statuses
+
+    def _retryable_error(self, method: str, error: requests.ConnectionError) -> bool:
+        if method == "DELETE":
+            # Соединение не установилось - запрос не отправлен
+            return isinstance(error, requests.ConnectTimeout) or "NewConnectionError" in repr(error)
+        return method in self.idempotent_methods
+
+    def _acquire(self) -> bool:
+        with self._budget_state() as state:
+            granted = state["spent"] < self.budget
+            if granted:
+                state["spent"] += 1
+            # Предупреждение одно на прогон, а не на каждый воркер
+            warn = not granted and not state["warned"]
+            state["warned"] = state["warned"] or warn
+        if warn:
+            self.logger.warning(LazyMessage(LogMessages.Retry.BUDGET_EXHAUSTED, self.budget))
+            SESSION_REPORT.add(self.section, {"budget_exhausted": True})
+        return granted
+
+    @contextmanager
+    def _budget_state(self) -> Iterator[dict]:
+        if self.storage_dir is None:
+            with self._lock:
+                state = {"spent": self._spent, "warned": self._budget_warned}
+                yield state
+                self._spent, self._budget_warned = state["spent"], state["warned"]
+            return
+        path = Path(self.storage_dir) / "budget.json"
+        with file_lock(path.with_suffix(".lock")):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                state = {"spent": 0, "warned": False}
+            yield state
+            path.write_text(json.dumps(state), encoding="utf-8")
+
+    def _report(self, method: str, endpoint: str, history: list[str], recovered: bool) -> None:
+        if not history:
+            return
+        SESSION_REPORT.add(self.section, {
+            "requests": 1,
+            "retries": len(history),
+            "recovered": int(recovered),
+            "by_endpoint": {f"{method} {endpoint}": len(history)},
+        })
+
+RETRIES = RetryPolicy()
@@ -0,0 +1,57 @@
+import threading
+import time
+from typing import NamedTuple
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+class RequestTiming(NamedTuple):
+    total_ms: float
+    ttfb_ms: float | None = None
+    # DNS + TCP (+ TLS) - только если для запроса открывалось новое соединение
+    connect_ms: float | None = None
+
+class ConnectTimer:
+    # Соединение открывается внутри session.request в том же потоке, что и запрос,
+    # поэтому время установки соединения копится в thread-local и забирается после ответа
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        self._local.elapsed_ms = None
+
+    def add(self, elapsed_ms: float) -> None:
+        self._local.elapsed_ms = (getattr(self._local, "elapsed_ms", None) or 0) + elapsed_ms
+
+    def take(self) -> float | None:
+        elapsed_ms = getattr(self._local, "elapsed_ms", None)
+        self._local.elapsed_ms = None
+        return elapsed_ms
+
+CONNECT_TIMER = ConnectTimer()
+
+class TimedHTTPConnection(HTTPConnection):
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            CONNECT_TIMER.add((time.perf_counter() - started) * 1000)
+
+class TimedHTTPSConnection(HTTPSConnection):
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            CONNECT_TIMER.add((time.perf_counter() - started) * 1000)
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+TIMED_POOL_CLASSES = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
@@ -0,0 +1,154 @@
+import http.client
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from tests.clients.api_manager import ApiManager
+from tests.clients.async_api_manager import AsyncApiManager
+from tests.constants.endpoints import BASE_URL, BASE_AUTH_URL, BASE_UI_URL
+from tests.request.timing import TIMED_POOL_CLASSES
+
+def build_response(request: requests.PreparedRequest, status: int, content: bytes, headers: dict[str, str],
+                   set_cookies: tuple[str, ...] | list[str] = (), reason: str | None = None) -> requests.Response:
+    # Ответ для адаптеров без сети (фейковый бэкенд, кассеты) собирается так же, как его собрал бы HTTPAdapter
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason if reason is not None else http.client.responses.get(status, "")
+    response.url = request.url
+    response.request = request
+    response._content = content
+    response.headers = CaseInsensitiveDict({**headers, "Content-Length": str(len(content))})
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    # extract_cookies_to_jar читает Set-Cookie из raw._original_response.msg, как у urllib3
+    message = http.client.HTTPMessage()
+    for cookie in set_cookies:
+        message["Set-Cookie"] = cookie
+    response.raw = SimpleNamespace(_original_response=SimpleNamespace(msg=message))
+    extract_cookies_to_jar(response.cookies, request, response.raw)
+    return response
+
+class PooledHTTPAdapter(HTTPAdapter):
+    # Один экземпляр адаптера монтируется во все сессии фабрики, поэтому пул соединений общий,
+    # а заголовки, cookies и авторизация остаются у каждой сессии своими.
+
+    def __init__(self, pool_maxsize: int, max_retries: Retry | int = 0):
+        self._stats_lock = threading.Lock()
+        self._disposed_stats = {"opened": 0, "requests": 0}
+        super().__init__(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=max_retries)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Соединения засекают время установки (DNS + TCP + TLS) для отчета о задержках
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def _dispose(pool):
+            self._collect_stats(pool, self._disposed_stats)
+            if dispose:
+                dispose(pool)
+
+        pools.dispose_func = _dispose
+
+    def close(self):
+        # Сессии закрываются тестами, а пул живет до конца прогона - закрывает его только фабрика
+        pass
+
+    def shutdown(self):
+        super().close()
+
+    def connection_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._disposed_stats)
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                self._collect_stats(pool, stats)
+        stats["reused"] = max(stats["requests"] - stats["opened"], 0)
+        return stats
+
+    def _collect_stats(self, pool, stats: dict) -> None:
+        with self._stats_lock:
+            stats["opened"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+
+class TransportFactory:
+
+    default_pool_maxsize = 10
+    connect_retries = 2
+    warmup_timeout = 5
+
+    def __init__(self, pool_sizes: dict[str, int] | None = None, pool_maxsize: int | None = None,
+                 base_urls: tuple[str, ...] = (BASE_URL, BASE_AUTH_URL, BASE_UI_URL)):
+        pool_sizes = pool_sizes or {}
+        pool_maxsize = pool_maxsize or self.default_pool_maxsize
+        self.pool_maxsize = pool_maxsize
+        self.base_urls = base_urls
+        self._adapters = {
+            base_url: PooledHTTPAdapter(pool_sizes.get(base_url, pool_maxsize), self._retry_policy())
+            for base_url in base_urls
+        }
+        self._default_adapter = PooledHTTPAdapter(pool_maxsize, self._retry_policy())
+        self._mounted: dict[str, BaseAdapter] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _retry_policy(self) -> Retry:
+        # Повторяем только установку соединения: запрос еще не ушел, так что это безопасно для любого метода
+        return Retry(total=self.connect_retries, connect=self.connect_retries, read=0, status=0,
+                     other=0, redirect=False, raise_on_status=False)
+
+    def new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.mount("http://", self._default_adapter)
+        session.mount("https://", self._default_adapter)
+        for base_url, adapter in (*self._adapters.items(), *self._mounted.items()):
+            session.mount(base_url, adapter)
+        return session
+
+    def adapter_for(self, base_url: str) -> BaseAdapter:
+        return self._mounted.get(base_url) or self._adapters.get(base_url) or self._default_adapter
+
+    def mount(self, base_url: str, adapter: BaseAdapter) -> None:
+        # Подменяет транспорт для хоста во всех новых сессиях (фейковый бэкенд, запись/воспроизведение)
+        self._mounted[base_url] = adapter
+
+    def api_manager(self, base_url: str = BASE_URL, base_auth_url: str = BASE_AUTH_URL) -> ApiManager:
+        return ApiManager(self.new_session(), base_url=base_url, base_auth_url=base_auth_url)
+
+    def async_api_manager(self, base_url: str = BASE_URL, base_auth_url: str = BASE_AUTH_URL,
+                          max_concurrency: int | None = None, allure_reporting: bool = True) -> AsyncApiManager:
+        # Больше параллельных запросов, чем соединений в пуле, не даст выигрыша - лишние соединения будут отброшены.
+        # Это же число задает и размер пула потоков, и лимит gather
+        return AsyncApiManager(self.new_session(), base_url=base_url, base_auth_url=base_auth_url,
+                               max_concurrency=min(max_concurrency or self.pool_maxsize, self.pool_maxsize),
+                               allure_reporting=allure_reporting)
+
+    def warm_up(self) -> None:
+        session = self.new_session()
+        base_urls = [base_url for base_url in self.base_urls if base_url not in self._mounted]
+        with ThreadPoolExecutor(max_workers=len(base_urls) or 1) as executor:
+            list(executor.map(lambda url: self._warm_up_url(session, url), base_urls))
+
+    def _warm_up_url(self, session: requests.Session, url: str) -> None:
+        try:
+            session.head(url, timeout=self.warmup_timeout, allow_redirects=False)
+            self.logger.info("Соединение с %s прогрето", url)
+        except requests.RequestException as e:
+            self.logger.warning("Не удалось прогреть соединение с %s: %s", url, e)
+
+    def stats(self) -> dict[str, dict]:
+        stats = {base_url: adapter.connection_stats() for base_url, adapter in self._adapters.items()}
+        stats["other"] = self._default_adapter.connection_stats()
+        return stats
+
+    def close(self) -> None:
+        for adapter in (*self._adapters.values(), self._default_adapter):
+            adapter.shutdown()
+        for adapter in self._mounted.values():
+            adapter.close()
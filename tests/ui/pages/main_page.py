@@ -1,5 +1,6 @@
 import re
-from playwright.sync_api import Page, expect, Locator
+from playwright.sync_api import Page, expect, Locator, TimeoutError as PlaywrightTimeoutError
+from tests.constants.timeouts import Timeout
 from tests.ui.pages.base_page import BasePage
 
 
@@ -10,10 +11,18 @@ class MainPage(BasePage):
         self.movie_cards: Locator = page.locator(".rounded-xl.border.bg-card:has(a[data-qa-id='more_button'])")
         self.show_more_button: Locator = page.get_by_role("button", name="Показать еще")
         self.all_movies_link: Locator = page.get_by_role("link", name="Все фильмы")
+        self.profile_button: Locator = page.get_by_role("button", name="Профиль")
 
     def open(self):
         super().open("/")
 
+    def is_user_logged_in(self) -> bool:
+        try:
+            self.profile_button.wait_for(state="visible", timeout=Timeout.FIVE_SECONDS.value)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
     def check_last_movies_title_is_visible(self):
         expect(self.last_movies_title).to_be_visible()
 
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from playwright.sync_api import BrowserContext, Error as PlaywrightError, Request, Route
+from tests.models.routing_models import RouteAction, RoutingPolicy
+
+# Прозрачный GIF 1x1: картинки-заглушки не ломают верстку и не тянут байты
+TRANSPARENT_GIF = bytes.fromhex("47494638396101000100800000000000ffffff21f90401000000002c00000000010001000002024401003b")
+
+STUBS = {
+    "image": ("image/gif", TRANSPARENT_GIF),
+    "script": ("application/javascript", b""),
+    "stylesheet": ("text/css", b""),
+}
+
+class AssetCache:
+    # Дисковый кэш статики фронтенда, общий для воркеров xdist: запись атомарная через временный файл,
+    # а размеры ответов запоминаются, чтобы оценивать трафик, сэкономленный блокировкой
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, url: str) -> tuple[int, dict[str, str], bytes] | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return meta["status"], meta["headers"], body_path.read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        meta_path, body_path = self._paths(url)
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps({"url": url, "status": status, "headers": headers,
+                                           "size": len(body)}).encode("utf-8"))
+
+    def remember_size(self, url: str, size: int) -> None:
+        self._write(self._paths(url)[0], json.dumps({"url": url, "size": size}).encode("utf-8"))
+
+    def known_size(self, url: str) -> int | None:
+        try:
+            return json.loads(self._paths(url)[0].read_text(encoding="utf-8"))["size"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    @staticmethod
+    def _write(path: Path, content: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{id(content)}.tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+
+class RouteStats:
+
+    def __init__(self):
+        self.requests = 0
+        self.blocked = 0
+        self.stubbed = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_saved = 0
+        # Заблокированные ресурсы, размер которых еще неизвестен: в bytes_saved они не учтены
+        self.unknown_size = 0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.blocked + self.stubbed + self.cache_hits
+
+    def as_dict(self) -> dict[str, int]:
+        return {"requests": self.requests, "requests_saved": self.requests_saved, "blocked": self.blocked,
+                "stubbed": self.stubbed, "cache_hits": self.cache_hits, "cache_misses": self.cache_misses,
+                "bytes_saved": self.bytes_saved, "unknown_size": self.unknown_size}
+
+class UiRouter:
+    # Перехватывает все запросы браузерного контекста и применяет RoutingPolicy.
+    # Обработчики вызываются в потоке теста (sync API Playwright), поэтому счетчики без блокировок.
+
+    sized_types = ("image", "font", "media", "script", "stylesheet")
+
+    def __init__(self, policy: RoutingPolicy, cache: AssetCache | None = None):
+        self.policy = policy
+        self.cache = cache
+        self.stats = RouteStats()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def install(self, context: BrowserContext) -> BrowserContext:
+        if self.cache is not None:
+            # Тесты с настоящими ассетами заодно запоминают их размеры для оценки экономии в остальных
+            context.on("requestfinished", self._remember_size)
+        if self.policy.enabled:
+            context.route("**/*", self._handle)
+        return context
+
+    def _handle(self, route: Route, request: Request) -> None:
+        self.stats.requests += 1
+        action = self.policy.action_for(request.resource_type, request.url)
+        try:
+            if action == RouteAction.BLOCK:
+                self._count_saved(request.url, "blocked")
+                route.abort("blockedbyclient")
+            elif action == RouteAction.STUB:
+                self._count_saved(request.url, "stubbed")
+                content_type, body = STUBS.get(request.resource_type, ("text/plain", b""))
+                route.fulfill(status=200, content_type=content_type, body=body)
+            elif action == RouteAction.CACHE and self.cache is not None and request.method == "GET":
+                self._serve_cached(route, request)
+            else:
+                route.fallback()
+        except PlaywrightError as e:
+            # Страница могла закрыться, пока запрос был в обработке
+            self.logger.debug("Не удалось обработать запрос %s: %s", request.url, e)
+
+    def _serve_cached(self, route: Route, request: Request) -> None:
+        cached = self.cache.get(request.url)
+        if cached is not None:
+            status, headers, body = cached
+            self.stats.cache_hits += 1
+            self.stats.bytes_saved += len(body)
+            route.fulfill(status=status, headers=headers, body=body)
+            return
+        response = route.fetch()
+        body = response.body()
+        self.stats.cache_misses += 1
+        if response.status == 200:
+            self.cache.put(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    def _remember_size(self, request: Request) -> None:
+        if request.resource_type not in self.sized_types:
+            return
+        if self.policy.action_for(request.resource_type, request.url) != RouteAction.ALLOW:
+            return
+        if self.cache.known_size(request.url) is not None:
+            return
+        try:
+            size = request.sizes()["responseBodySize"]
+        except PlaywrightError:
+            return
+        if size > 0:
+            self.cache.remember_size(request.url, size)
+
+    def _count_saved(self, url: str, counter: str) -> None:
+        setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+        size = self.cache.known_size(url) if self.cache is not None else None
+        if size is None:
+            self.stats.unknown_size += 1
+        else:
+            self.stats.bytes_saved += size
@@ -0,0 +1,121 @@
+import io
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+import allure
+from playwright.sync_api import Page
+from tests.constants.log_messages import LogMessages
+from tests.utils.log_pipeline import LazyMessage
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+class ScreenshotFormat(str, Enum):
+    PNG = "png"
+    JPEG = "jpeg"
+    WEBP = "webp"
+
+MIME_TYPES = {
+    ScreenshotFormat.PNG: ("image/png", "png"),
+    ScreenshotFormat.JPEG: ("image/jpeg", "jpg"),
+    ScreenshotFormat.WEBP: ("image/webp", "webp"),
+}
+
+class FailureScreenshots:
+    # Скриншот снимается в потоке теста (sync API Playwright не потокобезопасен), а перекодирование в WebP
+    # уходит в фоновый поток и идет параллельно с teardown фикстур. Готовое тело прикладывается в allure
+    # публичным allure.attach в teardown того же теста: после него вложение к тесту уже не добавить, поэтому
+    # для WebP teardown дожидается остатка перекодирования (до ~250 мс на 1280x720). JPEG и PNG не
+    # перекодируются и не ждут. Без --alluredir файл пишется в logs/screenshots фоновым потоком.
+
+    fallback_dir = Path("logs") / "screenshots"
+
+    def __init__(self, image_format: ScreenshotFormat = ScreenshotFormat.JPEG, quality: int = 80,
+                 full_page: bool = False, attach_to_allure: bool = True):
+        self.image_format = image_format
+        self.quality = quality
+        self.full_page = full_page
+        self.attach_to_allure = attach_to_allure
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: list[tuple[str, Future]] = []
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def configure(self, image_format: ScreenshotFormat, quality: int, full_page: bool,
+                  attach_to_allure: bool) -> None:
+        if image_format == ScreenshotFormat.WEBP and Image is None:
+            self.logger.warning(LogMessages.Ui.WEBP_UNAVAILABLE)
+            image_format = ScreenshotFormat.JPEG
+        self.image_format = image_format
+        self.quality = quality
+        self.full_page = full_page
+        self.attach_to_allure = attach_to_allure
+
+    def capture(self, page: Page, name: str) -> None:
+        if self.image_format == ScreenshotFormat.JPEG:
+            # JPEG кодирует сам браузер, перекодировать в фоне нечего
+            raw = page.screenshot(type="jpeg", quality=self.quality, full_page=self.full_page)
+        else:
+            raw = page.screenshot(type="png", full_page=self.full_page)
+        if self.image_format == ScreenshotFormat.WEBP:
+            future = self._submit(self._encode, raw)
+        else:
+            future = Future()
+            future.set_result(raw)
+        with self._lock:
+            self._pending.append((name, future))
+
+    def attach_pending(self) -> None:
+        # Вызывается из teardown теста: пока тест не закрыт, вложение попадает именно в него
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for name, future in pending:
+            mime_type, extension = MIME_TYPES[self.image_format]
+            try:
+                body = future.result()
+            except Exception as e:
+                self.logger.error(LazyMessage(LogMessages.Ui.SCREENSHOT_FAILED, name, e))
+                continue
+            if self.attach_to_allure:
+                allure.attach(body, name=name, attachment_type=mime_type, extension=extension)
+            else:
+                target = self.fallback_dir / f"{name}.{extension}"
+                self._submit(self._write, body, target).add_done_callback(
+                    lambda done, target=target: self._log_failure(done, target))
+
+    def wait(self) -> None:
+        # Скриншоты, не приложенные к тесту (например, сессия прервана), сохраняются в logs/screenshots
+        self.attach_to_allure = False
+        self.attach_pending()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _submit(self, function, *args) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="failure-screenshots")
+            return self._executor.submit(function, *args)
+
+    @staticmethod
+    def _write(body: bytes, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.tmp")
+        tmp_path.write_bytes(body)
+        tmp_path.replace(target)
+
+    def _encode(self, raw: bytes) -> bytes:
+        encoded = io.BytesIO()
+        Image.open(io.BytesIO(raw)).save(encoded, format="WEBP", quality=self.quality)
+        return encoded.getvalue()
+
+    def _log_failure(self, future: Future, target: Path) -> None:
+        if future.exception() is not None:
+            self.logger.error(LazyMessage(LogMessages.Ui.SCREENSHOT_FAILED, target, future.exception()))
+
+SCREENSHOTS = FailureScreenshots()
@@ -3,7 +3,6 @@ import pytest
 from playwright.sync_api import Page, expect
 from tests.constants.endpoints import CARD_NUMBER, HOLDER_NAME, EXP_MONTH, EXP_YEAR, CVC
 from tests.models.request_models import UserCreate
-from tests.ui.pages.login_page import LoginPage
 from tests.ui.pages.main_page import MainPage
 from tests.ui.pages.payment_page import PaymentPage
 from tests.ui.pages.payment_success_page import PaymentSuccessPage
@@ -15,21 +14,16 @@ from tests.utils.decorators import allure_test_details
 class TestPaymentPage:
 
     @pytest.fixture(autouse=True)
-    def setup_and_teardown(self, page: Page, registered_user_by_api_ui: UserCreate):
+    def setup_and_teardown(self, authenticated_page: Page, ui_user: UserCreate):
+        # Браузерный контекст уже авторизован сохраненным storage_state пользователя, созданного через API
+        self.user = ui_user
         with allure.step("Подготовка: получить данные о фильме с главной страницы"):
-            main_page = MainPage(page)
+            main_page = MainPage(authenticated_page)
             main_page.open()
             self.movie = main_page.get_first_movie_details()
 
-        with allure.step("Подготовка: залогиниться пользователем, созданным через API"):
-            self.user = registered_user_by_api_ui
-            login_page = LoginPage(page)
-            login_page.open()
-            login_page.login(self.user, self.user.password)
-            login_page.check_user_is_logged_in()
-
         with allure.step("Подготовка: перейти на страницу оплаты для выбранного фильма"):
-            self.payment_page = PaymentPage(page)
+            self.payment_page = PaymentPage(authenticated_page)
             self.payment_page.open(self.movie["id"])
         yield
 
@@ -39,7 +33,7 @@ class TestPaymentPage:
         description="Проверка, что на странице оплаты корректно отображаются название фильма и его цена.",
         severity=allure.severity_level.NORMAL
     )
-    def test_movie_title_and_price_are_visible(self, page: Page):
+    def test_movie_title_and_price_are_visible(self, authenticated_page: Page):
         with allure.step("Проверить видимость названия фильма"):
             self.payment_page.check_movie_title_is_visible(self.movie["title"])
         with allure.step("Проверить видимость цены"):
@@ -51,7 +45,7 @@ class TestPaymentPage:
         description="Проверка, что при попытке отправить пустую форму оплаты появляется сообщение об ошибке.",
         severity=allure.severity_level.NORMAL
     )
-    def test_payment_form_is_not_submitted_with_empty_fields(self, page: Page):
+    def test_payment_form_is_not_submitted_with_empty_fields(self, authenticated_page: Page):
         with allure.step("Отправить пустую форму оплаты"):
             self.payment_page.submit_payment()
         with allure.step("Проверить появление сообщения о валидации"):
@@ -70,7 +64,7 @@ class TestPaymentPage:
         """,
         severity=allure.severity_level.CRITICAL
     )
-    def test_successful_payment(self, page: Page):
+    def test_successful_payment(self, authenticated_page: Page):
         with allure.step("Заполнить и отправить платежную форму"):
             self.payment_page.fill_payment_details(
                 card_number=CARD_NUMBER,
@@ -82,5 +76,5 @@ class TestPaymentPage:
             self.payment_page.submit_payment()
 
         with allure.step("Проверить сообщение об успешной оплате"):
-            payment_success_page = PaymentSuccessPage(page)
+            payment_success_page = PaymentSuccessPage(authenticated_page)
             payment_success_page.check_success_message_is_visible() 
\ No newline at end of file
@@ -0,0 +1,86 @@
+import logging
+import re
+import time
+from pathlib import Path
+from playwright.sync_api import BrowserContext, Error as PlaywrightError
+from tests.constants.log_messages import LogMessages
+from tests.utils.file_lock import file_lock
+from tests.utils.log_pipeline import LazyMessage
+
+class TraceStore:
+    # Каталог сохраненных трейсов: лимит на один трейс и ротация по числу файлов, общему объему и возрасту.
+    # Каталог общий для воркеров xdist, поэтому чистка идет под файловой блокировкой.
+
+    default_max_trace_mb = 50
+    default_keep = 20
+    default_max_total_mb = 500
+    default_max_age_days = 7
+
+    def __init__(self, directory: Path, max_trace_mb: float = default_max_trace_mb, keep: int = default_keep,
+                 max_total_mb: float = default_max_total_mb, max_age_days: float = default_max_age_days):
+        self.directory = Path(directory)
+        self.max_trace_mb = max_trace_mb
+        self.keep = keep
+        self.max_total_mb = max_total_mb
+        self.max_age_days = max_age_days
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def path_for(self, nodeid: str, index: int = 0) -> Path:
+        slug = re.sub(r"[^\w.-]+", "_", nodeid).strip("_")[-120:]
+        suffix = f"_{index}" if index else ""
+        return self.directory / f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}{suffix}.zip"
+
+    def accept(self, path: Path, nodeid: str) -> bool:
+        size_mb = path.stat().st_size / 1024 / 1024
+        if size_mb > self.max_trace_mb:
+            path.unlink(missing_ok=True)
+            self.logger.warning(LazyMessage(LogMessages.Ui.TRACE_TOO_LARGE, nodeid, size_mb, self.max_trace_mb))
+            return False
+        self.logger.info(LazyMessage(LogMessages.Ui.TRACE_SAVED, nodeid, path, size_mb))
+        self.prune()
+        return True
+
+    def prune(self) -> None:
+        with file_lock(self.directory / ".lock"):
+            traces = sorted(self.directory.glob("*.zip"), key=lambda trace: trace.stat().st_mtime, reverse=True)
+            oldest_allowed = time.time() - self.max_age_days * 24 * 3600
+            total_bytes = 0
+            for position, trace in enumerate(traces):
+                stat = trace.stat()
+                total_bytes += stat.st_size
+                if position >= self.keep or total_bytes > self.max_total_mb * 1024 * 1024 \
+                        or stat.st_mtime < oldest_allowed:
+                    trace.unlink(missing_ok=True)
+
+class TraceRecorder:
+    # Трейсы контекстов одного теста. Пока тест идет, Playwright копит их во временном каталоге драйвера;
+    # экспорт в zip - самая дорогая часть - делается только для упавшего теста, у прошедшего трейс отбрасывается.
+
+    def __init__(self, store: TraceStore, nodeid: str):
+        self.store = store
+        self.nodeid = nodeid
+        self.contexts: list[BrowserContext] = []
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def start(self, context: BrowserContext) -> BrowserContext:
+        context.tracing.start(title=self.nodeid, screenshots=True, snapshots=True)
+        self.contexts.append(context)
+        return context
+
+    def stop(self, failed: bool) -> list[Path]:
+        saved = []
+        for index, context in enumerate(self.contexts):
+            try:
+                if not failed:
+                    context.tracing.stop()
+                    continue
+                path = self.store.path_for(self.nodeid, index)
+                context.tracing.stop(path=path)
+                if self.store.accept(path, self.nodeid):
+                    saved.append(path)
+            except PlaywrightError as e:
+                # Тест сам закрыл контекст - трейс вместе с ним уже потерян
+                self.logger.debug("Не удалось остановить трейс контекста теста %s: %s", self.nodeid, e)
+        self.contexts.clear()
+        return saved
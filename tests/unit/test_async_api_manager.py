@@ -0,0 +1,34 @@
+import asyncio
+import threading
+import time
+import requests
+from tests.clients.async_api_manager import AsyncApiManager
+
+class TestAsyncApiManager:
+
+    def test_gather_limit_is_capped_by_thread_pool(self):
+        api_manager = AsyncApiManager(requests.Session(), "http://cinescope.local", "http://auth.local",
+                                      max_concurrency=3)
+        lock = threading.Lock()
+        running, peak = 0, 0
+
+        def blocking_call():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        async def call():
+            await asyncio.get_running_loop().run_in_executor(api_manager.executor, blocking_call)
+
+        try:
+            assert api_manager.concurrency(50) == 3
+            assert api_manager.concurrency() == 3
+            assert api_manager.concurrency(2) == 2
+            asyncio.run(api_manager.gather((call() for _ in range(12)), limit=50))
+        finally:
+            api_manager.close()
+        assert peak == 3
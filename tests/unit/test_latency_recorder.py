@@ -0,0 +1,37 @@
+import json
+import threading
+from tests.request.timing import RequestTiming
+from tests.utils.latency import LatencyRecorder
+
+class TestLatencyRecorder:
+
+    def test_rotate_does_not_lose_samples_under_concurrent_record(self):
+        recorder = LatencyRecorder()
+        tracker = recorder.track()
+        threads_count, per_thread = 8, 2000
+        start = threading.Event()
+
+        def hammer():
+            start.wait()
+            for _ in range(per_thread):
+                recorder.record("GET", "/movies", RequestTiming(total_ms=1.0), 200)
+
+        threads = [threading.Thread(target=hammer) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        start.set()
+
+        # Как генератор нагрузки: выгружаем интервал сразу после подмены tracker
+        dumped = []
+        while any(thread.is_alive() for thread in threads):
+            finished, tracker = tracker, recorder.rotate(tracker)
+            dumped.append(finished.dumps())
+        for thread in threads:
+            thread.join()
+        recorder.untrack(tracker)
+        dumped.append(tracker.dumps())
+
+        totals = sum(data["GET /movies"]["statuses"]["200"]
+                     for data in map(json.loads, dumped) if "GET /movies" in data)
+        assert totals == threads_count * per_thread
+        assert recorder.get("GET", "/movies").count == threads_count * per_thread
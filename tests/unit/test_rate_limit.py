@@ -0,0 +1,95 @@
+import email.utils
+import pytest
+import requests
+from tests.request.rate_limit import RateLimiter, TokenBucket
+
+HOST = "http://cinescope.local"
+
+def throttled_response(retry_after: str | None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+@pytest.fixture
+def sleeps() -> list[float]:
+    return []
+
+@pytest.fixture
+def limiter(tmp_path, fake_clock, sleeps: list[float], report_section: str) -> RateLimiter:
+    limiter = RateLimiter(host_limits={HOST: (10, 2)}, endpoint_limits={"POST /login": (1, 1)},
+                          sleep=sleeps.append, clock=fake_clock, section=report_section)
+    limiter.configure(True, tmp_path)
+    return limiter
+
+class TestTokenBucket:
+
+    def test_burst_then_refill_at_rate(self, tmp_path, fake_clock):
+        bucket = TokenBucket("host", rate=2, burst=2, storage_dir=tmp_path, clock=fake_clock)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        # Пачка израсходована: следующий токен появится через 1 / rate
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+        # За секунду пришло 2 токена - долг из двух зарезервированных погашен
+        fake_clock.advance(1.0)
+        assert bucket.reserve() == pytest.approx(0.5)
+
+        # Пополнение не выше burst
+        fake_clock.advance(60)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+
+    def test_state_is_shared_through_storage(self, tmp_path, fake_clock):
+        first = TokenBucket("host", rate=1, burst=1, storage_dir=tmp_path, clock=fake_clock)
+        second = TokenBucket("host", rate=1, burst=1, storage_dir=tmp_path, clock=fake_clock)
+
+        assert first.reserve() == 0
+        assert second.reserve() == pytest.approx(1.0)
+
+    def test_block_delays_next_reserve(self, tmp_path, fake_clock):
+        bucket = TokenBucket("host", rate=10, burst=10, storage_dir=tmp_path, clock=fake_clock)
+        bucket.block(3)
+
+        # Корзина пуста до конца паузы и начинает пополняться только после нее
+        assert bucket.reserve() == pytest.approx(3 + 0.1)
+        fake_clock.advance(3.1)
+        assert bucket.reserve() == pytest.approx(0.1)
+
+class TestRateLimiter:
+
+    def test_acquire_sleeps_for_the_latest_bucket(self, limiter, sleeps):
+        # Корзина хоста еще не пуста, ждать приходится корзину эндпоинта
+        assert limiter.acquire(HOST, "POST", "/login") == 0
+        assert limiter.acquire(HOST, "POST", "/login") == pytest.approx(1.0)
+        assert sleeps == [pytest.approx(1.0)]
+
+    def test_throttled_response_blocks_next_acquire(self, limiter, sleeps):
+        assert limiter.acquire(HOST, "GET", "/movies") == 0
+
+        limiter.throttled(HOST, "GET", "/movies", throttled_response("3"))
+        assert limiter.acquire(HOST, "GET", "/movies") == pytest.approx(3 + 0.1)
+        assert sleeps == [pytest.approx(3.1)]
+
+    def test_host_without_limit_is_not_throttled(self, limiter, sleeps):
+        for _ in range(5):
+            assert limiter.acquire("http://127.0.0.1:8000", "GET", "/movies") == 0
+        assert sleeps == []
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, RateLimiter.default_retry_after_s),
+        ("2.5", 2.5),
+        ("-1", 0),
+        ("3600", RateLimiter.max_retry_after_s),
+        ("not a date", RateLimiter.default_retry_after_s),
+    ])
+    def test_retry_after_seconds(self, limiter, header, expected):
+        assert limiter.retry_after(throttled_response(header)) == pytest.approx(expected)
+
+    def test_retry_after_http_date_uses_clock(self, limiter, fake_clock):
+        header = email.utils.formatdate(fake_clock.now + 10, usegmt=True)
+        assert limiter.retry_after(throttled_response(header)) == pytest.approx(10)
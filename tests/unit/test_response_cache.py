@@ -0,0 +1,96 @@
+import pytest
+import requests
+from pydantic import BaseModel
+from tests.clients.movies_api import MoviesAPI
+from tests.constants.endpoints import MOVIES_ENDPOINT
+from tests.request.response_cache import ResponseCache
+
+class CachedPage(BaseModel):
+    value: str
+
+def page(value: str) -> CachedPage:
+    return CachedPage(value=value)
+
+def always(value) -> bool:
+    return True
+
+@pytest.fixture
+def cache(fake_clock, report_section: str) -> ResponseCache:
+    cache = ResponseCache(report_section, clock=fake_clock)
+    cache.configure(True, ttl_s=10, max_entries=2)
+    return cache
+
+class TestResponseCache:
+
+    def test_entry_expires_after_ttl(self, cache, fake_clock):
+        cache.get_or_fetch("key", ("tag",), lambda: page("first"), always)
+
+        fake_clock.advance(9.9)
+        value, hit = cache.get_or_fetch("key", ("tag",), lambda: page("second"), always)
+        assert hit and value.value == "first"
+
+        fake_clock.advance(0.1)
+        value, hit = cache.get_or_fetch("key", ("tag",), lambda: page("third"), always)
+        assert not hit and value.value == "third"
+
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        cache.get_or_fetch("a", (), lambda: page("a"), always)
+        cache.get_or_fetch("b", (), lambda: page("b"), always)
+        # Чтение делает "a" свежей, поэтому при переполнении вытесняется "b"
+        cache.get_or_fetch("a", (), lambda: page("a2"), always)
+        cache.get_or_fetch("c", (), lambda: page("c"), always)
+
+        assert len(cache) == 2
+        assert cache.get_or_fetch("a", (), lambda: page("a3"), always)[1]
+        assert cache.get_or_fetch("c", (), lambda: page("c2"), always)[1]
+        assert not cache.get_or_fetch("b", (), lambda: page("b2"), always)[1]
+
+    def test_invalidate_during_fetch_does_not_repopulate(self, cache):
+        def fetch_racing_with_write():
+            # Пока запрос в полете, другой клиент меняет фильм
+            cache.invalidate("movie:1")
+            return page("stale")
+
+        cache.get_or_fetch("movie", ("movie:1",), fetch_racing_with_write, always)
+        value, hit = cache.get_or_fetch("movie", ("movie:1",), lambda: page("fresh"), always)
+        assert not hit and value.value == "fresh"
+
+    def test_invalidate_drops_only_matching_tags(self, cache):
+        cache.get_or_fetch("list", ("movies:list",), lambda: page("list"), always)
+        cache.get_or_fetch("movie", ("movie:1",), lambda: page("movie"), always)
+
+        cache.invalidate("movies:list")
+        assert not cache.get_or_fetch("list", ("movies:list",), lambda: page("list2"), always)[1]
+        assert cache.get_or_fetch("movie", ("movie:1",), lambda: page("movie2"), always)[1]
+
+    def test_bypass_always_fetches(self, cache):
+        cache.get_or_fetch("key", (), lambda: page("first"), always)
+        cache.bypass = True
+        value, hit = cache.get_or_fetch("key", (), lambda: page("second"), always)
+        assert not hit and value.value == "second"
+
+    def test_not_cacheable_value_is_not_stored(self, cache):
+        cache.get_or_fetch("key", (), lambda: page("first"), lambda value: False)
+        assert len(cache) == 0
+
+    def test_hit_returns_copy(self, cache):
+        cache.get_or_fetch("key", (), lambda: page("first"), always)
+        value, _ = cache.get_or_fetch("key", (), lambda: page("second"), always)
+        value.value = "changed by test"
+        assert cache.get_or_fetch("key", (), lambda: page("third"), always)[0].value == "first"
+
+class TestMoviesCacheKey:
+
+    def test_equivalent_params_produce_one_key(self):
+        movies_api = MoviesAPI(requests.Session(), "http://cinescope.local")
+        assert (movies_api._cache_key(MOVIES_ENDPOINT, {"a": 1})
+                == movies_api._cache_key(MOVIES_ENDPOINT, {"a": "1", "b": None}))
+        assert (movies_api._cache_key(MOVIES_ENDPOINT, {"page": 1, "pageSize": 5})
+                == movies_api._cache_key(MOVIES_ENDPOINT, {"pageSize": "5", "page": "1"}))
+        assert movies_api._cache_key(MOVIES_ENDPOINT, None) == movies_api._cache_key(MOVIES_ENDPOINT, {})
+
+    def test_key_depends_on_token(self):
+        movies_api = MoviesAPI(requests.Session(), "http://cinescope.local")
+        anonymous = movies_api._cache_key(MOVIES_ENDPOINT, {"published": False})
+        movies_api.session.headers["Authorization"] = "Bearer admin"
+        assert movies_api._cache_key(MOVIES_ENDPOINT, {"published": False}) != anonymous
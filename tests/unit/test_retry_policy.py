@@ -0,0 +1,129 @@
+from typing import Callable
+import pytest
+import requests
+from tests.constants.endpoints import MOVIES_ENDPOINT
+from tests.fake_backend.server import FaultInjection, StandInServer
+from tests.request.retry import RetryPolicy
+from tests.utils.session_report import SESSION_REPORT
+
+def make_response(status: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+class ScriptedPerform:
+    # Отдает ответы (или бросает исключения) по списку, последний повторяется
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self) -> requests.Response:
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(*outcome) if isinstance(outcome, tuple) else make_response(outcome)
+
+@pytest.fixture
+def sleeps() -> list[float]:
+    return []
+
+@pytest.fixture
+def make_policy(sleeps: list[float], report_section: str) -> Callable[..., RetryPolicy]:
+    def _make_policy(max_attempts: int = 3, budget: int = 10) -> RetryPolicy:
+        return RetryPolicy(max_attempts=max_attempts, budget=budget, sleep=sleeps.append, section=report_section)
+
+    return _make_policy
+
+class TestRetryPolicy:
+
+    @pytest.mark.parametrize("status", [502, 503, 504])
+    def test_get_is_retried_on_transient_errors(self, status, make_policy, sleeps):
+        perform = ScriptedPerform(status, 200)
+        response, history = make_policy().send("GET", MOVIES_ENDPOINT, perform)
+        assert response.status_code == 200
+        assert perform.calls == 2 and len(history) == 1 and len(sleeps) == 1
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH"])
+    def test_non_idempotent_method_is_not_retried_on_503(self, method, make_policy, sleeps):
+        perform = ScriptedPerform(503, 200)
+        response, history = make_policy().send(method, MOVIES_ENDPOINT, perform)
+        assert response.status_code == 503
+        assert perform.calls == 1 and history == [] and sleeps == []
+
+    def test_delete_is_not_retried_on_502(self, make_policy):
+        perform = ScriptedPerform(502, 200)
+        response, _ = make_policy().send("DELETE", "/movies/1", perform)
+        assert response.status_code == 502 and perform.calls == 1
+
+    def test_delete_is_retried_on_503(self, make_policy):
+        perform = ScriptedPerform(503, 200)
+        response, _ = make_policy().send("DELETE", "/movies/1", perform)
+        assert response.status_code == 200 and perform.calls == 2
+
+    def test_delete_is_retried_only_if_connection_was_not_established(self, make_policy):
+        perform = ScriptedPerform(requests.ConnectTimeout(), 200)
+        assert make_policy().send("DELETE", "/movies/1", perform)[0].status_code == 200
+
+        perform = ScriptedPerform(requests.ConnectionError("Connection aborted"), 200)
+        with pytest.raises(requests.ConnectionError):
+            make_policy().send("DELETE", "/movies/1", perform)
+        assert perform.calls == 1
+
+    @pytest.mark.parametrize("method", ["GET", "POST", "PATCH", "DELETE"])
+    def test_throttled_request_is_retried_after_retry_after(self, method, make_policy, sleeps):
+        perform = ScriptedPerform((429, {"Retry-After": "2"}), 201)
+        response, history = make_policy().send(method, MOVIES_ENDPOINT, perform)
+        assert response.status_code == 201
+        assert perform.calls == 2 and sleeps == [2.0]
+
+    def test_attempts_are_capped(self, make_policy, sleeps):
+        perform = ScriptedPerform(503)
+        response, history = make_policy(max_attempts=3).send("GET", MOVIES_ENDPOINT, perform)
+        assert response.status_code == 503
+        assert perform.calls == 3 and len(history) == 2 and len(sleeps) == 2
+
+    def test_budget_exhaustion_stops_retries_and_is_reported(self, make_policy, report_section):
+        policy = make_policy(max_attempts=3, budget=1)
+
+        first = ScriptedPerform(503)
+        assert policy.send("GET", MOVIES_ENDPOINT, first)[0].status_code == 503
+        second = ScriptedPerform(503, 200)
+        assert policy.send("GET", MOVIES_ENDPOINT, second)[0].status_code == 503
+
+        # Бюджета хватило на один повтор первого запроса, второй уже не повторялся
+        assert first.calls == 2 and second.calls == 1
+        report = SESSION_REPORT.get(report_section)
+        assert report["budget_exhausted"] is True
+        assert report["retries"] == 1 and report["recovered"] == 0
+
+    def test_budget_is_shared_through_storage(self, tmp_path, make_policy, report_section):
+        # Два экземпляра с общим каталогом - как два воркера xdist
+        workers = [make_policy(max_attempts=3, budget=3) for _ in range(2)]
+        for policy in workers:
+            policy.configure(max_attempts=3, budget=3, storage_dir=tmp_path)
+
+        performs = [ScriptedPerform(503) for _ in range(4)]
+        for index, perform in enumerate(performs):
+            workers[index % 2].send("GET", MOVIES_ENDPOINT, perform)
+
+        assert sum(perform.calls for perform in performs) == len(performs) + 3
+        assert SESSION_REPORT.get(report_section)["budget_exhausted"] is True
+
+    def test_faults_injected_by_stand_in_server(self, make_policy):
+        # Та же политика против настоящего HTTP: стенд отдает 503 на каждый запрос к списку фильмов
+        fault = FaultInjection(error_rate=1.0, error_status=503)
+        with StandInServer(movies=5, workers=1, routes={"GET /movies": fault, "POST /movies": fault}) as server:
+            with requests.Session() as session:
+                for method, expected_calls in (("GET", 3), ("POST", 1)):
+                    calls = []
+
+                    def perform(method=method, calls=calls):
+                        calls.append(method)
+                        return session.request(method, server.url + MOVIES_ENDPOINT, json={}, timeout=5)
+
+                    response, _ = make_policy(max_attempts=3).send(method, MOVIES_ENDPOINT, perform)
+                    assert response.status_code == 503
+                    assert len(calls) == expected_calls, method
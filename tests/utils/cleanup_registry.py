@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from tests.clients.async_api_manager import AsyncApiManager
+from tests.clients.token_cache import TokenCache
+from tests.models.response_models import DeletedObject, ErrorResponse
+
+class CleanupRegistry:
+    # Тесты регистрируют ID созданных фильмов, а удаление идет пачками параллельно:
+    # в фоновом потоке по мере накопления (background=True) или одним проходом в конце сессии.
+
+    batch_size = 50
+    flush_interval = 2.0
+    max_attempts = 3
+    retry_backoff = 0.5
+    transient_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(self, async_api_manager: AsyncApiManager, token_cache: TokenCache | None = None,
+                 background: bool = True):
+        self.api_manager = async_api_manager
+        self.token_cache = token_cache
+        self.background = background
+        self.deleted_count = 0
+        self.failed_ids: dict[int, str] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: list[int] = []
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def register(self, movie_id: int) -> None:
+        self.logger.info("Фильм с ID %s поставлен в очередь на удаление", movie_id)
+        if not self.background:
+            with self._lock:
+                self._pending.append(movie_id)
+            return
+        self._ensure_worker()
+        self._queue.put(movie_id)
+
+    def flush(self) -> None:
+        if self.background:
+            self._queue.join()
+            return
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.batch_size):
+            self._process_batch(pending[start:start + self.batch_size])
+
+    def close(self) -> None:
+        self.flush()
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def stats(self) -> dict:
+        return {"deleted": self.deleted_count, "failed": sorted(self.failed_ids)}
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="cleanup-registry", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                try:
+                    self._process_batch(batch)
+                except Exception as e:
+                    self.logger.error("Ошибка фоновой очистки, фильмы %s не удалены: %s", batch, e)
+                    for movie_id in batch:
+                        self.failed_ids[movie_id] = repr(e)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            if stopping:
+                self._queue.task_done()
+
+    def _next_batch(self) -> tuple[list[int], bool]:
+        batch: list[int] = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                movie_id = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if movie_id is None:
+                return batch, True
+            batch.append(movie_id)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch, False
+
+    def _process_batch(self, batch: list[int]) -> None:
+        if self.token_cache is not None:
+            self.token_cache.authorize(self.api_manager)
+        remaining = list(batch)
+        last_errors: dict[int, str] = {}
+        for attempt in range(self.max_attempts):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            results = asyncio.run(self._delete_all(remaining))
+            retry = []
+            for movie_id, result in zip(remaining, results):
+                outcome = self._classify(result)
+                if outcome == "deleted":
+                    self.deleted_count += 1
+                elif outcome == "transient":
+                    retry.append(movie_id)
+                    last_errors[movie_id] = repr(result)
+                else:
+                    self.failed_ids[movie_id] = repr(result)
+            remaining = retry
+            if not remaining:
+                break
+        for movie_id in remaining:
+            self.failed_ids[movie_id] = last_errors.get(movie_id, "")
+        if remaining:
+            self.logger.warning("Не удалось удалить фильмы после %s попыток: %s", self.max_attempts, remaining)
+
+    async def _delete_all(self, movie_ids: list[int]) -> list:
+        return await self.api_manager.gather(
+            (self.api_manager.movies_api.delete_movie(movie_id, expected_status=None) for movie_id in movie_ids),
+            return_exceptions=True,
+        )
+
+    def _classify(self, result) -> str:
+        if isinstance(result, DeletedObject):
+            return "deleted"
+        if isinstance(result, ErrorResponse):
+            if result.statusCode == 404:
+                # Фильм уже удален самим тестом
+                return "deleted"
+            return "transient" if result.statusCode in self.transient_statuses else "failed"
+        return "transient"
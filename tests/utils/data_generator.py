@@ -1,9 +1,11 @@
 import random
 import logging
 import string
+import uuid
 from faker import Faker
 from tests.models.request_models import MovieCreate, UserCreate
 from tests.models.movie_models import Location, GenreId
+from tests.utils.log_pipeline import LazyJson
 
 faker = Faker("ru_RU")
 logger = logging.getLogger(__name__)
@@ -46,9 +48,51 @@ class MovieDataGenerator:
             genreId=MovieDataGenerator.generate_random_genre(),
             published=MovieDataGenerator.generate_random_published(),
         )
-        logger.debug(f"Сгенерированы данные для создания фильма: {payload.model_dump_json(indent=2)}")
+        # Копия модели нужна только если запись действительно уйдет писателю логов
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Сгенерированы данные для создания фильма: %s", LazyJson(payload.model_copy()))
         return payload
 
+    @staticmethod
+    def generate_movie_payloads(count: int, locations: dict[Location, float] | None = None,
+                                genres: dict[GenreId, float] | None = None, price_range: tuple[int, int] = (100, 1000),
+                                published_ratio: float = 0.5) -> list[MovieCreate]:
+        locations = locations or {location: 1.0 for location in MovieDataGenerator.LOCATION}
+        genres = genres or {genre: 1.0 for genre in GenreId}
+        # Выборки делаем одним вызовом на поле, а не на каждый фильм
+        picked_locations = random.choices(list(locations), weights=list(locations.values()), k=count)
+        picked_genres = random.choices(list(genres), weights=list(genres.values()), k=count)
+        payloads = [
+            MovieCreate(
+                # Суффикс делает название уникальным: API отвечает 409 на дубликаты
+                name=f"{MovieDataGenerator.generate_random_title()} {uuid.uuid4().hex[:8]}",
+                description=MovieDataGenerator.generate_random_description(),
+                price=MovieDataGenerator.generate_random_price(*price_range),
+                location=location,
+                genreId=genre,
+                published=random.random() < published_ratio,
+            )
+            for location, genre in zip(picked_locations, picked_genres)
+        ]
+        logger.debug("Сгенерированы данные для создания %s фильмов", count)
+        return payloads
+
+    @staticmethod
+    def generate_random_movie_filters() -> dict:
+        # Случайное сочетание валидных фильтров GET /movies: пагинация, цена, локации, жанр, сортировка
+        params = {"page": random.randint(1, 5), "pageSize": random.choice([5, 10, 20])}
+        if random.random() < 0.5:
+            min_price = random.randrange(100, 900, 50)
+            params.update(minPrice=min_price, maxPrice=min_price + random.randrange(50, 500, 50))
+        if random.random() < 0.4:
+            params["locations"] = [location.value for location in
+                                   random.sample(MovieDataGenerator.LOCATION, random.randint(1, 2))]
+        if random.random() < 0.3:
+            params["genreId"] = int(MovieDataGenerator.generate_random_genre())
+        if random.random() < 0.3:
+            params["createdAt"] = random.choice(["asc", "desc"])
+        return params
+
 class UserDataGenerator:
 
     @staticmethod
@@ -59,7 +103,7 @@ class UserDataGenerator:
             full_name=UserDataGenerator.generate_random_name(),
             password=password
         )
-        logger.debug(f"Сгенерированы данные для создания пользователя: Email - {user_data.email}")
+        logger.debug("Сгенерированы данные для создания пользователя: Email - %s", user_data.email)
         return user_data, password
 
     @staticmethod
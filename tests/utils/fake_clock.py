@@ -0,0 +1,11 @@
+class FakeClock:
+    # Подставляется вместо time.time/time.monotonic в кэш, ограничитель и т.п.: время двигает сам тест
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
@@ -0,0 +1,212 @@
+import json
+import math
+import threading
+from typing import Any
+from tests.request.timing import RequestTiming
+
+class LatencyHistogram:
+    # Гистограмма в духе HdrHistogram: значения в микросекундах раскладываются по логарифмическим
+    # корзинам с 2**sub_bucket_bits линейными подкорзинами, относительная погрешность < 1%.
+    # Память не зависит от числа измерений, а гистограммы воркеров складываются почленно.
+
+    sub_bucket_bits = 8
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+
+    def record(self, value_ms: float) -> None:
+        value_us = max(int(value_ms * 1000), 0)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def percentile(self, percent: float) -> float | None:
+        if not self.total:
+            return None
+        target = max(math.ceil(self.total * percent / 100), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"counts": {str(index): count for index, count in self.counts.items()}, "total": self.total,
+                "sum_us": self.sum_us, "min_us": self.min_us, "max_us": self.max_us}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.total = data["total"]
+        histogram.sum_us = data["sum_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
+
+    def _index(self, value_us: int) -> int:
+        shift = max(value_us.bit_length() - self.sub_bucket_bits, 0)
+        return (shift << self.sub_bucket_bits) + (value_us >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        shift, mantissa = index >> self.sub_bucket_bits, index & ((1 << self.sub_bucket_bits) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+class EndpointLatency:
+
+    metrics = ("total", "ttfb", "connect")
+
+    def __init__(self):
+        self.histograms = {metric: LatencyHistogram() for metric in self.metrics}
+        self.statuses: dict[str, int] = {}
+        self.failures = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.statuses.values()) + self.failures
+
+    @property
+    def errors(self) -> int:
+        # Ошибка - это сбой транспорта или 5xx; 4xx тесты часто ожидают намеренно
+        return self.failures + sum(count for status, count in self.statuses.items() if status.startswith("5"))
+
+    def record(self, timing: RequestTiming, status: int | None) -> None:
+        self.histograms["total"].record(timing.total_ms)
+        if timing.ttfb_ms is not None:
+            self.histograms["ttfb"].record(timing.ttfb_ms)
+        if timing.connect_ms is not None:
+            self.histograms["connect"].record(timing.connect_ms)
+        if status is None:
+            self.failures += 1
+        else:
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+    def merge(self, other: "EndpointLatency") -> None:
+        for metric, histogram in other.histograms.items():
+            self.histograms[metric].merge(histogram)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.failures += other.failures
+
+    def summary(self) -> dict[str, Any]:
+        summary = {"count": self.count, "errors": self.errors,
+                   "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+                   "statuses": dict(sorted(self.statuses.items()))}
+        for metric, histogram in self.histograms.items():
+            if histogram.total:
+                summary[f"{metric}_ms"] = {
+                    "count": histogram.total,
+                    **{f"p{percent}": histogram.percentile(percent) for percent in (50, 90, 95, 99)},
+                    "max": histogram.max_us / 1000,
+                }
+        return summary
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"histograms": {metric: histogram.to_dict() for metric, histogram in self.histograms.items()},
+                "statuses": self.statuses, "failures": self.failures}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EndpointLatency":
+        endpoint = cls()
+        endpoint.histograms = {metric: LatencyHistogram.from_dict(histogram)
+                               for metric, histogram in data["histograms"].items()}
+        endpoint.statuses = dict(data["statuses"])
+        endpoint.failures = data["failures"]
+        return endpoint
+
+class LatencyRecorder:
+    # Задержки по каждому "METHOD /шаблон/эндпоинта" за сессию. Воркеры xdist передают свои
+    # гистограммы контроллеру через workeroutput, а он складывает их в loads.
+
+    WORKER_OUTPUT_KEY = "latency_report"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointLatency] = {}
+        self._trackers: list["LatencyRecorder"] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._endpoints)
+
+    def record(self, method: str, endpoint: str, timing: RequestTiming, status: int | None) -> None:
+        key = f"{method.upper()} {endpoint}"
+        with self._lock:
+            latency = self._endpoints.get(key)
+            if latency is None:
+                latency = self._endpoints[key] = EndpointLatency()
+            latency.record(timing, status)
+            # Под тем же локом, что и rotate: иначе измерение может лечь в уже выгруженный tracker
+            for tracker in self._trackers:
+                tracker.record(method, endpoint, timing, status)
+
+    def track(self) -> "LatencyRecorder":
+        # Отдельный recorder, получающий копию всех измерений до untrack - например, за время одного теста
+        tracker = LatencyRecorder()
+        with self._lock:
+            self._trackers.append(tracker)
+        return tracker
+
+    def rotate(self, tracker: "LatencyRecorder") -> "LatencyRecorder":
+        # Подменяет tracker новым атомарно: каждое измерение попадает ровно в один из двух
+        fresh = LatencyRecorder()
+        with self._lock:
+            self._trackers[self._trackers.index(tracker)] = fresh
+        return fresh
+
+    def untrack(self, tracker: "LatencyRecorder") -> None:
+        with self._lock:
+            self._trackers.remove(tracker)
+
+    def items(self) -> list[tuple[str, EndpointLatency]]:
+        with self._lock:
+            return sorted(self._endpoints.items())
+
+    def get(self, method: str, endpoint: str) -> EndpointLatency | None:
+        return self._endpoints.get(f"{method.upper()} {endpoint}")
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {key: self._endpoints[key].summary() for key in sorted(self._endpoints)}
+
+    def dumps(self) -> str:
+        with self._lock:
+            return json.dumps({key: latency.to_dict() for key, latency in self._endpoints.items()})
+
+    def loads(self, payload: str) -> None:
+        with self._lock:
+            for key, data in json.loads(payload).items():
+                latency = EndpointLatency.from_dict(data)
+                if key in self._endpoints:
+                    self._endpoints[key].merge(latency)
+                else:
+                    self._endpoints[key] = latency
+
+    def render_table(self) -> list[str]:
+        header = f"{'Эндпоинт':<34} {'запросов':>8} {'ошибок':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+        lines = [header]
+        for key, summary in self.summary().items():
+            total = summary.get("total_ms", {})
+            lines.append(
+                f"{key:<34} {summary['count']:>8} {summary['error_rate']:>7.1%} "
+                + " ".join(f"{total.get(name, 0):>8.1f}" for name in ("p50", "p90", "p99", "max"))
+            )
+        return lines
+
+LATENCY = LatencyRecorder()
@@ -0,0 +1,141 @@
+import heapq
+import logging
+import queue
+import re
+from enum import Enum
+from itertools import chain
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Iterator
+from pydantic import BaseModel
+from tests.utils.xdist_env import is_xdist_worker, worker_id
+
+RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ")
+TIMESTAMP_LENGTH = 23
+
+class LogPipelineMode(str, Enum):
+    QUEUE = "queue"
+    SYNC = "sync"
+
+class LazyMessage:
+    # Шаблон из LogMessages с аргументами: str.format выполняется, только когда запись дошла до обработчика
+    __slots__ = ("template", "args")
+
+    def __init__(self, template: str, *args):
+        self.template = template
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.template.format(*self.args)
+
+class LazyJson:
+    # Pydantic модель сериализуется в JSON только при записи; передавайте копию, если модель еще будут менять
+    __slots__ = ("model",)
+
+    def __init__(self, model: BaseModel):
+        self.model = model
+
+    def __str__(self) -> str:
+        return self.model.model_dump_json(indent=2)
+
+class DeferredQueueHandler(QueueHandler):
+    # Стандартный QueueHandler рендерит сообщение в потоке теста, здесь это делает поток писателя.
+    # Поэтому аргументы записи не должны меняться после вызова логгера.
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            # Трейсбек держит кадры стека теста - его рендерим сразу и отпускаем
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class LogPipeline:
+    # Корневой логгер пишет в очередь, а файл (свой у каждого воркера xdist) ведет фоновый QueueListener.
+    # В конце сессии контроллер сливает файлы воркеров в общий tests.log по времени записей.
+
+    max_bytes = 5 * 1024 * 1024
+    backup_count = 3
+
+    def __init__(self):
+        self.mode = LogPipelineMode.QUEUE
+        self._listener: QueueListener | None = None
+        self._handlers: list[logging.Handler] = []
+
+    def start(self, logs_dir: Path, mode: LogPipelineMode = LogPipelineMode.QUEUE) -> Path:
+        self.mode = mode
+        log_path = self.log_path(logs_dir)
+        file_handler = RotatingFileHandler(log_path, maxBytes=self.max_bytes, backupCount=self.backup_count,
+                                           encoding="utf-8")
+        file_handler.setLevel(logging.DEBUG)
+        worker = f"{worker_id()} - " if is_xdist_worker() else ""
+        file_handler.setFormatter(logging.Formatter(f"%(asctime)s - {worker}%(name)s - %(levelname)s - %(message)s"))
+
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.DEBUG)
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+
+        if mode == LogPipelineMode.SYNC:
+            self._handlers = [file_handler]
+        else:
+            log_queue = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            self._listener.start()
+            self._handlers = [DeferredQueueHandler(log_queue), file_handler]
+        root_logger.addHandler(self._handlers[0])
+        return log_path
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            # Дожидаемся, пока писатель разберет очередь до конца
+            self._listener.stop()
+            self._listener = None
+        root_logger = logging.getLogger()
+        for handler in self._handlers:
+            root_logger.removeHandler(handler)
+            handler.close()
+        self._handlers = []
+
+    @staticmethod
+    def log_path(logs_dir: Path) -> Path:
+        return Path(logs_dir) / (f"tests.{worker_id()}.log" if is_xdist_worker() else "tests.log")
+
+    @classmethod
+    def merge_workers(cls, logs_dir: Path) -> Path:
+        logs_dir = Path(logs_dir)
+        merged_path = logs_dir / "tests.log"
+        worker_logs = sorted(path for path in logs_dir.glob("tests.gw*.log"))
+        if not worker_logs:
+            return merged_path
+        sources = [cls._rotated_files(merged_path)] + [cls._rotated_files(path) for path in worker_logs]
+        tmp_path = merged_path.with_name("tests.log.merging")
+        with open(tmp_path, "w", encoding="utf-8") as merged:
+            streams = [cls._records(files) for files in sources]
+            for record in heapq.merge(*streams, key=lambda record: record[:TIMESTAMP_LENGTH]):
+                merged.write(record)
+        for path in chain.from_iterable(sources):
+            path.unlink(missing_ok=True)
+        tmp_path.replace(merged_path)
+        return merged_path
+
+    @classmethod
+    def _rotated_files(cls, path: Path) -> list[Path]:
+        # От старых бэкапов RotatingFileHandler (.3, .2, .1) к текущему файлу
+        backups = [path.with_name(f"{path.name}.{index}") for index in range(cls.backup_count, 0, -1)]
+        return [candidate for candidate in backups + [path] if candidate.exists()]
+
+    @staticmethod
+    def _records(paths: list[Path]) -> Iterator[str]:
+        # Многострочные сообщения идут одной записью вместе со строкой, начинающейся с времени
+        record = ""
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as log_file:
+                for line in log_file:
+                    if RECORD_START.match(line) and record:
+                        yield record
+                        record = ""
+                    record += line
+        if record:
+            yield record
+
+LOG_PIPELINE = LogPipeline()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from array import array
+from typing import Iterator
+import allure
+from pydantic import BaseModel, Field
+from tests.constants.log_messages import LogMessages
+from tests.clients.async_api_manager import AsyncApiManager
+from tests.clients.token_cache import TokenCache
+from tests.models.movie_models import Location, GenreId, Movie
+from tests.models.response_models import DeletedObject
+from tests.utils.data_generator import MovieDataGenerator
+from tests.utils.log_pipeline import LazyMessage
+
+class SeedDistribution(BaseModel):
+    # Веса не обязаны суммироваться в 1: они передаются в random.choices как есть
+    locations: dict[Location, float] = Field(default_factory=lambda: {location: 1.0 for location in Location})
+    genres: dict[GenreId, float] = Field(default_factory=lambda: {genre: 1.0 for genre in GenreId})
+    price_range: tuple[int, int] = (100, 1000)
+    published_ratio: float = Field(0.5, ge=0, le=1)
+
+class SeededMovies:
+
+    def __init__(self, seeder: "MovieSeeder", ids: array, failed: int = 0):
+        self._seeder = seeder
+        self.ids = ids
+        self.failed = failed
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __contains__(self, movie_id: int) -> bool:
+        return movie_id in self.ids
+
+    def teardown(self) -> list[int]:
+        not_deleted = self._seeder.delete(self.ids)
+        self.ids = array("q", not_deleted)
+        return not_deleted
+
+class MovieSeeder:
+
+    def __init__(self, async_api_manager: AsyncApiManager, workers: int | None = None,
+                 token_cache: TokenCache | None = None):
+        self.api_manager = async_api_manager
+        self.token_cache = token_cache
+        self.workers = async_api_manager.concurrency(workers)
+        self.seeded: list[SeededMovies] = []
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def seed(self, count: int, distribution: SeedDistribution | None = None) -> SeededMovies:
+        return asyncio.run(self.seed_async(count, distribution))
+
+    async def seed_async(self, count: int, distribution: SeedDistribution | None = None) -> SeededMovies:
+        distribution = distribution or SeedDistribution()
+        payloads = MovieDataGenerator.generate_movie_payloads(
+            count,
+            locations=distribution.locations,
+            genres=distribution.genres,
+            price_range=distribution.price_range,
+            published_ratio=distribution.published_ratio,
+        )
+        self._authorize()
+        with allure.step(f"Наполнение каталога: создание {count} фильмов в {self.workers} потоков"):
+            results = await self.api_manager.gather(
+                (self.api_manager.movies_api.create_movie(payload) for payload in payloads),
+                limit=self.workers,
+                return_exceptions=True,
+            )
+        ids = array("q", (result.id for result in results if isinstance(result, Movie)))
+        failed = count - len(ids)
+        if failed:
+            self.logger.warning(LazyMessage(LogMessages.Movies.SEED_FAILED, failed, count))
+        self.logger.info(LazyMessage(LogMessages.Movies.SEED_SUCCESS, len(ids)))
+        seeded = SeededMovies(self, ids, failed)
+        self.seeded.append(seeded)
+        return seeded
+
+    def delete(self, movie_ids) -> list[int]:
+        return asyncio.run(self.delete_async(movie_ids))
+
+    async def delete_async(self, movie_ids) -> list[int]:
+        movie_ids = list(movie_ids)
+        if not movie_ids:
+            return []
+        self._authorize()
+        with allure.step(f"Очистка: удаление {len(movie_ids)} фильмов в {self.workers} потоков"):
+            results = await self.api_manager.gather(
+                (self.api_manager.movies_api.delete_movie(movie_id) for movie_id in movie_ids),
+                limit=self.workers,
+                return_exceptions=True,
+            )
+        not_deleted = [movie_id for movie_id, result in zip(movie_ids, results) if not isinstance(result, DeletedObject)]
+        if not_deleted:
+            self.logger.warning(LazyMessage(LogMessages.Movies.SEED_DELETE_FAILED, len(not_deleted), not_deleted[:20]))
+        return not_deleted
+
+    def _authorize(self) -> None:
+        # Сидер живет всю сессию, а токен за это время может истечь: перед каждой пачкой берем
+        # актуальный из кэша (он обновит токен сам), иначе удаления в конце сессии получат 401
+        if self.token_cache is not None:
+            self.token_cache.authorize(self.api_manager)
+
+    def teardown(self) -> None:
+        for seeded in self.seeded:
+            if len(seeded):
+                seeded.teardown()
+        self.seeded.clear()
@@ -0,0 +1,50 @@
+import json
+import threading
+
+class SessionReport:
+    # Счетчики по разделам (transport, retries, ...). Значения-числа суммируются,
+    # поэтому данные воркеров xdist сливаются на контроллере простым merge().
+
+    WORKER_OUTPUT_KEY = "session_report"
+
+    def __init__(self):
+        self.sections: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, section: str, data: dict) -> None:
+        with self._lock:
+            self.sections[section] = self._merge_dicts(self.sections.get(section, {}), data)
+
+    def merge(self, sections: dict[str, dict]) -> None:
+        for section, data in sections.items():
+            self.add(section, data)
+
+    def get(self, section: str) -> dict:
+        return self.sections.get(section, {})
+
+    def discard(self, section: str) -> None:
+        with self._lock:
+            self.sections.pop(section, None)
+
+    def dumps(self) -> str:
+        return json.dumps(self.sections, ensure_ascii=False)
+
+    def loads(self, payload: str) -> None:
+        self.merge(json.loads(payload))
+
+    @classmethod
+    def _merge_dicts(cls, left: dict, right: dict) -> dict:
+        merged = dict(left)
+        for key, value in right.items():
+            current = merged.get(key)
+            if isinstance(value, dict):
+                merged[key] = cls._merge_dicts(current if isinstance(current, dict) else {}, value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(current, (int, float)):
+                merged[key] = current + value
+            elif isinstance(value, list) and isinstance(current, list):
+                merged[key] = current + value
+            else:
+                merged[key] = value
+        return merged
+
+SESSION_REPORT = SessionReport()
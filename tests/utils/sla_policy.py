@@ -0,0 +1,66 @@
+import logging
+import warnings
+from enum import Enum
+from tests.constants.log_messages import LogMessages
+from tests.constants.sla import P95_BUDGETS_MS
+from tests.request.timing import RequestTiming
+from tests.utils.latency import LatencyRecorder
+
+class SlaMode(str, Enum):
+    FAIL = "fail"
+    WARN = "warn"
+    OFF = "off"
+
+class SlaWarning(UserWarning):
+    pass
+
+class SlaPolicy:
+    # Проверки задержек: бюджет одного запроса (latency_budget_ms у клиентов) и p95 по эндпоинту
+    # за тест (маркер sla) или за всю сессию. В режиме fail нарушение роняет тест, в warn - только предупреждение.
+
+    def __init__(self, mode: SlaMode = SlaMode.WARN, budgets: dict[str, float] | None = None):
+        self.mode = mode
+        self.budgets = P95_BUDGETS_MS if budgets is None else budgets
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def configure(self, mode: SlaMode) -> None:
+        self.mode = mode
+
+    def check_request(self, method: str, endpoint: str, timing: RequestTiming | None, budget_ms: float | None) -> None:
+        if budget_ms is None or timing is None or timing.total_ms <= budget_ms:
+            return
+        self.report([LogMessages.Sla.REQUEST_OVER_BUDGET.format(method.upper(), endpoint, timing.total_ms, budget_ms)])
+
+    def p95_violations(self, recorder: LatencyRecorder, endpoint: str | None = None, p95_ms: float | None = None,
+                       min_samples: int = 1) -> list[str]:
+        # endpoint - "GET /movies" или просто "/movies" для всех методов; без него проверяются все эндпоинты
+        violations = []
+        matched = [(key, latency) for key, latency in recorder.items() if self._matches(key, endpoint)]
+        if endpoint is not None and not matched:
+            return [LogMessages.Sla.NO_REQUESTS.format(endpoint)]
+        for key, latency in matched:
+            budget_ms = p95_ms if p95_ms is not None else self.budgets.get(key)
+            histogram = latency.histograms["total"]
+            if budget_ms is None or histogram.total < min_samples:
+                continue
+            observed_ms = histogram.percentile(95)
+            if observed_ms > budget_ms:
+                violations.append(LogMessages.Sla.P95_OVER_BUDGET.format(key, observed_ms, budget_ms, histogram.total))
+        return violations
+
+    def report(self, violations: list[str]) -> None:
+        if not violations or self.mode == SlaMode.OFF:
+            return
+        message = "; ".join(violations)
+        self.logger.warning(message)
+        if self.mode == SlaMode.FAIL:
+            raise AssertionError(f"Нарушен SLA по задержкам: {message}")
+        warnings.warn(SlaWarning(message), stacklevel=2)
+
+    @staticmethod
+    def _matches(key: str, endpoint: str | None) -> bool:
+        if endpoint is None:
+            return True
+        return key == endpoint if " " in endpoint else key.split(" ", 1)[1] == endpoint
+
+SLA = SlaPolicy()
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from http.cookiejar import Cookie
+from pathlib import Path
+from typing import Any, Callable
+import requests
+from tests.clients.auth_api import AuthAPI
+from tests.clients.token_cache import jwt_expiry
+from tests.constants.endpoints import BASE_AUTH_URL
+from tests.constants.log_messages import LogMessages
+from tests.models.request_models import UserCreate
+from tests.models.response_models import LoginResponse
+from tests.utils.log_pipeline import LazyMessage
+
+StorageState = dict[str, Any]
+
+class StorageStateCache:
+    # Авторизованное состояние браузера (cookies и localStorage в формате Playwright storage_state)
+    # по пользователю. Собирается логином через AuthAPI; если фронтенд такие cookies не принимает -
+    # одним логином через UI. Перед каждой выдачей проверяется срок жизни токенов внутри состояния.
+
+    refresh_margin_seconds = 60
+    default_ttl_seconds = 15 * 60
+
+    def __init__(self, storage_dir: Path, base_auth_url: str = BASE_AUTH_URL,
+                 session_factory: Callable[[], requests.Session] = requests.Session,
+                 verify: Callable[[StorageState], bool] | None = None,
+                 browser_login: Callable[[UserCreate], StorageState] | None = None):
+        self.storage_dir = Path(storage_dir)
+        self.base_auth_url = base_auth_url
+        self.session_factory = session_factory
+        self.verify = verify
+        self.browser_login = browser_login
+        self._expires_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def path_for(self, user: UserCreate) -> Path:
+        path = self._path(user.email)
+        with self._lock:
+            expires_at = self._expires_at.get(user.email)
+            if expires_at is None or expires_at - time.time() <= self.refresh_margin_seconds or not path.exists():
+                state = self._build(user)
+                self.storage_dir.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(state), encoding="utf-8")
+                self._expires_at[user.email] = self.state_expiry(state)
+                self.logger.info(LazyMessage(LogMessages.Auth.STORAGE_STATE_SAVED, user.email, path))
+        return path
+
+    def invalidate(self, user: UserCreate) -> None:
+        with self._lock:
+            self._expires_at.pop(user.email, None)
+            self._path(user.email).unlink(missing_ok=True)
+
+    def state_expiry(self, state: StorageState) -> float:
+        # Самый ранний срок среди cookies и JWT внутри состояния; без них - TTL по умолчанию
+        deadlines = []
+        for cookie in state.get("cookies", []):
+            if cookie.get("expires", -1) > 0:
+                deadlines.append(cookie["expires"])
+            deadlines.append(jwt_expiry(cookie.get("value", "")))
+        for origin in state.get("origins", []):
+            for item in origin.get("localStorage", []):
+                deadlines.append(jwt_expiry(item.get("value", "")))
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        return min(deadlines) if deadlines else time.time() + self.default_ttl_seconds
+
+    def _build(self, user: UserCreate) -> StorageState:
+        state = self._api_state(user)
+        if self.verify is None or self.verify(state):
+            return state
+        if self.browser_login is None:
+            raise RuntimeError(f"Фронтенд не принял cookies логина через API для {user.email}")
+        self.logger.warning(LazyMessage(LogMessages.Auth.STORAGE_STATE_REJECTED, user.email))
+        return self.browser_login(user)
+
+    def _api_state(self, user: UserCreate) -> StorageState:
+        session = self.session_factory()
+        login_response = AuthAPI(session, base_url=self.base_auth_url).login(user.email, user.password)
+        if not isinstance(login_response, LoginResponse):
+            raise RuntimeError(f"Не удалось войти пользователем {user.email}: {login_response.message}")
+        return {"cookies": [self._playwright_cookie(cookie) for cookie in session.cookies], "origins": []}
+
+    @staticmethod
+    def _playwright_cookie(cookie: Cookie) -> dict[str, Any]:
+        same_site = (cookie.get_nonstandard_attr("SameSite") or "Lax").capitalize()
+        return {
+            "name": cookie.name,
+            "value": cookie.value or "",
+            "domain": cookie.domain,
+            "path": cookie.path or "/",
+            "expires": float(cookie.expires) if cookie.expires else -1,
+            "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+            "secure": cookie.secure,
+            "sameSite": same_site if same_site in ("Strict", "Lax", "None") else "Lax",
+        }
+
+    def _path(self, email: str) -> Path:
+        return self.storage_dir / f"state_{hashlib.sha256(email.encode()).hexdigest()[:16]}.json"
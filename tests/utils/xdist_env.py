@@ -0,0 +1,17 @@
+import os
+from pathlib import Path
+import pytest
+
+
+def worker_id() -> str:
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def is_xdist_worker() -> bool:
+    return "PYTEST_XDIST_WORKER" in os.environ
+
+
+def shared_tmp_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # У воркеров xdist basetemp вида .../pytest-N/popen-gwX, общий для всех каталог - на уровень выше
+    base_temp = tmp_path_factory.getbasetemp()
+    return base_temp.parent if is_xdist_worker() else base_temp